@@ -0,0 +1,86 @@
+import argparse
+import statistics
+import sys
+import time
+
+import pandas as pd
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class PasswordHashBenchmark:
+    METHODS = ['pbkdf2:sha256:100000', 'pbkdf2:sha256:300000', 'pbkdf2:sha256:600000', 'pbkdf2:sha256:1000000',
+               'scrypt:16384:8:1', 'scrypt:32768:8:1', 'scrypt:65536:8:1']
+
+    def __init__(self, methods=None, repeat=5, password='Benchmark1!'):
+        """
+        Time password hashing and checking for several methods and costs.
+
+        Use it to pick the PASSWORD_HASH_METHOD whose hashing time fits the login latency
+        budget on the production hardware; every worker process of the PasswordHasher
+        pool handles about 1000 / median_ms logins per second.
+
+        :param methods: werkzeug methods to time; METHODS when None.
+        :param repeat: Number of timed hashes per method.
+        :param password: Password to hash.
+        """
+        self.methods = list(methods) if methods else list(self.METHODS)
+        self.repeat = repeat
+        self.password = password
+        self.results = None
+
+    def run(self):
+        """
+        Time every method.
+
+        :return: DataFrame with one row per method, kept in results.
+        """
+        rows = []
+        for method in self.methods:
+            hash_timings, verify_timings = [], []
+            for _ in range(self.repeat):
+                start = time.perf_counter()
+                password_hash = generate_password_hash(self.password, method)
+                hash_timings.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                check_password_hash(password_hash, self.password)
+                verify_timings.append(time.perf_counter() - start)
+            rows.append({'method': method, 'hash_ms': 1000 * statistics.median(hash_timings),
+                         'verify_ms': 1000 * statistics.median(verify_timings),
+                         'logins_per_second_per_worker': 1 / statistics.median(verify_timings)})
+        self.results = pd.DataFrame(rows)
+        return self.results
+
+    def recommend(self, budget_ms):
+        """
+        Pick the slowest, i.e. strongest, method whose verification fits the budget.
+
+        :param budget_ms: Latency budget of one password check in milliseconds.
+        :return: Method name, or None when no method fits.
+        """
+        fitting = self.results[self.results['verify_ms'] <= budget_ms]
+        if fitting.empty:
+            return None
+        return fitting.loc[fitting['verify_ms'].idxmax(), 'method']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark password hashing methods and costs.')
+    parser.add_argument('--methods', nargs='+', help='werkzeug methods, e.g. pbkdf2:sha256:600000 scrypt:32768:8:1')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, help='recommend the strongest method within this latency')
+    args = parser.parse_args(argv)
+
+    benchmark = PasswordHashBenchmark(args.methods, repeat=args.repeat)
+    print(benchmark.run().to_string(index=False))
+    if args.budget_ms is not None:
+        method = benchmark.recommend(args.budget_ms)
+        if method is None:
+            print(f'No method fits a budget of {args.budget_ms} ms.')
+            return 1
+        print(f"Recommended PASSWORD_HASH_METHOD for {args.budget_ms} ms: '{method}'")
+    return 0
+
+# Example usage:
+# python -m Benchmarks.PasswordHashBenchmark --budget-ms 250
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from Data_Preprocessing_Cleaning.DataPipeline import DataPipeline
+from Data_Preprocessing_Cleaning.Data_Cleaning.DataCleaner import DataCleaner
+from Data_Preprocessing_Cleaning.Data_Cleaning.DuplicateRemover import DuplicateRemover
+from Data_Preprocessing_Cleaning.Data_Transformation.Aggregator import Aggregator
+from Data_Preprocessing_Cleaning.Data_Transformation.DateParser import DateParser
+from Benchmarks.SyntheticDataGenerator import SyntheticDataGenerator
+
+
+PIPELINE_SCHEMA = {'date': 'datetime64[ns]', 'user_id': 'int64', 'amount': 'float64'}
+
+
+def _pipeline(df):
+    pipeline = DataPipeline(df, schema=PIPELINE_SCHEMA)
+    pipeline.data_cleaning()
+    pipeline.data_transformation()
+    return pipeline.df
+
+
+def _lazy_pipeline(df):
+    pipeline = DataPipeline(df, schema=PIPELINE_SCHEMA)
+    return pipeline.plan().clean().transform().collect()
+
+
+def _batch_pipeline(df):
+    pipeline = DataPipeline(df, schema=PIPELINE_SCHEMA)
+    pipeline.batch_process(n_chunks=os.cpu_count() or 1)
+    return pipeline.df
+
+
+class PipelineBenchmark:
+    CASES = {
+        'DataPipeline': _pipeline,
+        'DataPipeline.lazy': _lazy_pipeline,
+        'DataPipeline.batch_process': _batch_pipeline,
+        'DataCleaner': lambda df: DataCleaner(df).handle_missing_values(strategy='mean'),
+        'DateParser': lambda df: DateParser(df, date_columns=['date']).parse_dates(),
+        'DuplicateRemover': lambda df: DuplicateRemover(df).remove_duplicates(subset=['user_id', 'date']),
+        'Aggregator': lambda df: Aggregator(df).calculate_aggregated_values(['user_id'], {'amount': 'sum', 'age': 'mean'}),
+    }
+
+    def __init__(self, sizes=(100_000,), cases=None, repeat=5, warmup=1, memory=True, **generator_options):
+        """
+        Time the data processing classes on synthetic frames of several sizes.
+
+        Each case gets a fresh copy of the same seeded frame for every run, copied outside
+        the timed region, with garbage collection disabled while timing. The first warmup
+        runs are discarded and the median of the remaining runs is the reported time.
+        With memory set, one more untimed run traces the peak memory the case allocates
+        on top of its input; allocations in worker processes are not included.
+
+        :param sizes: Numbers of rows to benchmark, e.g. (100_000, 1_000_000, 10_000_000).
+        :param cases: Names from CASES to run; all of them when None.
+        :param repeat: Number of timed runs per case and size.
+        :param warmup: Number of untimed runs before them.
+        :param memory: Measure peak_memory_bytes; tracing slows that run down, so it is not timed.
+        :param generator_options: Passed to SyntheticDataGenerator (n_users, null_rate, ...).
+        """
+        unknown = set(cases or []) - set(self.CASES)
+        if unknown:
+            raise ValueError(f"Unknown benchmark cases: {', '.join(sorted(unknown))}")
+        self.sizes = [int(size) for size in sizes]
+        self.cases = list(cases) if cases else list(self.CASES)
+        self.repeat = repeat
+        self.warmup = warmup
+        self.memory = memory
+        self.generator_options = generator_options
+        self.results = None
+
+    @staticmethod
+    def time_case(func, df, repeat=5, warmup=1):
+        """
+        Run func on fresh copies of df and time each run.
+
+        :return: List of the timed runs in seconds.
+        """
+        timings = []
+        for i in range(warmup + repeat):
+            data = df.copy()
+            gc.collect()
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                func(data)
+                elapsed = time.perf_counter() - start
+            finally:
+                gc.enable()
+            if i >= warmup:
+                timings.append(elapsed)
+        return timings
+
+    @staticmethod
+    def peak_memory(func, df):
+        """
+        Run func once on a fresh copy of df while tracing allocations.
+
+        :return: Peak bytes allocated during the run, on top of the copy of df.
+        """
+        data = df.copy()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            start = tracemalloc.get_traced_memory()[0]
+            func(data)
+            return tracemalloc.get_traced_memory()[1] - start
+        finally:
+            tracemalloc.stop()
+
+    def run(self):
+        """
+        Run every case at every size.
+
+        :return: DataFrame with one row per case and size, kept in results.
+        """
+        rows = []
+        logging.disable(logging.INFO)
+        try:
+            for size in self.sizes:
+                df = SyntheticDataGenerator(size, **self.generator_options).generate()
+                for case in self.cases:
+                    timings = self.time_case(self.CASES[case], df, self.repeat, self.warmup)
+                    row = {'case': case, 'rows': size, 'median_seconds': statistics.median(timings),
+                           'min_seconds': min(timings), 'max_seconds': max(timings),
+                           'rows_per_second': size / statistics.median(timings)}
+                    if self.memory:
+                        row['peak_memory_bytes'] = self.peak_memory(self.CASES[case], df)
+                    rows.append(row)
+        finally:
+            logging.disable(logging.NOTSET)
+        self.results = pd.DataFrame(rows)
+        return self.results
+
+    @staticmethod
+    def environment():
+        """Describe the machine and library versions the results were measured with."""
+        return {'python': platform.python_version(), 'pandas': pd.__version__,
+                'machine': platform.machine(), 'cpu_count': os.cpu_count()}
+
+    def save_baseline(self, path):
+        """
+        Store the results as the baseline later runs are compared against.
+
+        :param path: JSON file to write.
+        """
+        with open(path, 'w') as file:
+            json.dump({'environment': self.environment(), 'results': self.results.to_dict(orient='records')},
+                      file, indent=2)
+
+    def compare(self, path, tolerance=0.1):
+        """
+        Compare the results with a stored baseline.
+
+        Cases or sizes the baseline has no result for are flagged in missing_baseline and
+        count as regressions, so a stale baseline fails the comparison instead of passing it.
+
+        :param path: JSON file written by save_baseline().
+        :param tolerance: Allowed slowdown as a fraction of the baseline median, e.g. 0.1 for 10%.
+        :return: DataFrame with the baseline and current medians, their ratio, a missing_baseline
+                 flag and a regression flag.
+        """
+        with open(path) as file:
+            baseline = pd.DataFrame(json.load(file)['results'])
+        comparison = self.results.merge(baseline[['case', 'rows', 'median_seconds']], on=['case', 'rows'],
+                                        how='left', suffixes=('', '_baseline'))
+        comparison = comparison[['case', 'rows', 'median_seconds_baseline', 'median_seconds']]
+        comparison['ratio'] = comparison['median_seconds'] / comparison['median_seconds_baseline']
+        comparison['missing_baseline'] = comparison['median_seconds_baseline'].isna()
+        comparison['regression'] = comparison['missing_baseline'] | (comparison['ratio'] > 1 + tolerance)
+        return comparison
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the data pipeline on synthetic data.')
+    parser.add_argument('--sizes', type=float, nargs='+', default=[1e5], help='row counts, e.g. 1e5 1e6 1e7')
+    parser.add_argument('--cases', nargs='+', choices=list(PipelineBenchmark.CASES), help='cases to run')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--users', type=int, help='user_id cardinality (default: rows / 100)')
+    parser.add_argument('--null-rate', type=float, default=0.05)
+    parser.add_argument('--duplicate-rate', type=float, default=0.1)
+    parser.add_argument('--date-formats', nargs='+', help='date formats mixed in equal shares')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', help='compare against this baseline JSON file')
+    parser.add_argument('--save-baseline', help='store the results as a baseline JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='allowed slowdown before failing')
+    parser.add_argument('--no-memory', action='store_true', help='skip the traced peak memory run')
+    args = parser.parse_args(argv)
+
+    benchmark = PipelineBenchmark(args.sizes, cases=args.cases, repeat=args.repeat, warmup=args.warmup,
+                                  n_users=args.users, null_rate=args.null_rate,
+                                  duplicate_rate=args.duplicate_rate, date_formats=args.date_formats,
+                                  seed=args.seed, memory=not args.no_memory)
+    results = benchmark.run()
+    print(results.to_string(index=False))
+    if args.save_baseline:
+        benchmark.save_baseline(args.save_baseline)
+    if args.baseline:
+        comparison = benchmark.compare(args.baseline, args.tolerance)
+        print(comparison.to_string(index=False))
+        if comparison['missing_baseline'].any():
+            print('No baseline result for some cases; store a new baseline with --save-baseline.')
+        if comparison['regression'].any():
+            print('Performance regression detected.')
+            return 1
+    return 0
+
+# Example usage:
+# python -m Benchmarks.PipelineBenchmark --sizes 1e5 1e6 --save-baseline baseline.json
+# python -m Benchmarks.PipelineBenchmark --sizes 1e5 1e6 --baseline baseline.json --tolerance 0.15
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+import argparse
+import gc
+import importlib
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+
+def load_apps(database_url):
+    """
+    Import User_Management.apps against database_url, so benchmarks never touch the app database.
+
+    The engine is bound when apps is imported, so database_url only applies to the first import.
+    """
+    if 'User_Management.apps' not in sys.modules:
+        previous = os.environ.get('DATABASE_URL')
+        os.environ['DATABASE_URL'] = database_url
+        try:
+            importlib.import_module('User_Management.apps')
+        finally:
+            if previous is None:
+                os.environ.pop('DATABASE_URL')
+            else:
+                os.environ['DATABASE_URL'] = previous
+    return sys.modules['User_Management.apps']
+
+
+class RequestLatencyBenchmark:
+    MODES = ['create_all_per_request', 'startup_bootstrap']
+
+    def __init__(self, path='/login', requests=500, warmup=20, database_url=None):
+        """
+        Time requests to the user management app with and without a per-request schema check.
+
+        create_all_per_request reinstates the former before_request hook that ran
+        db.create_all() on every request; startup_bootstrap is the current app, whose
+        schema was created once by bootstrap_schema(). Both run against the same
+        database through the Flask test client, so only the server-side time is measured.
+
+        :param path: Path to request with GET.
+        :param requests: Number of timed requests per mode.
+        :param warmup: Number of untimed requests before them.
+        :param database_url: Database to run against; a temporary SQLite file when None.
+        """
+        self.path = path
+        self.requests = requests
+        self.warmup = warmup
+        self._directory = None
+        if database_url is None:
+            self._directory = tempfile.TemporaryDirectory(prefix='request-benchmark-')
+            database_url = 'sqlite:///' + os.path.join(self._directory.name, 'benchmark.db')
+        self.database_url = database_url
+        self.results = None
+
+    def time_requests(self, client):
+        """
+        Send the warmup and timed requests.
+
+        :return: List of the timed requests in seconds.
+        """
+        timings = []
+        for i in range(self.warmup + self.requests):
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                response = client.get(self.path)
+                elapsed = time.perf_counter() - start
+            finally:
+                gc.enable()
+            if response.status_code >= 500:
+                raise RuntimeError(f"{self.path} failed with status {response.status_code}")
+            if i >= self.warmup:
+                timings.append(elapsed)
+        return timings
+
+    def run(self):
+        """
+        Time every mode.
+
+        :return: DataFrame with one row per mode, kept in results.
+        """
+        apps = load_apps(self.database_url)
+        apps.bootstrap_schema()
+        client = apps.app.test_client()
+        hooks = apps.app.before_request_funcs.setdefault(None, [])
+
+        def create_tables():
+            apps.db.create_all()
+
+        rows = []
+        logging.disable(logging.INFO)
+        try:
+            for mode in self.MODES:
+                if mode == 'create_all_per_request':
+                    hooks.insert(0, create_tables)
+                try:
+                    timings = self.time_requests(client)
+                finally:
+                    if create_tables in hooks:
+                        hooks.remove(create_tables)
+                rows.append({'mode': mode, 'path': self.path, 'requests': self.requests,
+                             'median_ms': 1000 * statistics.median(timings),
+                             'p95_ms': 1000 * statistics.quantiles(timings, n=20)[-1],
+                             'mean_ms': 1000 * statistics.fmean(timings)})
+        finally:
+            logging.disable(logging.NOTSET)
+        self.results = pd.DataFrame(rows)
+        return self.results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark per-request latency of the user management app.')
+    parser.add_argument('--path', default='/login', help='path to request with GET')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--database-url', help='database to run against (default: a temporary SQLite file)')
+    args = parser.parse_args(argv)
+
+    benchmark = RequestLatencyBenchmark(args.path, requests=args.requests, warmup=args.warmup,
+                                        database_url=args.database_url)
+    results = benchmark.run().set_index('mode')
+    print(results.reset_index().to_string(index=False))
+    before = results.loc['create_all_per_request', 'median_ms']
+    after = results.loc['startup_bootstrap', 'median_ms']
+    print(f'Median latency: {before:.3f} ms -> {after:.3f} ms ({before / after:.1f}x faster)')
+    return 0
+
+# Example usage:
+# python -m Benchmarks.RequestLatencyBenchmark --path /login --requests 1000
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+
+class SyntheticDataGenerator:
+    DATE_FORMATS = {'%Y-%m-%d': 0.7, '%m/%d/%Y': 0.2, '%d %b %Y': 0.1}
+    TYPES = ['sale', 'refund', 'transfer', 'fee']
+
+    def __init__(self, n_rows, n_users=None, null_rate=0.05, duplicate_rate=0.1,
+                 date_formats=None, start_date='2022-01-01', n_days=1095, seed=0):
+        """
+        Generate transaction frames shaped like the pipeline input, repeatably.
+
+        :param n_rows: Number of rows to generate.
+        :param n_users: Number of distinct user_id values; n_rows // 100 when None.
+        :param null_rate: Share of missing values in the date, amount and type columns.
+        :param duplicate_rate: Share of rows that repeat an earlier (user_id, date) key.
+        :param date_formats: Dictionary with date formats and their share of rows, or a list of
+                             formats used equally often; DATE_FORMATS when None.
+        :param start_date: First date generated.
+        :param n_days: Number of distinct dates generated.
+        :param seed: Random seed; the same arguments always produce the same frame.
+        """
+        if not 0 <= null_rate < 1 or not 0 <= duplicate_rate < 1:
+            raise ValueError("null_rate and duplicate_rate must be in [0, 1)")
+        self.n_rows = int(n_rows)
+        self.n_users = int(n_users) if n_users else max(1, self.n_rows // 100)
+        self.null_rate = null_rate
+        self.duplicate_rate = duplicate_rate
+        if date_formats is None:
+            date_formats = self.DATE_FORMATS
+        elif not isinstance(date_formats, dict):
+            date_formats = {fmt: 1 for fmt in date_formats}
+        self.date_formats = date_formats
+        self.start_date = pd.Timestamp(start_date)
+        self.n_days = n_days
+        self.seed = seed
+
+    def _dates(self, rng, days):
+        """Render day offsets as strings, each row in one of the date formats."""
+        formats = list(self.date_formats)
+        weights = np.array(list(self.date_formats.values()), dtype=float)
+        choice = rng.choice(len(formats), size=len(days), p=weights / weights.sum())
+        # Format every distinct day once per format, then look the strings up
+        calendar = pd.date_range(self.start_date, periods=self.n_days, freq='D')
+        table = np.array([calendar.strftime(fmt).to_numpy(dtype=object) for fmt in formats])
+        return table[choice, days]
+
+    def generate(self):
+        """
+        Generate the frame.
+
+        :return: DataFrame with date (strings in mixed formats), user_id, amount, age and type columns.
+        """
+        rng = np.random.default_rng(self.seed)
+        n_unique = self.n_rows - int(self.n_rows * self.duplicate_rate)
+        user_id = rng.integers(1, self.n_users + 1, size=n_unique)
+        days = rng.integers(0, self.n_days, size=n_unique)
+
+        # Repeat keys of earlier rows, with fresh values in the other columns
+        repeats = rng.integers(0, n_unique, size=self.n_rows - n_unique)
+        user_id = np.concatenate([user_id, user_id[repeats]])
+        days = np.concatenate([days, days[repeats]])
+        order = rng.permutation(self.n_rows)
+        user_id, days = user_id[order], days[order]
+
+        df = pd.DataFrame({
+            'date': self._dates(rng, days),
+            'user_id': user_id,
+            'amount': rng.gamma(2.0, 50.0, size=self.n_rows).round(2),
+            'age': rng.integers(18, 90, size=self.n_rows),
+            'type': np.array(self.TYPES, dtype=object)[rng.integers(0, len(self.TYPES), size=self.n_rows)],
+        })
+        if self.null_rate:
+            for column in ['date', 'amount', 'type']:
+                df.loc[rng.random(self.n_rows) < self.null_rate, column] = None
+        return df
+
+# Example usage:
+# df = SyntheticDataGenerator(1_000_000, n_users=50_000, null_rate=0.02, duplicate_rate=0.05).generate()
@@ -0,0 +1,149 @@
+import os
+from typing import Dict, Iterator, List
+
+import pandas as pd
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.csv
+        import pyarrow.ipc
+    except ImportError as e:
+        raise ImportError("pyarrow is required for columnar input. Install it with 'pip install pyarrow'.") from e
+    return pyarrow
+
+
+class ColumnarSource:
+    def __init__(self, path, columns: List[str] = None):
+        """
+        Read an Arrow IPC (Feather) file through a memory map.
+
+        The file is uncompressed, so opening it maps the column buffers without copying
+        or parsing them; only the selected columns are ever paged in and converted to
+        pandas, and chunks are zero-copy slices of the mapped table.
+
+        The file is mapped once and kept open until close(), which DataPipeline calls once
+        it has read the data; use the source as a context manager when reading it directly.
+        Frames already read stay valid after closing.
+
+        :param path: Arrow IPC file, e.g. written by convert().
+        :param columns: Columns to read; all columns when omitted.
+        """
+        self.path = path
+        self.columns = list(columns) if columns is not None else None
+        self._file = None
+        self._reader = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def _write(pa, path, batches):
+        with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, batches.schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+
+    @classmethod
+    def convert(cls, csv_path, path=None, block_size=None, force=False, **read_options) -> 'ColumnarSource':
+        """
+        Parse a CSV file once with the multi-threaded pyarrow reader and store it as an Arrow IPC file.
+
+        The CSV is streamed: each block is parsed and written as one record batch, so memory
+        stays bounded by the block size rather than the file size. Column types are inferred
+        from the first block; only when a later block does not fit them, e.g. a decimal in
+        a column of integers, is the whole file read again to infer them from all rows.
+
+        The conversion is skipped while the IPC file is newer than the CSV file, so later
+        runs open the converted file directly. Empty fields are read as missing values,
+        like pd.read_csv does.
+
+        :param csv_path: Raw CSV file.
+        :param path: Arrow IPC file to write; defaults to the CSV path with an .arrow suffix.
+        :param block_size: Bytes of CSV parsed into each record batch.
+        :param force: Convert even when the IPC file is up to date.
+        :param read_options: Extra keyword arguments passed to pyarrow.csv.ReadOptions.
+        :return: ColumnarSource of the IPC file.
+        """
+        pa = _import_pyarrow()
+        path = path if path is not None else os.path.splitext(csv_path)[0] + '.arrow'
+        if not force and os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(csv_path):
+            return cls(path)
+        options = pa.csv.ReadOptions(use_threads=True, **read_options)
+        if block_size is not None:
+            options.block_size = block_size
+        convert_options = pa.csv.ConvertOptions(strings_can_be_null=True)
+        # Write next to the target and rename, so readers never map a partly written file
+        temporary = path + '.tmp'
+        try:
+            try:
+                cls._write(pa, temporary, pa.csv.open_csv(csv_path, read_options=options,
+                                                          convert_options=convert_options))
+            except pa.ArrowInvalid:
+                table = pa.csv.read_csv(csv_path, read_options=options, convert_options=convert_options)
+                cls._write(pa, temporary, table.to_reader())
+            os.replace(temporary, path)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+        return cls(path)
+
+    def _open(self):
+        if self._reader is None:
+            pa = _import_pyarrow()
+            self._file = pa.memory_map(self.path, 'r')
+            self._reader = pa.ipc.open_file(self._file)
+        return self._reader
+
+    def close(self):
+        """Close the memory map; a later read maps the file again."""
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._reader = None
+
+    def _table(self):
+        table = self._open().read_all()
+        return table.select(self.columns) if self.columns is not None else table
+
+    def column_names(self) -> List[str]:
+        """Names of all columns in the file."""
+        return list(self._open().schema.names)
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        """Read the first n rows of the selected columns."""
+        return self._table().slice(0, n).to_pandas()
+
+    def infer_schema(self) -> Dict[str, str]:
+        """Pandas dtypes the selected columns are read with."""
+        return {column: str(dtype) for column, dtype in self.head(0).dtypes.items()}
+
+    def read(self) -> pd.DataFrame:
+        """
+        Read the selected columns.
+
+        :return: DataFrame with the selected columns.
+        """
+        return self._table().to_pandas()
+
+    def iter_chunks(self, chunksize: int) -> Iterator[pd.DataFrame]:
+        """
+        Read the selected columns chunk by chunk, numbering rows across chunks like pd.read_csv.
+
+        :param chunksize: Number of rows per chunk.
+        :return: Generator of DataFrames.
+        """
+        table = self._table()
+        for start in range(0, table.num_rows, chunksize):
+            chunk = table.slice(start, chunksize).to_pandas()
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            yield chunk
+
+# Example usage:
+# source = ColumnarSource.convert('raw_data.csv')      # parses the CSV only on the first run
+# with source:
+#     source.columns = ['user_id', 'date', 'amount']
+#     df = source.read()
@@ -1,9 +1,38 @@
 import pandas as pd
 import numpy as np
 import logging
+import copy
+import contextlib
+import functools
 from concurrent.futures import ProcessPoolExecutor
 import os
-from typing import List, Dict
+import tempfile
+from typing import List, Dict, Iterator
+
+try:
+    from .SharedFrame import SharedFrame
+    from .OutputSink import CsvSink
+    from .SchemaValidator import SchemaValidator
+    from .LazyPipeline import LazyPipeline
+    from .ExecutionBackend import get_backend
+    from .StageProfiler import profiled
+    from .StageCache import StageCache
+    from .ColumnarSource import ColumnarSource
+    from .Data_Transformation.AggregationState import AggregationState
+    from .Data_Cleaning.HashDeduplicator import HashDeduplicator
+    from .Data_Cleaning.ParallelConverter import ParallelConverter
+except ImportError:
+    from SharedFrame import SharedFrame
+    from OutputSink import CsvSink
+    from SchemaValidator import SchemaValidator
+    from LazyPipeline import LazyPipeline
+    from ExecutionBackend import get_backend
+    from StageProfiler import profiled
+    from StageCache import StageCache
+    from ColumnarSource import ColumnarSource
+    from Data_Transformation.AggregationState import AggregationState
+    from Data_Cleaning.HashDeduplicator import HashDeduplicator
+    from Data_Cleaning.ParallelConverter import ParallelConverter
 
 # Configure logging
 logging.basicConfig(filename='data_processing.log', level=logging.INFO,
@@ -16,94 +45,534 @@ class DataPipeline:
         self.duplicate_criteria = ['user_id', 'date']
         self.aggregation_rules = {'amount': 'sum'}
         self.target_date_format = '%Y-%m-%d'
+        self.output_path = 'cleaned_data.csv'
+        self.sink = None
+        self.value_ranges = {}
+        self.allowed_values = {}
+        self.validation_report = None
+        self._validator = None
+        self._validator_rules = None
+        self.source = None
+        self.chunksize = None
+        self.read_csv_kwargs = {}
+        self.max_workers = None
+        self.use_shared_memory = True
+        self.aggregation_state = None
+        self.deduplicator = None
+        self.windows = None
+        self.lazy = False
+        self.backend = get_backend('pandas')
+        self.profiler = None
+        self.cache = None
+        self.conversion_workers = None
+        self.conversion_block_size = None
+
+    @classmethod
+    def from_csv(cls, path: str, chunksize: int = 100_000, schema: Dict[str, str] = None, **read_csv_kwargs):
+        """
+        Create a pipeline that streams a CSV file in chunks instead of loading it whole.
+
+        Only a small sample is read up front to infer the schema. The stages then run
+        chunk by chunk, so peak memory is bounded by the chunk size, not the file size.
+
+        :param path: Path to the raw CSV file.
+        :param chunksize: Number of rows per chunk.
+        :param schema: Data schema; inferred from the first rows when omitted.
+        :param read_csv_kwargs: Extra keyword arguments passed to pd.read_csv.
+        """
+        sample = pd.read_csv(path, nrows=min(chunksize, 1000), **read_csv_kwargs)
+        pipeline = cls(sample, schema)
+        pipeline.df = sample.iloc[0:0]
+        pipeline.source = path
+        pipeline.chunksize = chunksize
+        pipeline.read_csv_kwargs = read_csv_kwargs
+        return pipeline
+
+    @classmethod
+    def from_columnar(cls, path: str, chunksize: int = None, schema: Dict[str, str] = None,
+                      columns: List[str] = None) -> 'DataPipeline':
+        """
+        Create a pipeline that reads a memory-mapped Arrow IPC file instead of parsing CSV text.
+
+        A CSV path is converted once with the multi-threaded pyarrow parser into an .arrow
+        file next to it; later runs open that file directly. Only the schema columns and
+        the columns the stages need (user_id, duplicate_criteria and aggregation_rules) are
+        read.
+
+        :param path: Raw CSV file or Arrow IPC file.
+        :param chunksize: Stream the file in chunks of this many rows, like from_csv;
+                          read it whole when omitted.
+        :param schema: Data schema; taken from the file when omitted.
+        :param columns: Columns to read instead of the ones the schema and stages name.
+        """
+        source = ColumnarSource.convert(path) if path.lower().endswith('.csv') else ColumnarSource(path)
+        pipeline = cls(pd.DataFrame(), schema)
+        if columns is None:
+            needed = set(schema or source.column_names()) | {'user_id'}
+            needed |= set(pipeline.duplicate_criteria) | set(pipeline.aggregation_rules)
+            columns = [column for column in source.column_names() if column in needed]
+        source.columns = columns
+        if schema is None:
+            pipeline.schema = source.infer_schema()
+        if chunksize is None:
+            with source:
+                pipeline.df = source.read()
+        else:
+            pipeline.df = source.head(0)
+            pipeline.source = source
+            pipeline.chunksize = chunksize
+        return pipeline
 
     def _infer_schema(self) -> Dict[str, str]:
         """Infer data schema based on the dataframe's dtypes."""
         return {col: str(dtype) for col, dtype in self.df.dtypes.items()}
 
+    @staticmethod
+    def convert_columns(df: pd.DataFrame, schema: Dict[str, str], max_workers: int = None,
+                        block_size: int = None) -> pd.DataFrame:
+        """
+        Convert the datetime, integer and float columns of the schema in a single assignment.
+
+        The columns are converted in parallel on a thread pool, and with a block_size
+        large columns are split into row blocks; the result is the same as converting
+        them one after another.
+
+        :param df: Data to convert.
+        :param schema: Dictionary with column names and their expected dtypes.
+        :param max_workers: Number of conversion threads; 1 converts serially, None uses one per CPU.
+        :param block_size: Rows per conversion task; whole columns when None.
+        :return: New DataFrame with the converted columns.
+        """
+        converted = DataPipeline.converted_columns(df, schema, max_workers, block_size)
+        return df.assign(**converted) if converted else df
+
+    @staticmethod
+    def converted_columns(df: pd.DataFrame, schema: Dict[str, str], max_workers: int = None,
+                          block_size: int = None) -> Dict[str, pd.Series]:
+        """
+        Convert the datetime, integer and float columns of the schema without copying the frame.
+
+        :param df: Data to convert.
+        :param schema: Dictionary with column names and their expected dtypes.
+        :param max_workers: Number of conversion threads; 1 converts serially, None uses one per CPU.
+        :param block_size: Rows per conversion task; whole columns when None.
+        :return: Dictionary with column names and their converted Series; empty when nothing converts.
+        """
+        converters = {}
+        splittable = set()
+        for column, dtype in schema.items():
+            if 'datetime' in dtype:
+                date_format = ParallelConverter.datetime_format(df[column])
+                converters[column] = functools.partial(pd.to_datetime, errors='coerce', format=date_format)
+                if date_format is not None:
+                    splittable.add(column)
+            elif 'int' in dtype:
+                converters[column] = lambda series: pd.to_numeric(series, errors='coerce').astype('Int64')
+                splittable.add(column)
+            elif 'float' in dtype:
+                converters[column] = functools.partial(pd.to_numeric, errors='coerce')
+                splittable.add(column)
+        if not converters:
+            return {}
+        return ParallelConverter(max_workers, block_size).convert(df, converters, splittable)
+
+    @profiled('data_cleaning')
     def data_cleaning(self):
+        """
+        Forward fill missing values, convert columns to their schema dtypes and drop duplicates.
+
+        With a deduplicator, rows already seen in earlier chunks or runs are dropped too.
+        """
         try:
             logging.info('Data cleaning started.')
             self.df = self.df.ffill()  # Forward fill missing values
-            for column, dtype in self.schema.items():
-                if 'datetime' in dtype:
-                    self.df[column] = pd.to_datetime(self.df[column], errors='coerce')
-                elif 'int' in dtype:
-                    self.df[column] = pd.to_numeric(self.df[column], errors='coerce').astype('Int64')
-                elif 'float' in dtype:
-                    self.df[column] = pd.to_numeric(self.df[column], errors='coerce')
-            self.df = self.df.drop_duplicates(subset=self.duplicate_criteria)
+            self.df = self.convert_columns(self.df, self.schema, self.conversion_workers, self.conversion_block_size)
+            if self.deduplicator is not None:
+                self.df = self.deduplicator.drop_duplicates(self.df)
+            else:
+                self.df = self.backend.drop_duplicates(self.df, subset=self.duplicate_criteria)
             logging.info('Data cleaning completed.')
         except Exception as e:
             logging.error(f'Data cleaning failed: {e}')
             raise
 
+    @profiled('data_transformation')
     def data_transformation(self):
+        """
+        Add a <column>_aggregated field per user for every column in aggregation_rules.
+
+        With an aggregation_state, only the current rows are aggregated and merged
+        into the state, and the fields are filled from the merged per-user values.
+        With a WindowAggregator in windows, its rolling window fields are added too.
+        """
         try:
             logging.info('Data transformation started.')
-            for column, rule in self.aggregation_rules.items():
-                if column in self.df.columns:
-                    self.df[f'{column}_aggregated'] = self.df.groupby('user_id')[column].transform(rule)
+            columns = [column for column in self.aggregation_rules if column in self.df.columns]
+            if self.aggregation_state is not None:
+                self.aggregation_state.update(self.df, {column: self.aggregation_rules[column] for column in columns})
+                for column in columns:
+                    values = self.aggregation_state.values(column, self.aggregation_rules[column])
+                    self.df[f'{column}_aggregated'] = self.df['user_id'].map(values)
+            elif columns:
+                rules = {column: self.aggregation_rules[column] for column in columns}
+                for column, values in self.backend.group_transform(self.df, 'user_id', rules).items():
+                    self.df[f'{column}_aggregated'] = values
+            if self.windows is not None:
+                self.df = self.windows.transform(self.df)
             logging.info('Data transformation completed.')
         except Exception as e:
             logging.error(f'Data transformation failed: {e}')
             raise
 
-    def validate_and_store(self):
+    @profiled('validate_and_store')
+    def validate_and_store(self, append: bool = False, close: bool = True):
+        """
+        Validate the data against the schema and write it to the sink.
+
+        Every column is checked for missing values, schema columns for their dtype,
+        and value_ranges / allowed_values are enforced. All violations are reported
+        at once in the raised ValidationError and kept in validation_report.
+        Without a sink, the data is written as CSV to output_path.
+
+        :param append: Append to the output instead of overwriting it.
+        :param close: Finalize the output after writing; streaming runs close it after the last chunk.
+        """
         try:
             logging.info('Validation and storage started.')
-            assert not self.df.isnull().any().any(), 'Validation failed: Missing values present'
-            for column, dtype in self.schema.items():
-                assert str(self.df[column].dtype) == dtype, f'Validation failed: {column} has incorrect dtype'
-            self.df.to_csv('cleaned_data.csv', index=False)
+            self.validation_report = self._get_validator().check(self.df)
+            sink = self.sink if self.sink is not None else CsvSink(self.output_path)
+            sink.write(self.df, append=append)
+            if close:
+                sink.close()
             logging.info('Validation and storage completed.')
         except AssertionError as e:
+            self.validation_report = getattr(e, 'report', None)
             logging.error(f'Validation failed: {e}')
             raise
         except Exception as e:
             logging.error(f'Storage failed: {e}')
             raise
 
-    def batch_process(self, n_chunks: int):
+    def _get_validator(self) -> SchemaValidator:
+        """Compile the validation rules once and reuse them until they change."""
+        rules = (self.schema, self.value_ranges, self.allowed_values)
+        if self._validator is None or self._validator_rules != rules:
+            self._validator = SchemaValidator(self.schema, self.value_ranges, self.allowed_values)
+            self._validator_rules = copy.deepcopy(rules)
+        return self._validator
+
+    def plan(self) -> LazyPipeline:
         """
-        Process data in batches to improve performance.
+        Start a lazy plan of this pipeline's stages, executed and optimized on collect().
+
+        :return: LazyPipeline to record stages on.
+        """
+        return LazyPipeline(self)
+
+    @profiled('batch_process')
+    def batch_process(self, n_chunks: int, max_workers: int = None):
+        """
+        Run data cleaning and transformation in parallel over partitions of the dataset.
+
+        Rows are partitioned by a hash of user_id, so all rows of a user land in the
+        same chunk and per-user deduplication and aggregation stay correct. Forward
+        fill depends on row order, so it runs before the split, and the original row
+        order is restored afterwards. Duplicates are dropped within each chunk, so
+        duplicate_criteria must include user_id. With use_shared_memory, numeric and
+        datetime columns reach the workers and come back through shared memory instead
+        of being pickled. With an aggregation_state or a deduplicator, the transformation
+        runs in the parent after rows seen in earlier runs are dropped, so the
+        aggregates never count them.
 
         :param n_chunks: Number of chunks to split the dataset into.
+        :param max_workers: Number of worker processes; defaults to self.max_workers.
         """
+        if self.duplicate_criteria is not None and 'user_id' not in self.duplicate_criteria:
+            # Duplicates whose user_ids differ could land in different chunks and both survive
+            raise ValueError(f"batch_process partitions rows by user_id, so duplicate_criteria "
+                             f"{list(self.duplicate_criteria)} must include it")
         try:
             logging.info('Batch processing started.')
-            chunks = [self.df.iloc[i::n_chunks].copy() for i in range(n_chunks)]
-            with ProcessPoolExecutor() as executor:
-                results = list(executor.map(self.process_chunk, chunks))
-            self.df = pd.concat(results, ignore_index=True)
-            # Deduplication already done in data_cleaning
+            df = self.df.ffill().reset_index(drop=True)
+            buckets = pd.util.hash_pandas_object(df['user_id'], index=False).to_numpy() % n_chunks
+            order = np.argsort(buckets, kind='stable')
+            df = df.take(order)
+            bounds = np.searchsorted(buckets[order], np.arange(n_chunks + 1))
+            slices = [(start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start] or [(0, len(df))]
+            worker = self._worker()
+            with ProcessPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+                if self.use_shared_memory:
+                    shared = SharedFrame.from_frame(df)
+                    futures = []
+                    results = []
+                    try:
+                        futures = [executor.submit(worker.process_shared_chunk, shared.slice(start, stop))
+                                   for start, stop in slices]
+                        for future in futures:
+                            result = future.result()
+                            try:
+                                results.append(result.to_frame(copy=True))
+                            finally:
+                                result.unlink()
+                    finally:
+                        shared.unlink()
+                        # After a failed chunk, the chunks behind it may still have shared their results
+                        for future in futures[len(results) + 1:]:
+                            if not future.cancel() and future.exception() is None:
+                                future.result().unlink()
+                else:
+                    chunks = [df.iloc[start:stop] for start, stop in slices]
+                    results = list(executor.map(worker.process_chunk, chunks))
+            self.df = pd.concat(results).sort_index().reset_index(drop=True)
+            if self.deduplicator is not None:
+                self.df = self.deduplicator.drop_duplicates(self.df).reset_index(drop=True)
+            if self.aggregation_state is not None or self.deduplicator is not None:
+                self.data_transformation()
             logging.info('Batch processing completed.')
         except Exception as e:
             logging.error(f'Batch processing failed: {e}')
             raise
 
+    def _worker(self) -> 'DataPipeline':
+        """Copy the pipeline configuration without its data, so it is cheap to send to worker processes."""
+        worker = copy.copy(self)
+        worker.df = self.df.iloc[0:0]
+        if self.aggregation_state is not None or self.deduplicator is not None:
+            # The state is merged, and rows seen in earlier runs are dropped, in the parent
+            # once the workers are done, so the parent aggregates the remaining rows
+            worker.aggregation_state = None
+            worker.aggregation_rules = {}
+            worker.windows = None
+        # Workers drop duplicates within their partition; the parent checks earlier runs
+        worker.deduplicator = None
+        # Worker CPU time is counted in the parent's batch_process stage
+        worker.profiler = None
+        # The worker processes already keep the cores busy
+        worker.conversion_workers = 1
+        return worker
+
     def process_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
         """
-        Define your processing logic for each chunk here.
+        Clean and transform a single chunk of the dataset.
 
         :param chunk: A chunk of the dataset to process.
         :return: Processed chunk.
         """
-        # Cleaning already done in data_cleaning
-        return chunk
+        worker = copy.copy(self)
+        worker.df = chunk
+        worker.data_cleaning()
+        worker.data_transformation()
+        return worker.df
+
+    def process_shared_chunk(self, chunk: SharedFrame) -> SharedFrame:
+        """
+        Process a chunk received through shared memory and share the result back.
+
+        :param chunk: A chunk of the dataset in shared memory.
+        :return: Processed chunk in new shared memory blocks, owned by the caller.
+        """
+        result = SharedFrame.from_frame(self.process_chunk(chunk.to_frame()))
+        result.close()
+        chunk.close()
+        return result
+
+    def _read_chunks(self) -> Iterator[pd.DataFrame]:
+        """Read the streaming source chunk by chunk."""
+        if isinstance(self.source, ColumnarSource):
+            try:
+                yield from self.source.iter_chunks(self.chunksize)
+            finally:
+                self.source.close()
+        else:
+            yield from pd.read_csv(self.source, chunksize=self.chunksize, **self.read_csv_kwargs)
+
+    def _clean_chunks(self) -> Iterator[pd.DataFrame]:
+        """
+        Run data_cleaning on each chunk of the streaming source.
+
+        The last row of every chunk is carried into the next one so forward fill
+        matches a whole-file run. Duplicates are dropped across chunks through the
+        deduplicator, or a temporary one when none is set.
+        """
+        deduplicator = self.deduplicator
+        if deduplicator is None:
+            self.deduplicator = HashDeduplicator(self.duplicate_criteria)
+        try:
+            carry = None
+            for chunk in self._read_chunks():
+                if carry is not None:
+                    chunk = pd.concat([carry, chunk]).ffill().iloc[1:]
+                carry = chunk.ffill().iloc[[-1]]
+                self.df = chunk
+                self.data_cleaning()
+                yield self.df
+        finally:
+            if deduplicator is None:
+                self.deduplicator.close()
+            self.deduplicator = deduplicator
+
+    def stream(self) -> Iterator[pd.DataFrame]:
+        """
+        Clean, transform, validate and store the streaming source chunk by chunk.
+
+        Aggregations need every row of a user, so when aggregation_rules apply the
+        cleaned chunks are first spilled to a temporary directory while the per-user
+        values are merged into the aggregation_state (or a temporary one), then read
+        back one at a time to be transformed and appended to the sink. With a
+        WindowAggregator in windows, its rolling window fields are added through
+        update(), which keeps the rows a window can still reach from one chunk to the
+        next; rows should then arrive in date order per user.
+
+        :return: Generator of processed chunks.
+        """
+        if self.source is None:
+            raise ValueError("Streaming requires a pipeline created with DataPipeline.from_csv or from_columnar")
+        rules = {column: rule for column, rule in self.aggregation_rules.items() if column in self.df.columns}
+        for rule in rules.values():
+            AggregationState.check_rule(rule)
+        windows = None
+        if self.windows is not None:
+            missing = {self.windows.key, self.windows.date_column, *self.windows.columns} - set(self.df.columns)
+            if missing:
+                raise ValueError(f"Window columns not in the streamed source: {sorted(missing)}")
+            # Kept rows carry across the chunks of this run only, like transform() on a whole frame
+            windows = copy.copy(self.windows)
+            windows.tail = None
+            windows.tumbling_updates = {}
+        aggregates = {}
+        try:
+            logging.info('Streaming pipeline started.')
+            with tempfile.TemporaryDirectory(prefix='pipeline-') as spill_dir:
+                chunks = self._clean_chunks()
+                if rules:
+                    state = self.aggregation_state if self.aggregation_state is not None else AggregationState()
+                    paths = []
+                    for chunk in chunks:
+                        state.update(chunk, rules)
+                        paths.append(os.path.join(spill_dir, f'{len(paths)}.pkl'))
+                        chunk.to_pickle(paths[-1])
+                    aggregates = {column: state.values(column, rule) for column, rule in rules.items()}
+                    chunks = (pd.read_pickle(path) for path in paths)
+                try:
+                    for i, chunk in enumerate(chunks):
+                        if rules or windows is not None:
+                            with self._profile('data_transformation', lambda: chunk):
+                                logging.info('Data transformation started.')
+                                for column, values in aggregates.items():
+                                    chunk[f'{column}_aggregated'] = chunk['user_id'].map(values)
+                                if windows is not None:
+                                    chunk = windows.update(chunk)
+                                logging.info('Data transformation completed.')
+                        self.df = chunk
+                        self.validate_and_store(append=i > 0, close=False)
+                        yield self.df
+                finally:
+                    if self.sink is not None:
+                        self.sink.close()
+            self._save_state()
+            logging.info('Streaming pipeline completed.')
+        except Exception as e:
+            logging.error(f'Streaming pipeline failed: {e}')
+            raise
+
+    def _profile(self, stage: str, frame):
+        """Profile a block of code as a stage, or do nothing without a profiler."""
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.stage(stage, frame)
+
+    def _save_state(self):
+        """Persist the aggregation_state and deduplicator once the data they cover has been stored."""
+        if self.aggregation_state is not None and self.aggregation_state.path:
+            self.aggregation_state.save()
+        if self.deduplicator is not None:
+            self.deduplicator.save()
+
+    def _run_stages(self, n_chunks: int):
+        """Run cleaning and transformation in batches, as a lazy plan or one after the other."""
+        if n_chunks > 1:
+            self.batch_process(n_chunks)
+        elif self.lazy:
+            self.plan().clean().transform().collect()
+        else:
+            self.data_cleaning()
+            self.data_transformation()
+
+    def _stage_keys(self) -> Dict[str, str]:
+        """Cache keys of the cleaned and transformed data of the current input and settings."""
+        # Backends may return other dtypes, so their outputs are cached apart; the transformation key chains it
+        cleaning = self.cache.key('data_cleaning', StageCache.fingerprint(self.df),
+                                  {'schema': self.schema, 'duplicate_criteria': self.duplicate_criteria,
+                                   'backend': self.backend.name})
+        windows = None
+        if self.windows is not None:
+            windows = {name: getattr(self.windows, name)
+                       for name in ('columns', 'rolling', 'rule', 'key', 'date_column')}
+        transformation = self.cache.key('data_transformation', cleaning,
+                                        {'aggregation_rules': self.aggregation_rules, 'windows': windows})
+        return {'data_cleaning': cleaning, 'data_transformation': transformation}
+
+    def _run_cached_stages(self, n_chunks: int):
+        """
+        Run cleaning and transformation, resuming from the last stage output found in the cache.
+
+        A rerun after a failed validate_and_store loads the transformed data; a run with
+        only changed aggregation settings loads the cleaned data. Batch runs clean and
+        transform inside the workers, so only their transformed data is cached.
+        """
+        keys = self._stage_keys()
+        transformed = self.cache.get(keys['data_transformation'])
+        if transformed is not None:
+            logging.info('Resumed from cached data_transformation output.')
+            self.df = transformed
+            return
+        cleaned = self.cache.get(keys['data_cleaning']) if n_chunks <= 1 else None
+        if cleaned is not None:
+            logging.info('Resumed from cached data_cleaning output.')
+            self.df = cleaned
+            self.data_transformation()
+        elif n_chunks > 1:
+            self.batch_process(n_chunks)
+        else:
+            if self.lazy:
+                self.plan().clean().collect()
+            else:
+                self.data_cleaning()
+            self.cache.put(keys['data_cleaning'], self.df)
+            if self.lazy:
+                self.plan().transform().collect()
+            else:
+                self.data_transformation()
+        self.cache.put(keys['data_transformation'], self.df)
 
     def run_pipeline(self, n_chunks: int = 4):
         """
         Run the entire data pipeline including cleaning, transformation, and validation.
 
+        With more than one chunk, cleaning and transformation run inside the
+        batch_process workers; with a single chunk and lazy set, they run as an
+        optimized plan. Either way the remaining rows are numbered from 0.
+        Pipelines created with from_csv (or from_columnar with a chunksize) are
+        streamed chunk by chunk instead. With a StageCache in cache, stage outputs
+        are reused across runs; runs with an aggregation_state or deduplicator
+        depend on earlier runs and are not cached.
+
         :param n_chunks: Number of chunks for batch processing.
         """
+        if self.source is not None:
+            for _ in self.stream():
+                pass
+            return
         try:
             logging.info('Pipeline execution started.')
-            self.data_cleaning()
-            self.data_transformation()
-            self.batch_process(n_chunks)
+            if self.cache is not None and self.aggregation_state is None and self.deduplicator is None:
+                self._run_cached_stages(n_chunks)
+            else:
+                self._run_stages(n_chunks)
+            # Like batch_process, without the copy reset_index makes
+            self.df.index = pd.RangeIndex(len(self.df))
             self.validate_and_store()
+            self._save_state()
             logging.info('Pipeline execution completed.')
         except Exception as e:
             logging.error(f'Pipeline execution failed: {e}')
@@ -113,8 +582,8 @@ class DataPipeline:
 if __name__ == "__main__":
     print("Current Working Directory:", os.getcwd())
     try:
-        df = pd.read_csv('path/to/your/raw_data.csv')  # Update this path
-        pipeline = DataPipeline(df)
+        # The CSV is converted to a memory-mapped Arrow file on the first run only
+        pipeline = DataPipeline.from_columnar('path/to/your/raw_data.csv', chunksize=100_000)  # Update this path
         pipeline.run_pipeline(n_chunks=4)
     except Exception as e:
         logging.error(f'Error in pipeline execution: {e}')
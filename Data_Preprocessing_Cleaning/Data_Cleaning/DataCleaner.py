@@ -1,30 +1,70 @@
 import numpy as np
+import pandas as pd
 
 class DataCleaner:
     def __init__(self, df):
         self.df = df
+        self.fill_values = {}
 
-    def handle_missing_values(self, strategy='mean', threshold=None, method=None):
+    def fit_fill_values(self, strategy='mean'):
+        """
+        Compute the fill value of every column to impute, with one reduction per strategy.
+
+        :param strategy: 'mean', 'median' or 'mode' for all numeric columns, or a dictionary
+                         with column names and their strategy; 'mean' and 'median' need numeric,
+                         datetime or timedelta columns
+        :return: Dictionary with column names and their fill values, also kept in fill_values
+        """
+        if isinstance(strategy, dict):
+            strategies = strategy
+        else:
+            strategies = {column: strategy for column in self.df.select_dtypes(include=[np.number]).columns}
+
+        columns_by_strategy = {}
+        for column, column_strategy in strategies.items():
+            if column_strategy not in ['mean', 'median', 'mode']:
+                raise ValueError(f"Unsupported strategy for column {column}: {column_strategy}")
+            if column not in self.df.columns:
+                raise ValueError(f"Column {column} not found for strategy {column_strategy}")
+            dtype = self.df[column].dtype
+            if column_strategy != 'mode' and not (pd.api.types.is_numeric_dtype(dtype)
+                                                  or pd.api.types.is_datetime64_any_dtype(dtype)
+                                                  or pd.api.types.is_timedelta64_dtype(dtype)):
+                raise ValueError(f"Strategy {column_strategy} needs a numeric column, {column} is {dtype}")
+            columns_by_strategy.setdefault(column_strategy, []).append(column)
+
+        statistics = []
+        for column_strategy, columns in columns_by_strategy.items():
+            frame = self.df[columns]
+            if column_strategy == 'mode':
+                modes = frame.mode(dropna=True)
+                statistics.append(modes.iloc[0] if len(modes) else pd.Series(np.nan, index=columns))
+            else:
+                statistics.append(frame.agg(column_strategy))
+        fill_values = pd.concat(statistics) if statistics else pd.Series(dtype=float)
+        self.fill_values = fill_values.dropna().to_dict()
+        return self.fill_values
+
+    def handle_missing_values(self, strategy='mean', threshold=None, method=None, fill_values=None):
         """
         Automatically handle missing values in the dataset.
 
-        :param strategy: Strategy to handle missing values ('mean', 'median', 'mode', 'remove', 'ffill', 'bfill')
+        :param strategy: Strategy to handle missing values ('mean', 'median', 'mode', 'remove', 'ffill', 'bfill'),
+                         or a dictionary with column names and their 'mean', 'median' or 'mode' strategy
         :param threshold: Threshold for removing rows/columns with missing values
         :param method: Method for forward/backward filling ('ffill' or 'bfill')
+        :param fill_values: Fill values from an earlier fit_fill_values() call, to reuse them on
+                            later chunks or runs instead of computing them from this data
         """
-        if strategy == 'remove':
+        if isinstance(strategy, dict) or strategy in ['mean', 'median', 'mode']:
+            if fill_values is None:
+                fill_values = self.fit_fill_values(strategy)
+            self.df = self.df.fillna(value=fill_values)
+        elif strategy == 'remove':
             if threshold:
                 self.df = self.df.dropna(thresh=threshold, axis=0)
             else:
                 self.df = self.df.dropna()
-        elif strategy in ['mean', 'median', 'mode']:
-            for column in self.df.select_dtypes(include=[np.number]).columns:
-                if strategy == 'mean':
-                    self.df[column] = self.df[column].fillna(self.df[column].mean())
-                elif strategy == 'median':
-                    self.df[column] = self.df[column].fillna(self.df[column].median())
-                elif strategy == 'mode':
-                    self.df[column].fillna(self.df[column].mode()[0], inplace=True)
         elif method in ['ffill', 'bfill']:
             if method == 'ffill':
                 self.df = self.df.ffill()
@@ -39,3 +79,7 @@ class DataCleaner:
 # df = pd.read_csv('data.csv')
 # cleaner = DataCleaner(df)
 # cleaned_df = cleaner.handle_missing_values(strategy='median', threshold=10)
+#
+# Fit once, then reuse the statistics on later chunks:
+# fill_values = DataCleaner(first_chunk).fit_fill_values({'amount': 'median', 'type': 'mode'})
+# cleaned_chunk = DataCleaner(next_chunk).handle_missing_values(strategy='median', fill_values=fill_values)
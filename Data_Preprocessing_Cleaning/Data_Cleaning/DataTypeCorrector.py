@@ -1,10 +1,18 @@
+import functools
+import numpy as np
 import pandas as pd
 import json
 
+try:
+    from .ParallelConverter import ParallelConverter
+except ImportError:
+    from ParallelConverter import ParallelConverter
+
 class DataTypeCorrector:
     def __init__(self, df, schema_file):
         self.df = df
         self.schema = self.load_schema(schema_file)
+        self.memory_report = None
 
     def load_schema(self, schema_file):
         """
@@ -17,23 +25,123 @@ class DataTypeCorrector:
             schema = json.load(file)
         return schema
 
-    def correct_data_types(self):
+    def correct_data_types(self, optimize_memory=False, category_threshold=0.5, arrow_strings=False,
+                           max_workers=None, block_size=None):
         """
         Correct the data types in the dataset based on the schema.
+
+        :param optimize_memory: Shrink the corrected columns with optimize_memory() afterwards
+        :param category_threshold: Passed to optimize_memory()
+        :param arrow_strings: Passed to optimize_memory()
+        :param max_workers: Number of threads converting columns in parallel; 1 converts serially
+        :param block_size: Rows per conversion task for large columns; whole columns when None
         """
+        converters = {}
+        splittable = set()
         for column, dtype in self.schema.items():
             if dtype == 'int':
-                self.df[column] = self.df[column].astype('Int64')  # Using 'Int64' to handle NaNs in integers
+                converters[column] = functools.partial(pd.Series.astype, dtype='Int64')  # Using 'Int64' to handle NaNs in integers
+                splittable.add(column)
             elif dtype == 'float':
-                self.df[column] = self.df[column].astype('float64')
+                converters[column] = functools.partial(pd.Series.astype, dtype='float64')
+                splittable.add(column)
             elif dtype == 'date':
-                self.df[column] = pd.to_datetime(self.df[column], errors='coerce')  # Converts invalid parsing to NaT
+                date_format = ParallelConverter.datetime_format(self.df[column])
+                converters[column] = functools.partial(pd.to_datetime, errors='coerce', format=date_format)  # Converts invalid parsing to NaT
+                if date_format is not None:
+                    splittable.add(column)
+            elif dtype == 'category':
+                # Categories depend on all rows, so the column is converted whole
+                converters[column] = functools.partial(pd.Series.astype, dtype='category')
+            elif dtype == 'string':
+                converters[column] = functools.partial(pd.Series.astype, dtype='string')
+                splittable.add(column)
             else:
                 raise ValueError(f"Unsupported data type: {dtype}")
 
+        converted = ParallelConverter(max_workers, block_size).convert(self.df, converters, splittable)
+        for column, series in converted.items():
+            self.df[column] = series
+
+        if optimize_memory:
+            self.optimize_memory(category_threshold=category_threshold, arrow_strings=arrow_strings)
+        return self.df
+
+    @staticmethod
+    def _smallest_integer(series):
+        """Return the narrowest integer dtype that holds every value, keeping nullable dtypes nullable."""
+        nullable = isinstance(series.dtype, pd.api.extensions.ExtensionDtype)
+        low, high = series.min(), series.max()
+        if pd.isna(low):
+            return series.dtype
+        candidates = ['int8', 'int16', 'int32', 'int64']
+        if low >= 0:
+            candidates = ['uint8', 'uint16', 'uint32', 'uint64']
+        for candidate in candidates:
+            info = np.iinfo(candidate)
+            if info.min <= low and high <= info.max:
+                if not nullable:
+                    return candidate
+                # Nullable names are capitalized: Int8, UInt8, ...
+                return 'U' + candidate[1:].capitalize() if candidate.startswith('u') else candidate.capitalize()
+        return series.dtype
+
+    def optimize_memory(self, category_threshold=0.5, arrow_strings=False, report=True):
+        """
+        Reduce memory usage by storing each column in the smallest dtype that holds it exactly.
+
+        Integers, nullable ones included, are downcast to the narrowest width, unsigned
+        when no value is negative; floats to float32 only when every value survives the
+        round trip, and string columns whose share of distinct values is at most
+        category_threshold become categoricals. Columns holding unhashable values such
+        as lists are left as they are.
+
+        :param category_threshold: Maximum ratio of distinct values to rows for a category conversion
+        :param arrow_strings: Store the remaining string columns as Arrow-backed strings (requires pyarrow)
+        :param report: Print the before/after memory report
+        :return: Optimized DataFrame; the per-column report is kept in memory_report
+        """
+        before = self.df.memory_usage(deep=True, index=False)
+        for column in self.df.columns:
+            series = self.df[column]
+            if pd.api.types.is_bool_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+                continue
+            if pd.api.types.is_integer_dtype(series):
+                self.df[column] = series.astype(self._smallest_integer(series))
+            elif pd.api.types.is_float_dtype(series) and series.dtype == 'float64':
+                narrow = series.astype('float32')
+                if ((narrow.astype('float64') == series) | series.isna()).all():
+                    self.df[column] = narrow
+            elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+                non_null = series.count()
+                try:
+                    distinct = series.nunique()
+                except TypeError:
+                    continue  # Unhashable values such as lists or dicts fit neither a category nor a string dtype
+                if non_null and distinct / non_null <= category_threshold:
+                    self.df[column] = series.astype('category')
+                elif arrow_strings:
+                    self.df[column] = series.astype('string[pyarrow]')
+
+        after = self.df.memory_usage(deep=True, index=False)
+        self.memory_report = pd.DataFrame({
+            'dtype': self.df.dtypes.astype(str),
+            'before_bytes': before,
+            'after_bytes': after,
+        })
+        self.memory_report['saved_pct'] = (
+            100 * (1 - self.memory_report['after_bytes'] / self.memory_report['before_bytes'].where(lambda b: b > 0))
+        ).fillna(0).round(1)
+        if report:
+            total_before, total_after = before.sum(), after.sum()
+            print(self.memory_report.to_string())
+            print(f"Memory usage: {total_before / 1024 ** 2:.2f} MB -> {total_after / 1024 ** 2:.2f} MB "
+                  f"({100 * (1 - total_after / total_before) if total_before else 0:.1f}% saved)")
+
         return self.df
 
 # Example usage:
 # df = pd.read_csv('data.csv')
 # corrector = DataTypeCorrector(df, 'schema.json')
 # corrected_df = corrector.correct_data_types()
+# smaller_df = corrector.optimize_memory(category_threshold=0.2, arrow_strings=True)
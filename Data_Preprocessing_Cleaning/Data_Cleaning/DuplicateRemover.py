@@ -1,15 +1,38 @@
+try:
+    from ..ExecutionBackend import get_backend
+except ImportError:
+    try:
+        from ExecutionBackend import get_backend
+    except ImportError:  # ExecutionBackend is in the parent directory; without it pass backend instances, not names
+        get_backend = None
+
+
 class DuplicateRemover:
-    def __init__(self, df):
+    def __init__(self, df, backend=None):
         self.df = df
+        # ExecutionBackend or its name, e.g. 'polars'; pandas when None
+        self.backend = get_backend(backend) if isinstance(backend, str) else backend
 
-    def remove_duplicates(self, subset=None, keep='first'):
+    def remove_duplicates(self, subset=None, keep='first', deduplicator=None):
         """
         Remove duplicate records based on specified criteria.
 
         :param subset: Columns to consider for duplicate detection
         :param keep: Which duplicates to keep ('first', 'last', or False)
+        :param deduplicator: HashDeduplicator that also drops rows seen in earlier chunks or runs
+                             (only keep='first' is possible across chunks); it uses its own subset,
+                             so subset must be None or the same
         """
-        self.df.drop_duplicates(subset=subset, keep=keep, inplace=True)
+        if deduplicator is not None:
+            if keep != 'first':
+                raise ValueError("Only keep='first' is supported across chunks")
+            if subset is not None and list(subset) != list(deduplicator.subset or []):
+                raise ValueError(f"subset {list(subset)} differs from the deduplicator's subset {deduplicator.subset}")
+            self.df = deduplicator.drop_duplicates(self.df)
+        elif self.backend is not None:
+            self.df = self.backend.drop_duplicates(self.df, subset=subset, keep=keep)
+        else:
+            self.df.drop_duplicates(subset=subset, keep=keep, inplace=True)
         return self.df
 
 # Example usage:
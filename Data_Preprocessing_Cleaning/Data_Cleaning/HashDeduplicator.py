@@ -0,0 +1,201 @@
+import glob
+import os
+import tempfile
+import uuid
+
+import numpy as np
+import pandas as pd
+
+
+class HashDeduplicator:
+    def __init__(self, subset=None, max_keys_in_memory=1_000_000, spill_dir=None, max_runs=8, merge_block_size=1_000_000):
+        """
+        Remove duplicates across a stream of chunks, and across runs, with bounded memory.
+
+        Every row is reduced to a 64-bit hash of its key columns, with numbers hashed by
+        value, so a key read as int64 in one chunk and as float64 in another (a chunk
+        with a missing value) still matches. Seen hashes are kept
+        in a sorted in-memory array; once it grows past max_keys_in_memory it is
+        spilled to a sorted run on disk, which is searched through a memory map.
+        Runs in spill_dir that were committed with save() are loaded on start, so
+        duplicates of earlier loads are removed too. Every lookup searches each run,
+        so once there are more than max_runs of them they are merged into a single
+        sorted run, block by block so the merge never holds whole runs in memory.
+
+        :param subset: Columns that identify a duplicate; all columns when None.
+        :param max_keys_in_memory: Number of hashes kept in memory before spilling (8 bytes each).
+        :param spill_dir: Directory for sorted runs; a temporary directory when None.
+        :param max_runs: Number of pending or committed runs kept before they are merged.
+        :param merge_block_size: Number of hashes taken from each run per merge step.
+        """
+        self.subset = subset
+        self.max_keys_in_memory = max_keys_in_memory
+        self.max_runs = max_runs
+        self.merge_block_size = merge_block_size
+        self._tempdir = None
+        if spill_dir is None:
+            self._tempdir = tempfile.TemporaryDirectory(prefix='dedup-')
+            spill_dir = self._tempdir.name
+        os.makedirs(spill_dir, exist_ok=True)
+        self.spill_dir = spill_dir
+        # Runs left behind by a run that never called save(), or by an interrupted merge, were not committed
+        for path in glob.glob(os.path.join(spill_dir, '*.pending.npy')) + glob.glob(os.path.join(spill_dir, '*.merging.npy')):
+            os.remove(path)
+        self._pending = []
+        self._load_runs()
+        self._memory = np.empty(0, dtype=np.uint64)
+
+    @staticmethod
+    def _canonical(series):
+        """
+        Replace a numeric column by hashes of its values, equal for 1, 1.0 and True.
+
+        Integral values are hashed as int64 so large ids keep their precision, other
+        numbers as float64; other columns are returned unchanged.
+        """
+        if not (pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series)):
+            return series
+        if pd.api.types.is_float_dtype(series):
+            floats = series.to_numpy(dtype=np.float64, na_value=np.nan) + 0.0
+            integral = np.isfinite(floats) & (floats == np.trunc(floats)) & (np.abs(floats) < 2.0 ** 63)
+            integers = np.where(integral, floats, 0).astype(np.int64)
+        else:
+            integral = series.notna().to_numpy()
+            integers = series.to_numpy(dtype=np.int64, na_value=0)
+            floats = np.full(len(series), np.nan)
+        hashes = np.where(integral, pd.util.hash_array(integers), pd.util.hash_array(floats))
+        return pd.Series(hashes, index=series.index)
+
+    def row_hashes(self, df):
+        """
+        Hash the key columns of every row.
+
+        :param df: Rows to hash.
+        :return: Array of 64-bit hashes, one per row.
+        """
+        keys = df if self.subset is None else df[self.subset]
+        keys = pd.DataFrame({position: self._canonical(keys.iloc[:, position]) for position in range(keys.shape[1])},
+                            index=keys.index)
+        return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+    def seen(self, hashes):
+        """
+        Check which hashes were already recorded, in memory or in a spilled run.
+
+        :param hashes: Array of row hashes.
+        :return: Boolean array, True for hashes seen before.
+        """
+        found = np.isin(hashes, self._memory)
+        for run in self._runs:
+            if len(run) and not found.all():
+                positions = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+                found |= run[positions] == hashes
+        return found
+
+    def add(self, hashes):
+        """
+        Record hashes as seen, spilling to disk when the in-memory set is full.
+
+        :param hashes: Array of row hashes.
+        """
+        self._memory = np.union1d(self._memory, hashes)
+        if len(self._memory) > self.max_keys_in_memory:
+            self._spill()
+
+    def _committed(self):
+        return sorted(glob.glob(os.path.join(self.spill_dir, '*.run.npy')))
+
+    def _load_runs(self):
+        self._runs = [np.load(path, mmap_mode='r') for path in self._committed() + self._pending]
+
+    def _spill(self):
+        path = os.path.join(self.spill_dir, f'{uuid.uuid4().hex}.pending.npy')
+        np.save(path, self._memory)
+        self._pending.append(path)
+        self._runs.append(np.load(path, mmap_mode='r'))
+        self._memory = np.empty(0, dtype=np.uint64)
+        if len(self._pending) > self.max_runs:
+            self._pending = [self._merge(self._pending, 'pending')]
+            self._load_runs()
+
+    def _merge(self, paths, kind):
+        """
+        Merge sorted runs into one and remove them.
+
+        Runs never share a hash, since only unseen hashes are recorded, so the merged
+        run has their combined length. Each step takes every hash up to the smallest
+        last value of the next block of each run, which keeps the output sorted.
+
+        :param paths: Paths of the runs to merge.
+        :param kind: 'pending' or 'run', the state of the merged run.
+        :return: Path of the merged run.
+        """
+        runs = [np.load(path, mmap_mode='r') for path in paths]
+        merging = os.path.join(self.spill_dir, f'{uuid.uuid4().hex}.merging.npy')
+        merged = np.lib.format.open_memmap(merging, mode='w+', dtype=np.uint64, shape=(sum(len(run) for run in runs),))
+        positions = [0] * len(runs)
+        written = 0
+        while written < len(merged):
+            bound = min(run[min(position + self.merge_block_size, len(run)) - 1]
+                        for run, position in zip(runs, positions) if position < len(run))
+            blocks = []
+            for i, run in enumerate(runs):
+                end = positions[i] + int(np.searchsorted(run[positions[i]:], bound, side='right'))
+                blocks.append(run[positions[i]:end])
+                positions[i] = end
+            block = np.sort(np.concatenate(blocks))
+            merged[written:written + len(block)] = block
+            written += len(block)
+        merged.flush()
+        del merged, runs
+        path = merging.replace('.merging.npy', f'.{kind}.npy')
+        # A crash before the old runs are removed leaves keys in two runs, which lookups tolerate
+        os.replace(merging, path)
+        for old in paths:
+            os.remove(old)
+        return path
+
+    def drop_duplicates(self, df):
+        """
+        Keep the first occurrence of every key across all chunks seen so far.
+
+        :param df: Next chunk of rows.
+        :return: Rows whose key was not seen before.
+        """
+        hashes = self.row_hashes(df)
+        keep = ~pd.Series(hashes).duplicated().to_numpy()
+        keep[keep] = ~self.seen(hashes[keep])
+        self.add(hashes[keep])
+        return df[keep]
+
+    def save(self):
+        """
+        Commit the seen keys to spill_dir so later runs treat them as duplicates.
+
+        Keys recorded since the last save are only committed here, so a failed run
+        can be retried without losing its rows.
+        """
+        if len(self._memory):
+            self._spill()
+        for path in self._pending:
+            committed = path.replace('.pending.npy', '.run.npy')
+            os.replace(path, committed)
+        self._pending = []
+        committed = self._committed()
+        if len(committed) > self.max_runs:
+            self._runs = []
+            self._merge(committed, 'run')
+        self._load_runs()
+
+    def close(self):
+        """Remove the temporary spill directory; directories passed as spill_dir are kept."""
+        self._runs = []
+        if self._tempdir is not None:
+            self._tempdir.cleanup()
+            self._tempdir = None
+
+# Example usage:
+# deduplicator = HashDeduplicator(subset=['user_id', 'date'], spill_dir='dedup_state')
+# for chunk in pd.read_csv('data.csv', chunksize=100_000):
+#     unique_chunk = deduplicator.drop_duplicates(chunk)
+# deduplicator.save()
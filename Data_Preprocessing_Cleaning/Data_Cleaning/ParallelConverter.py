@@ -0,0 +1,77 @@
+import os
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+try:
+    from pandas.core.tools.datetimes import _guess_datetime_format_for_array
+except ImportError:  # Private pandas helper; without it datetime columns are only converted whole
+    _guess_datetime_format_for_array = None
+
+
+class ParallelConverter:
+    def __init__(self, max_workers=None, block_size=None):
+        """
+        Convert columns on a thread pool, one task per column or per block of rows.
+
+        Parsing in pd.to_datetime and pd.to_numeric runs in compiled code, so columns
+        converted on separate threads overlap instead of waiting for each other. Row
+        blocks let a single large column use several threads too; only conversions that
+        give the same result on any slice of the rows may be split.
+
+        :param max_workers: Number of threads; 1 converts serially, None uses one per CPU.
+        :param block_size: Rows per task for columns that may be split; whole columns when None.
+        """
+        self.max_workers = max_workers
+        self.block_size = block_size
+
+    @staticmethod
+    def datetime_format(series: pd.Series):
+        """
+        Find the format pd.to_datetime infers for the whole series from its first value.
+
+        Passing it explicitly makes every row block parse like the whole column would.
+
+        :return: Format string, or None when the values are parsed one by one.
+        """
+        if _guess_datetime_format_for_array is None:
+            return None
+        with warnings.catch_warnings():
+            # pd.to_datetime warns again when it falls back to parsing value by value
+            warnings.simplefilter('ignore', UserWarning)
+            return _guess_datetime_format_for_array(series.to_numpy(dtype=object))
+
+    def _blocks(self, series):
+        if self.block_size is None or len(series) <= self.block_size:
+            return [series]
+        return [series.iloc[start:start + self.block_size] for start in range(0, len(series), self.block_size)]
+
+    def convert(self, df: pd.DataFrame, converters, splittable=()):
+        """
+        Apply a conversion function to each column.
+
+        :param df: Data to convert.
+        :param converters: Dictionary with column names and functions from Series to Series.
+        :param splittable: Columns whose conversion may run on row blocks.
+        :return: Dictionary with column names and converted Series, in the order of converters.
+        """
+        tasks = []
+        for column, converter in converters.items():
+            blocks = self._blocks(df[column]) if column in splittable else [df[column]]
+            tasks.extend((column, converter, block) for block in blocks)
+        workers = min(len(tasks), self.max_workers or os.cpu_count() or 1)
+        if workers <= 1:
+            results = [converter(block) for _, converter, block in tasks]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(lambda task: task[1](task[2]), tasks))
+        parts = {}
+        for (column, _, _), result in zip(tasks, results):
+            parts.setdefault(column, []).append(result)
+        return {column: blocks[0] if len(blocks) == 1 else pd.concat(blocks) for column, blocks in parts.items()}
+
+# Example usage:
+# converter = ParallelConverter(max_workers=4, block_size=1_000_000)
+# converted = converter.convert(df, {'amount': pd.to_numeric, 'age': pd.to_numeric}, splittable={'amount', 'age'})
+# df = df.assign(**converted)
@@ -66,3 +66,59 @@ def test_unsupported_data_type(sample_df, tmpdir):
 
 # To run the tests, use the following command in the terminal:
 # pytest -v
+
+def test_optimize_memory_downcasts(tmpdir, capsys):
+    df = pd.DataFrame({
+        'small': [1, 2, 3, 4] * 25,
+        'nullable': pd.array([1, None, 300, 4] * 25, dtype='Int64'),
+        'exact': [0.5, 1.25, 2.0, 3.75] * 25,
+        'precise': [0.1, 0.2, 0.3, 0.4] * 25,
+        'type': ['sale', 'refund', 'sale', 'sale'] * 25,
+        'note': [f'note {i}' for i in range(100)]
+    })
+    file_path = os.path.join(tmpdir, "schema.json")
+    with open(file_path, "w") as f:
+        json.dump({}, f)
+
+    corrector = DataTypeCorrector(df.copy(), file_path)
+    optimized_df = corrector.optimize_memory()
+
+    assert optimized_df['small'].dtype == 'uint8'
+    assert optimized_df['nullable'].dtype == 'UInt16'
+    assert optimized_df['exact'].dtype == 'float32'
+    assert optimized_df['precise'].dtype == 'float64'  # float32 would lose precision
+    assert optimized_df['type'].dtype == 'category'
+    assert optimized_df['note'].dtype == df['note'].dtype  # too many distinct values
+
+    # Values are unchanged and the report shows the savings
+    pd.testing.assert_frame_equal(optimized_df.astype(df.dtypes.to_dict()), df)
+    assert corrector.memory_report['after_bytes'].sum() < corrector.memory_report['before_bytes'].sum()
+    assert 'Memory usage:' in capsys.readouterr().out
+
+def test_optimize_memory_nullable_signs_and_unhashable_values(tmpdir):
+    df = pd.DataFrame({
+        'negative': pd.array([-1, None, 100], dtype='Int64'),
+        'large': pd.array([0, None, 70000], dtype='Int64'),
+        'tags': [['a'], {'b': 1}, ['a']],
+    })
+    file_path = os.path.join(tmpdir, "schema.json")
+    with open(file_path, "w") as f:
+        json.dump({}, f)
+
+    optimized_df = DataTypeCorrector(df.copy(), file_path).optimize_memory(arrow_strings=True, report=False)
+
+    assert optimized_df['negative'].dtype == 'Int8'
+    assert optimized_df['large'].dtype == 'UInt32'
+    # Lists and dicts cannot be counted as categories and are left as they are
+    assert optimized_df['tags'].dtype == object
+    assert optimized_df['tags'].tolist() == df['tags'].tolist()
+
+def test_correct_data_types_with_optimize_memory(sample_df, schema_file):
+    pytest.importorskip('pyarrow')
+    sample_df['D'] = ['x', 'y', 'z', 'w']
+    corrector = DataTypeCorrector(sample_df, schema_file)
+    corrected_df = corrector.correct_data_types(optimize_memory=True, arrow_strings=True)
+
+    assert corrected_df['A'].dtype == 'UInt8'
+    assert corrected_df['B'].dtype == 'float32'
+    assert corrected_df['D'].dtype == 'string[pyarrow]'
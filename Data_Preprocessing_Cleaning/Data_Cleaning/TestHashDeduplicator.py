@@ -0,0 +1,105 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from HashDeduplicator import HashDeduplicator
+from DuplicateRemover import DuplicateRemover
+
+@pytest.fixture
+def chunks():
+    first = pd.DataFrame({'user_id': [1, 2, 2, 3], 'date': ['2024-01-01'] * 4, 'amount': [10, 20, 20, 30]})
+    second = pd.DataFrame({'user_id': [3, 4, 1], 'date': ['2024-01-01', '2024-01-01', '2024-01-02'], 'amount': [30, 40, 50]})
+    return [first, second]
+
+def test_drop_duplicates_across_chunks(chunks):
+    deduplicator = HashDeduplicator(subset=['user_id', 'date'])
+    result = pd.concat([deduplicator.drop_duplicates(chunk) for chunk in chunks])
+
+    # Same result as deduplicating the whole frame at once
+    expected = pd.concat(chunks).drop_duplicates(subset=['user_id', 'date'])
+    pd.testing.assert_frame_equal(result, expected)
+
+def test_spills_to_sorted_runs(chunks, tmp_path):
+    deduplicator = HashDeduplicator(subset=['user_id', 'date'], max_keys_in_memory=2, spill_dir=tmp_path)
+    result = pd.concat([deduplicator.drop_duplicates(chunk) for chunk in chunks])
+
+    assert len(result) == 5
+    assert len(deduplicator._memory) <= 2
+    assert len(list(tmp_path.glob('*.pending.npy'))) >= 1
+
+def test_save_commits_keys_for_later_runs(chunks, tmp_path):
+    deduplicator = HashDeduplicator(subset=['user_id', 'date'], spill_dir=tmp_path)
+    deduplicator.drop_duplicates(chunks[0])
+    deduplicator.save()
+
+    later = HashDeduplicator(subset=['user_id', 'date'], spill_dir=tmp_path)
+    assert later.drop_duplicates(chunks[1])['user_id'].tolist() == [4, 1]
+
+def test_unsaved_keys_are_discarded(chunks, tmp_path):
+    deduplicator = HashDeduplicator(subset=['user_id', 'date'], max_keys_in_memory=1, spill_dir=tmp_path)
+    deduplicator.drop_duplicates(chunks[0])
+
+    # A retry after a failed run sees the rows again
+    retry = HashDeduplicator(subset=['user_id', 'date'], spill_dir=tmp_path)
+    assert len(retry.drop_duplicates(chunks[0])) == 3
+
+def test_runs_are_merged_past_max_runs(tmp_path):
+    frames = [pd.DataFrame({'user_id': range(start, start + 50), 'date': '2024-01-01'}) for start in range(0, 500, 50)]
+    deduplicator = HashDeduplicator(subset=['user_id', 'date'], max_keys_in_memory=10, spill_dir=tmp_path,
+                                    max_runs=3, merge_block_size=7)
+    for frame in frames:
+        deduplicator.drop_duplicates(frame)
+        deduplicator.save()
+
+    assert len(list(tmp_path.glob('*.run.npy'))) <= 3
+    assert not list(tmp_path.glob('*.pending.npy')) and not list(tmp_path.glob('*.merging.npy'))
+    merged = np.concatenate([np.load(path) for path in tmp_path.glob('*.run.npy')])
+    assert len(merged) == 500
+    later = HashDeduplicator(subset=['user_id', 'date'], spill_dir=tmp_path)
+    assert later.drop_duplicates(pd.concat(frames + [frames[0].assign(user_id=-1)]))['user_id'].unique().tolist() == [-1]
+
+def test_merged_runs_are_sorted(tmp_path):
+    deduplicator = HashDeduplicator(max_keys_in_memory=5, spill_dir=tmp_path, max_runs=2, merge_block_size=3)
+    deduplicator.drop_duplicates(pd.DataFrame({'key': range(100)}))
+    deduplicator.save()
+
+    runs = [np.load(path) for path in tmp_path.glob('*.run.npy')]
+    assert len(runs) <= 2
+    assert all((run[:-1] < run[1:]).all() for run in runs)
+    assert sum(len(run) for run in runs) == 100
+
+def test_duplicate_remover_with_deduplicator(chunks):
+    deduplicator = HashDeduplicator(subset=['user_id', 'date'])
+    DuplicateRemover(chunks[0]).remove_duplicates(deduplicator=deduplicator)
+    cleaned_df = DuplicateRemover(chunks[1]).remove_duplicates(deduplicator=deduplicator)
+    assert cleaned_df['user_id'].tolist() == [4, 1]
+
+def test_numbers_match_across_dtypes():
+    deduplicator = HashDeduplicator(subset=['user_id', 'date'])
+    deduplicator.drop_duplicates(pd.DataFrame({'user_id': [1, 2**60], 'date': ['2024-01-01'] * 2}))
+
+    # A chunk with a missing user_id is read as float64, a nullable one as Int64
+    floats = pd.DataFrame({'user_id': [1.0, np.nan, 1.5], 'date': ['2024-01-01'] * 3})
+    assert deduplicator.drop_duplicates(floats)['user_id'].tolist()[1:] == [1.5]
+    nullable = pd.DataFrame({'user_id': pd.array([2**60, 2**60 + 1], dtype='Int64'), 'date': ['2024-01-01'] * 2})
+    assert deduplicator.drop_duplicates(nullable)['user_id'].tolist() == [2**60 + 1]
+    deduplicator.close()
+
+def test_close_removes_the_temporary_directory():
+    deduplicator = HashDeduplicator(subset=['user_id'], max_keys_in_memory=1)
+    deduplicator.drop_duplicates(pd.DataFrame({'user_id': [1, 2, 3]}))
+    spill_dir = deduplicator.spill_dir
+    deduplicator.close()
+    assert not os.path.exists(spill_dir)
+
+def test_duplicate_remover_rejects_other_subset(chunks):
+    deduplicator = HashDeduplicator(subset=['user_id', 'date'])
+    with pytest.raises(ValueError, match="differs from the deduplicator's subset"):
+        DuplicateRemover(chunks[0]).remove_duplicates(subset=['user_id'], deduplicator=deduplicator)
+    # The deduplicator's own subset is accepted
+    cleaned_df = DuplicateRemover(chunks[0]).remove_duplicates(subset=['user_id', 'date'], deduplicator=deduplicator)
+    assert cleaned_df['user_id'].tolist() == [1, 2, 3]
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,50 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from ParallelConverter import ParallelConverter
+from DataTypeCorrector import DataTypeCorrector
+
+
+@pytest.fixture
+def raw_df():
+    rng = np.random.default_rng(0)
+    n = 1_000
+    dates = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, n), unit='D')
+    df = pd.DataFrame({
+        'date': dates.strftime('%Y-%m-%d').astype(object),
+        'mixed_date': dates.strftime('%d/%m/%Y').astype(object),
+        'user_id': rng.integers(1, 100, n).astype(str).astype(object),
+        'amount': rng.normal(100, 10, n).round(2).astype(str).astype(object),
+        'type': rng.choice(['sale', 'refund'], n),
+    })
+    df.loc[3::7, 'date'] = 'not a date'
+    df.loc[::11, 'amount'] = None
+    df.loc[::13, 'user_id'] = 'n/a'
+    # After the first value, a different format that the inferred one does not parse
+    df.loc[500:, 'mixed_date'] = dates[500:].strftime('%Y-%m-%d')
+    return df
+
+
+def test_unparseable_first_value_is_not_split(raw_df):
+    series = pd.Series(['soon', '2024-01-01', '01/02/2024'])
+    assert ParallelConverter.datetime_format(series) is None
+    assert ParallelConverter.datetime_format(raw_df['date']) == '%Y-%m-%d'
+
+
+@pytest.mark.parametrize('max_workers, block_size', [(4, None), (4, 100)])
+def test_data_type_corrector_matches_serial(raw_df, tmp_path, max_workers, block_size):
+    schema_file = tmp_path / 'schema.json'
+    schema_file.write_text(json.dumps({'mixed_date': 'date', 'type': 'category', 'date': 'string'}))
+    df = raw_df.assign(amount=pd.to_numeric(raw_df['amount']))
+    schema = json.loads(schema_file.read_text())
+    schema['amount'] = 'float'
+    schema_file.write_text(json.dumps(schema))
+
+    serial = DataTypeCorrector(df.copy(), str(schema_file)).correct_data_types(max_workers=1)
+    parallel = DataTypeCorrector(df.copy(), str(schema_file)).correct_data_types(max_workers=max_workers,
+                                                                                block_size=block_size)
+
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert isinstance(parallel['type'].dtype, pd.CategoricalDtype)
@@ -26,3 +26,41 @@ def test_handle_missing_values_median(sample_df):
     assert cleaned_df['A'].isna().sum() == 0
     assert cleaned_df['B'].isna().sum() == 0
     assert cleaned_df['C'].isna().sum() == 1  # No median for non-numeric columns
+
+def test_handle_missing_values_mode(sample_df):
+    sample_df['A'] = [1, 1, np.nan, 4]
+    cleaner = DataCleaner(sample_df.copy())
+    cleaned_df = cleaner.handle_missing_values(strategy='mode')
+    assert cleaned_df.loc[2, 'A'] == 1
+    assert cleaned_df['B'].isna().sum() == 0
+
+def test_handle_missing_values_per_column_strategy(sample_df):
+    cleaner = DataCleaner(sample_df.copy())
+    cleaned_df = cleaner.handle_missing_values(strategy={'A': 'median', 'B': 'mean', 'C': 'mode'})
+    assert cleaned_df.loc[2, 'A'] == 2
+    assert cleaned_df.loc[0, 'B'] == 3.5
+    assert cleaned_df.loc[3, 'C'] in ['foo', 'bar', 'baz']
+    assert cleaner.fill_values['A'] == 2
+
+def test_reuse_fill_values_on_later_chunk(sample_df):
+    fill_values = DataCleaner(sample_df).fit_fill_values('mean')
+    later_chunk = pd.DataFrame({'A': [np.nan, 100.0], 'B': [np.nan, np.nan], 'C': [None, 'x']})
+    cleaned_df = DataCleaner(later_chunk).handle_missing_values(strategy='mean', fill_values=fill_values)
+
+    # The statistics come from the first chunk, not the later one
+    assert cleaned_df.loc[0, 'A'] == pytest.approx(7 / 3)
+    assert cleaned_df['B'].tolist() == [3.5, 3.5]
+
+def test_unsupported_column_strategy(sample_df):
+    cleaner = DataCleaner(sample_df.copy())
+    with pytest.raises(ValueError, match="Unsupported strategy for column A: max"):
+        cleaner.handle_missing_values(strategy={'A': 'max'})
+
+def test_strategy_must_match_column_dtype(sample_df):
+    cleaner = DataCleaner(sample_df.copy())
+    with pytest.raises(ValueError, match="Strategy mean needs a numeric column, C is object"):
+        cleaner.fit_fill_values({'A': 'median', 'C': 'mean'})
+    with pytest.raises(ValueError, match="Column D not found"):
+        cleaner.fit_fill_values({'D': 'mode'})
+    # Mode works for any dtype
+    assert cleaner.fit_fill_values({'C': 'mode'}) == {'C': 'bar'}
@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+
+
+class AggregationCube:
+    RULES = ['sum', 'count', 'mean', 'min', 'max', 'var', 'std']
+    TIME_GRAINS = {'week': 'W', 'month': 'M', 'quarter': 'Q', 'year': 'Y'}
+
+    def __init__(self, df, dimensions, measures, date_column=None):
+        """
+        Aggregate the finest grain once and answer coarser group-bys from those partials.
+
+        One scan of df keeps, per combination of the dimensions (and day, when a
+        date_column is given), the count, sum, min, max and sum of squared deviations
+        of every measure. Those partial states merge exactly, so sums, counts, means,
+        extremes and variances of any coarser grouping are derived from the partials
+        without rescanning the rows.
+
+        :param df: Rows to aggregate.
+        :param dimensions: Columns the rollups may group by, e.g. ['user_id', 'type'].
+        :param measures: Columns to aggregate.
+        :param date_column: Date column kept at day grain; rollups can then also group by
+                            it or by 'week', 'month', 'quarter' or 'year'.
+        """
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+        self.date_column = date_column
+        self._rollups = {}
+
+        keys = {column: df[column] for column in self.dimensions}
+        if date_column is not None:
+            keys[date_column] = pd.to_datetime(df[date_column], errors='coerce').dt.floor('D')
+        self.grain = list(keys)
+        frame = pd.DataFrame(keys).assign(**{measure: df[measure] for measure in self.measures})
+        # Missing keys are kept here, so coarser rollups that do not group by them still count their rows
+        grouped = frame.groupby(self.grain, sort=True, dropna=False)
+        parts = {}
+        for measure in self.measures:
+            stats = grouped[measure].agg(['count', 'sum', 'min', 'max', 'var'])
+            parts[(measure, 'count')] = stats['count']
+            parts[(measure, 'sum')] = stats['sum']
+            parts[(measure, 'min')] = stats['min']
+            parts[(measure, 'max')] = stats['max']
+            # Sum of squared deviations from the group mean, which merges without cancellation
+            parts[(measure, 'm2')] = (stats['var'] * (stats['count'] - 1)).fillna(0)
+        self.partials = pd.DataFrame(parts)
+
+    def _keys(self, group_by):
+        """Columns of the partials to group by, deriving time grains from the day column."""
+        keys = {}
+        for column in group_by:
+            if column in self.grain:
+                keys[column] = self.partials.index.get_level_values(column)
+            elif column in self.TIME_GRAINS and self.date_column is not None:
+                days = self.partials.index.get_level_values(self.date_column)
+                keys[column] = days.to_period(self.TIME_GRAINS[column]).start_time
+            else:
+                raise ValueError(f"Cannot roll up by {column}: not a dimension of the cube")
+        return keys
+
+    def _merge(self, group_by):
+        """Merge the partial states of every measure into one row per group."""
+        key = tuple(group_by)
+        if key in self._rollups:
+            return self._rollups[key]
+        partials = self.partials
+        if group_by:
+            keys = self._keys(group_by)
+            grouper = [keys[column] for column in group_by]
+        else:
+            grouper = np.zeros(len(partials), dtype=int)
+        # Partials whose group key is missing are left out, like groupby() leaves out those rows
+        group = partials.groupby(grouper, sort=True).ngroup()
+        valid = group.notna().to_numpy()
+        group = group[valid].to_numpy(dtype=int)
+
+        def merge(measure, stat, how):
+            return partials[(measure, stat)].groupby(grouper, sort=True).agg(how)
+
+        merged = {}
+        for measure in self.measures:
+            count = merge(measure, 'count', 'sum')
+            total = merge(measure, 'sum', 'sum')
+            mean = total / count.where(count > 0)
+            # Chan et al.: M2 = sum(M2_i) + sum(n_i * (mean_i - mean)^2)
+            part_count = partials[(measure, 'count')].to_numpy()
+            part_mean = partials[(measure, 'sum')].to_numpy() / np.where(part_count > 0, part_count, np.nan)
+            spread = np.nan_to_num(part_count[valid] * (part_mean[valid] - mean.to_numpy()[group]) ** 2)
+            m2 = merge(measure, 'm2', 'sum') + np.bincount(group, weights=spread, minlength=len(count))
+            var = m2 / (count - 1).where(count > 1)
+            merged[(measure, 'count')] = count
+            merged[(measure, 'sum')] = total
+            merged[(measure, 'mean')] = mean
+            merged[(measure, 'min')] = merge(measure, 'min', 'min')
+            merged[(measure, 'max')] = merge(measure, 'max', 'max')
+            merged[(measure, 'var')] = var
+            merged[(measure, 'std')] = np.sqrt(var)
+        result = pd.DataFrame(merged)
+        if group_by:
+            result.index.names = group_by
+        self._rollups[key] = result
+        return result
+
+    def rollup(self, group_by_columns, calculations):
+        """
+        Aggregate by a coarser grouping, like Aggregator.calculate_aggregated_values, from the partials.
+
+        :param group_by_columns: Dimensions or time grains to group by; an empty list for totals.
+        :param calculations: Dictionary with measures and an aggregation function or list of them
+                             ('sum', 'count', 'mean', 'min', 'max', 'var' or 'std').
+        :return: Aggregated DataFrame with the group columns first.
+        """
+        group_by = list(group_by_columns)
+        columns = []
+        for measure, rules in calculations.items():
+            if measure not in self.measures:
+                raise ValueError(f"{measure} is not a measure of the cube")
+            for rule in [rules] if isinstance(rules, str) else rules:
+                if rule not in self.RULES:
+                    raise ValueError(f"Unsupported rollup aggregation for {measure}: {rule}")
+                columns.append((measure, rule))
+        result = self._merge(group_by)[columns]
+        # Like groupby().agg(), lists of aggregations give (measure, rule) column pairs
+        if all(isinstance(rules, str) for rules in calculations.values()):
+            result.columns = [measure for measure, _ in columns]
+        if not group_by:
+            return result.reset_index(drop=True)
+        return result.reset_index()
+
+    def rollups(self, cuts, calculations):
+        """
+        Answer several groupings at once from the same partials.
+
+        :param cuts: List of group-by column lists.
+        :param calculations: Passed to rollup().
+        :return: Dictionary with the tuple of group columns and the aggregated DataFrame.
+        """
+        return {tuple(group_by): self.rollup(group_by, calculations) for group_by in cuts}
+
+# Example usage:
+# cube = AggregationCube(df, dimensions=['user_id', 'type'], measures=['amount'], date_column='date')
+# per_user = cube.rollup(['user_id'], {'amount': 'sum'})
+# per_week = cube.rollup(['week'], {'amount': ['mean', 'count']})
+# totals = cube.rollup([], {'amount': 'sum'})
@@ -0,0 +1,148 @@
+import os
+
+import pandas as pd
+
+try:
+    from .HyperLogLog import HyperLogLog
+    from .TDigest import TDigest
+except ImportError:
+    from HyperLogLog import HyperLogLog
+    from TDigest import TDigest
+
+
+class AggregationState:
+    """
+    Per-key partial aggregates (sum, count, min, max) that can be updated from new rows only.
+
+    Columns aggregated with 'nunique', 'median' or a percentile such as 'p95' also keep
+    a HyperLogLog sketch or t-digest per key, which give approximate values and merge
+    across chunks and runs like the partials do. DataPipeline.batch_process updates the
+    state in the parent process, after its workers are done.
+
+    :param key: Column to group by.
+    :param path: File the state is loaded from and saved to.
+    :param error: Relative standard error of the approximate distinct counts.
+    :param compression: t-digest compression of the approximate quantiles.
+    """
+    RULES = ['sum', 'count', 'mean', 'min', 'max']
+    APPROXIMATE_RULES = ['nunique', 'median', 'p<percentile>']
+    MERGE = {'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'}
+
+    def __init__(self, key='user_id', path=None, error=0.01, compression=200):
+        self.key = key
+        self.path = path
+        self.error = error
+        self.compression = compression
+        self.partials = {}
+        self.sketches = {}
+
+    @classmethod
+    def load(cls, path, key='user_id'):
+        """
+        Load a saved state, or start an empty one if the file does not exist yet.
+
+        :param path: Path to the state file.
+        :param key: Column to group by for a new state.
+        """
+        state = cls(key, path)
+        if os.path.exists(path):
+            stored = pd.read_pickle(path)
+            state.key = stored['key']
+            state.partials = stored['partials']
+            state.sketches = stored.get('sketches', {})
+        return state
+
+    def save(self, path=None):
+        """
+        Persist the state so the next run only has to process new rows.
+
+        :param path: Path to the state file; defaults to the path it was loaded from.
+        """
+        pd.to_pickle({'key': self.key, 'partials': self.partials, 'sketches': self.sketches}, path or self.path)
+
+    @classmethod
+    def check_rule(cls, rule):
+        if rule not in cls.RULES and cls._sketch_kind(rule) is None:
+            raise ValueError(f"Unsupported incremental aggregation: {rule}")
+
+    @staticmethod
+    def _sketch_kind(rule):
+        """Name of the sketch an approximate rule is answered from, or None for exact rules."""
+        if rule == 'nunique':
+            return 'hyperloglog'
+        if TDigest.parse_quantile(rule) is not None:
+            return 'tdigest'
+        return None
+
+    def _new_sketch(self, kind):
+        return HyperLogLog(self.error) if kind == 'hyperloglog' else TDigest(self.compression)
+
+    def update(self, df, columns):
+        """
+        Merge the sum, count, min and max of new rows into the state.
+
+        :param df: New rows.
+        :param columns: Columns to aggregate, or a dictionary with columns and their rule;
+                        approximate rules also update the column's sketch.
+        """
+        for column in columns:
+            # Only counts are kept for non-numeric columns, e.g. ids aggregated with 'nunique'
+            stats = ['sum', 'count', 'min', 'max'] if pd.api.types.is_numeric_dtype(df[column]) else ['count']
+            self._merge_partial(column, df.groupby(self.key)[column].agg(stats))
+            kind = self._sketch_kind(columns[column]) if isinstance(columns, dict) else None
+            if kind is not None:
+                sketch = self.sketches.setdefault((column, kind), self._new_sketch(kind))
+                sketch.update(df[self.key], df[column])
+
+    def _merge_partial(self, column, partial):
+        if column in self.partials:
+            merged = pd.concat([self.partials[column], partial]).groupby(level=0)
+            partial = merged.agg({stat: self.MERGE[stat] for stat in partial.columns})
+        self.partials[column] = partial
+
+    def merge(self, other):
+        """
+        Merge a state built separately from other rows, e.g. over another partition, into this one.
+
+        :param other: AggregationState with the same key.
+        """
+        for column, partial in other.partials.items():
+            self._merge_partial(column, partial)
+        for name, sketch in other.sketches.items():
+            if name in self.sketches:
+                self.sketches[name].merge(sketch)
+            else:
+                self.sketches[name] = sketch
+
+    def values(self, column, rule):
+        """
+        Get the aggregated value of a column for every key seen so far.
+
+        :param column: Aggregated column.
+        :param rule: Aggregation function ('sum', 'count', 'mean', 'min', 'max'), or an
+                     approximate 'nunique', 'median' or percentile such as 'p95'.
+        :return: Series indexed by key.
+        """
+        self.check_rule(rule)
+        partial = self.partials[column]
+        kind = self._sketch_kind(rule)
+        if kind is not None:
+            if (column, kind) not in self.sketches:
+                raise KeyError(f"No {kind} sketch for {column}; pass its rule to update()")
+            sketch = self.sketches[(column, kind)]
+            if kind == 'hyperloglog':
+                return sketch.estimate().reindex(partial.index, fill_value=0)
+            return sketch.quantile(TDigest.parse_quantile(rule)).reindex(partial.index)
+        if rule == 'mean':
+            return partial['sum'] / partial['count']
+        return partial[rule]
+
+# Example usage:
+# state = AggregationState.load('aggregation_state.pkl')
+# state.update(new_rows_df, ['amount'])
+# totals = state.values('amount', 'sum')
+#
+# Approximate rules need the rule at update time, so the sketch is kept:
+# state.update(new_rows_df, {'amount': 'p95', 'session_id': 'nunique'})
+# p95 = state.values('amount', 'p95')
+# state.save()
@@ -1,17 +1,83 @@
+import pandas as pd
+
+try:
+    from .AggregationCube import AggregationCube
+    from .HyperLogLog import HyperLogLog
+    from .TDigest import TDigest
+except ImportError:
+    from AggregationCube import AggregationCube
+    from HyperLogLog import HyperLogLog
+    from TDigest import TDigest
+
+try:
+    from ..ExecutionBackend import get_backend
+except ImportError:
+    try:
+        from ExecutionBackend import get_backend
+    except ImportError:  # ExecutionBackend is in the parent directory; without it pass backend instances, not names
+        get_backend = None
+
+
 class Aggregator:
-    def __init__(self, df):
+    def __init__(self, df, backend=None):
         self.df = df
+        # ExecutionBackend or its name, e.g. 'polars'; pandas when None
+        self.backend = get_backend(backend) if isinstance(backend, str) else backend
 
-    def calculate_aggregated_values(self, group_by_columns, calculations):
+    def calculate_aggregated_values(self, group_by_columns, calculations, approximate=False, error=0.01,
+                                    compression=200):
         """
         Generate new fields by aggregating or calculating data from existing columns.
 
         :param group_by_columns: List of columns to group by.
         :param calculations: Dictionary with column names and aggregation functions.
+        :param approximate: Estimate 'nunique' with a HyperLogLog sketch, and 'median' and percentiles
+                            such as 'p95' with a t-digest, instead of computing them exactly.
+        :param error: Relative standard error of the approximate distinct counts.
+        :param compression: t-digest compression of the approximate quantiles; higher is more accurate.
         """
+        if approximate:
+            return self._approximate_values(group_by_columns, calculations, error, compression)
+        if self.backend is not None:
+            return self.backend.aggregate(self.df, group_by_columns, calculations)
         aggregated_df = self.df.groupby(group_by_columns).agg(calculations).reset_index()
         return aggregated_df
 
+    def _approximate_values(self, group_by_columns, calculations, error, compression):
+        """Aggregate like calculate_aggregated_values, using sketches for distinct counts and quantiles."""
+        grouped = self.df.groupby(group_by_columns)
+        groups = grouped.size().index
+        codes = grouped.ngroup()
+        valid = codes.notna().to_numpy()
+        keys = codes[valid].astype('int64')
+        # Like groupby().agg(), lists of aggregations give (column, rule) column pairs
+        nested = any(not isinstance(rules, str) for rules in calculations.values())
+        result = {}
+        for column, rules in calculations.items():
+            for rule in [rules] if isinstance(rules, str) else rules:
+                name = (column, rule) if nested else column
+                quantile = TDigest.parse_quantile(rule)
+                if rule == 'nunique':
+                    sketch = HyperLogLog(error).update(keys, self.df[column][valid])
+                    result[name] = sketch.estimate().reindex(range(len(groups)), fill_value=0).to_numpy()
+                elif quantile is not None:
+                    digest = TDigest(compression).update(keys, self.df[column][valid])
+                    result[name] = digest.quantile(quantile).reindex(range(len(groups))).to_numpy()
+                else:
+                    result[name] = grouped[column].agg(rule).to_numpy()
+        return pd.DataFrame(result, index=groups).reset_index()
+
+    def build_cube(self, dimensions, measures, date_column=None):
+        """
+        Aggregate the finest grain once so many group-bys can be answered without rescanning the rows.
+
+        :param dimensions: Columns the rollups may group by.
+        :param measures: Columns to aggregate.
+        :param date_column: Date column kept at day grain, for day, week, month, quarter and year rollups.
+        :return: AggregationCube; call rollup(group_by_columns, calculations) on it.
+        """
+        return AggregationCube(self.df, dimensions, measures, date_column=date_column)
+
 # Example usage:
 # df = pd.read_csv('data.csv')
 # aggregator = Aggregator(df)
@@ -20,3 +86,15 @@ class Aggregator:
 #     'age': 'mean'
 # }
 # aggregated_df = aggregator.calculate_aggregated_values(['user_id'], calculations)
+#
+# Run the same aggregation on a multi-threaded engine:
+# aggregator = Aggregator(df, backend=get_backend('duckdb'))
+#
+# Estimate distinct counts and quantiles of big tables with sketches:
+# aggregated_df = aggregator.calculate_aggregated_values(['user_id'], {'session_id': 'nunique', 'amount': 'p95'},
+#                                                        approximate=True, error=0.02)
+#
+# Answer several dashboard cuts from one scan:
+# cube = aggregator.build_cube(['user_id', 'type'], ['amount'], date_column='date')
+# per_user = cube.rollup(['user_id'], {'amount': 'sum'})
+# per_week = cube.rollup(['week', 'type'], {'amount': 'mean'})
@@ -1,26 +1,104 @@
+import warnings
+
+import numpy as np
 import pandas as pd
+from pandas.tseries.api import guess_datetime_format
 
 
 class DateParser:
-    def __init__(self, df, date_columns, date_formats=None):
+    def __init__(self, df, date_columns, date_formats=None, sample_size=1000):
         self.df = df
         self.date_columns = date_columns
         self.date_formats = date_formats
+        self.sample_size = sample_size
+        self.inferred_formats = {}
+
+    def infer_formats(self, column):
+        """
+        Find the formats used in a column from a sample of its values.
+
+        Candidate formats come from date_formats when given, otherwise they are
+        guessed from the sampled values. They are ordered by how many sampled values
+        they parse, and cached per column so later chunks skip the inference.
+
+        :param column: Name of the column to inspect.
+        :return: List of formats, most common first.
+        """
+        if column in self.inferred_formats:
+            return self.inferred_formats[column]
+
+        values = self.df[column].dropna()
+        sample = values.sample(self.sample_size, random_state=0) if len(values) > self.sample_size else values
+        sample = sample.astype(str)
+        if self.date_formats:
+            counts = {fmt: pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum() for fmt in self.date_formats}
+        else:
+            # Guess the format of one unmatched value, then match the whole sample against it
+            counts = {}
+            unmatched = sample.drop_duplicates()
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', UserWarning)
+                while not unmatched.empty:
+                    fmt = guess_datetime_format(unmatched.iloc[0])
+                    if fmt is None or fmt in counts:
+                        unmatched = unmatched.iloc[1:]
+                        continue
+                    matched = pd.to_datetime(unmatched, format=fmt, errors='coerce').notna()
+                    counts[fmt] = pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum()
+                    unmatched = unmatched[~matched.to_numpy()]
+        # Explicit formats are all kept, since values outside the sample may still need them
+        formats = [fmt for fmt, count in sorted(counts.items(), key=lambda item: -item[1])
+                   if count > 0 or self.date_formats]
+        self.inferred_formats[column] = formats
+        return formats
+
+    def parse_column(self, column):
+        """
+        Parse one column with one vectorized pass per format over the rows still unparsed.
+
+        Without date_formats, rows that none of the inferred formats match fall back
+        to per-element parsing. The result is assembled from the parsed pieces, so
+        formats with a time zone (%z) keep it; naive and tz-aware values together
+        give an object Series.
+
+        :param column: Name of the column to parse.
+        :return: Parsed datetime Series; unparseable values become NaT.
+        """
+        values = self.df[column]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values
+        if not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+            return pd.to_datetime(values, errors='coerce')
+
+        # Pieces are indexed by row position, so duplicate index labels do not matter
+        pieces = []
+        remaining = values.notna().to_numpy()
+        for fmt in self.infer_formats(column):
+            if not remaining.any():
+                break
+            positions = np.flatnonzero(remaining)
+            result = pd.to_datetime(values.iloc[positions].astype(str), format=fmt, errors='coerce')
+            matched = result.notna().to_numpy()
+            if matched.any():
+                pieces.append(pd.Series(result[matched].array, index=positions[matched]))
+            remaining[positions[matched]] = False
+        if not self.date_formats and remaining.any():
+            positions = np.flatnonzero(remaining)
+            result = pd.to_datetime(values.iloc[positions].astype(str), format='mixed', errors='coerce')
+            pieces.append(pd.Series(result.array, index=positions))
+        if not pieces:
+            return pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+        parsed = pd.concat(pieces) if len(pieces) > 1 else pieces[0]
+        parsed = parsed.reindex(np.arange(len(values)), fill_value=pd.NaT)
+        parsed.index = values.index
+        return parsed
 
     def parse_dates(self):
         """
         Convert date and time information from raw formats into standardized formats.
         """
         for column in self.date_columns:
-            if self.date_formats:
-                for date_format in self.date_formats:
-                    try:
-                        self.df[column] = pd.to_datetime(self.df[column], format=date_format, errors='coerce')
-                        break  # Exit loop once successful
-                    except ValueError:
-                        continue
-            else:
-                self.df[column] = pd.to_datetime(self.df[column], errors='coerce')
+            self.df[column] = self.parse_column(column)
 
         return self.df
 
@@ -0,0 +1,118 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+
+class TDigest:
+    def __init__(self, compression=200):
+        """
+        Approximate quantiles per key from a bounded number of weighted centroids.
+
+        Values are clustered with the arcsine scale function, so each key keeps at most
+        about compression / 2 centroids and the clusters are smallest near the tails,
+        where the quantile error is then lowest. Centroids and the exact minimum and
+        maximum are stored in DataFrames, so digests built from different chunks or
+        partitions merge by concatenating and recompressing them.
+
+        :param compression: Accuracy parameter; the rank error is roughly 1 / compression
+                            near the median and much smaller near the tails.
+        """
+        self.compression = compression
+        self.centroids = pd.DataFrame({'key': [], 'mean': [], 'weight': []})
+        self.extremes = pd.DataFrame({'min': [], 'max': []})
+
+    @staticmethod
+    def parse_quantile(rule):
+        """
+        Read the quantile of a 'median' or percentile rule such as 'p95' or 'p99.9'.
+
+        :return: Quantile between 0 and 1, or None for other rules.
+        """
+        if rule == 'median':
+            return 0.5
+        match = re.fullmatch(r'p(\d+(?:\.\d+)?)', str(rule))
+        if match and float(match.group(1)) <= 100:
+            return float(match.group(1)) / 100
+        return None
+
+    def _compress(self, centroids):
+        """Merge neighbouring centroids of each key until every cluster spans at most one unit of the scale."""
+        centroids = centroids.sort_values(['key', 'mean'], kind='stable')
+        grouped = centroids.groupby('key', sort=False)['weight']
+        total = grouped.transform('sum').to_numpy()
+        cumulative = grouped.cumsum().to_numpy()
+        q = (cumulative - centroids['weight'].to_numpy() / 2) / total
+        bucket = np.floor(self.compression / (2 * np.pi) * np.arcsin(2 * q - 1))
+        weighted = centroids.assign(bucket=bucket, mean=centroids['mean'] * centroids['weight'])
+        merged = weighted.groupby(['key', 'bucket'], sort=True)[['mean', 'weight']].sum()
+        merged['mean'] /= merged['weight']
+        return merged.reset_index(level='key').reset_index(drop=True)
+
+    def _add(self, centroids, extremes):
+        if self.centroids.empty:
+            combined, extremes_combined = centroids, extremes
+        else:
+            combined = pd.concat([self.centroids, centroids], ignore_index=True)
+            extremes_combined = pd.concat([self.extremes, extremes]).groupby(level=0).agg({'min': 'min', 'max': 'max'})
+        self.centroids = self._compress(combined)
+        self.extremes = extremes_combined.sort_index()
+        return self
+
+    def update(self, keys, values):
+        """
+        Add values to the digest of their key.
+
+        :param keys: Key of every value, e.g. the user_id column.
+        :param values: Numeric values; missing values are ignored.
+        """
+        frame = pd.DataFrame({'key': np.asarray(keys), 'mean': np.asarray(values, dtype=float)}).dropna()
+        if frame.empty:
+            return self
+        extremes = frame.groupby('key')['mean'].agg(['min', 'max'])
+        return self._add(frame.assign(weight=1.0), extremes)
+
+    def merge(self, other):
+        """
+        Merge another digest into this one, e.g. the digest of another chunk.
+
+        :param other: TDigest to merge.
+        """
+        if other.centroids.empty:
+            return self
+        return self._add(other.centroids, other.extremes)
+
+    def quantile(self, q=0.5):
+        """
+        Estimate a quantile of every key by interpolating between centroids.
+
+        :param q: Quantile between 0 and 1.
+        :return: Series of quantiles indexed by key.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if self.centroids.empty:
+            return pd.Series(dtype=float)
+        centroids = self.centroids
+        keys = centroids['key'].to_numpy()
+        weight = centroids['weight'].to_numpy()
+        totals = centroids.groupby('key', sort=True)['weight'].sum()
+        # Lay the keys out one after another, with a gap so interpolation never crosses keys
+        offsets = pd.Series(np.concatenate([[0], np.cumsum(totals.to_numpy() + 1)[:-1]]), index=totals.index)
+        start = offsets.to_numpy()
+        end = start + totals.to_numpy()
+        cumulative = centroids.groupby('key', sort=False)['weight'].cumsum().to_numpy()
+        positions = offsets.reindex(keys).to_numpy() + cumulative - weight / 2
+        extremes = self.extremes.reindex(totals.index)
+        x = np.concatenate([start, positions, end])
+        y = np.concatenate([extremes['min'].to_numpy(), centroids['mean'].to_numpy(), extremes['max'].to_numpy()])
+        order = np.argsort(x, kind='stable')
+        values = np.interp(start + q * totals.to_numpy(), x[order], y[order])
+        return pd.Series(values, index=totals.index.rename(None))
+
+# Example usage:
+# digest = TDigest(compression=200)
+# for chunk in pd.read_csv('data.csv', chunksize=100_000):
+#     digest.update(chunk['user_id'], chunk['amount'])
+# medians = digest.quantile(0.5)
+# p99 = digest.quantile(0.99)
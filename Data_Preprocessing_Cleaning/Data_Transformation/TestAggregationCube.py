@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Aggregator import Aggregator
+from AggregationCube import AggregationCube
+
+
+@pytest.fixture
+def sample_df():
+    rng = np.random.default_rng(0)
+    n = 500
+    df = pd.DataFrame({
+        'user_id': rng.integers(1, 10, n).astype(float),
+        'type': rng.choice(['sale', 'refund'], n),
+        'date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 60 * 24, n), unit='h'),
+        'amount': rng.normal(100, 20, n),
+        'age': rng.integers(18, 90, n),
+    })
+    df.loc[::17, 'amount'] = np.nan
+    df.loc[::23, 'user_id'] = np.nan
+    df.loc[::29, 'date'] = pd.NaT
+    return df
+
+
+@pytest.mark.parametrize('group_by', [['user_id'], ['type'], ['user_id', 'type']])
+def test_rollup_matches_groupby(sample_df, group_by):
+    aggregator = Aggregator(sample_df)
+    cube = aggregator.build_cube(['user_id', 'type'], ['amount', 'age'], date_column='date')
+    calculations = {'amount': ['sum', 'mean', 'count', 'min', 'max', 'std'], 'age': 'mean'}
+
+    pd.testing.assert_frame_equal(cube.rollup(group_by, calculations),
+                                  aggregator.calculate_aggregated_values(group_by, calculations),
+                                  check_dtype=False)
+
+
+def test_rollup_single_rules_keep_flat_columns(sample_df):
+    cube = AggregationCube(sample_df, ['user_id'], ['amount', 'age'])
+    calculations = {'amount': 'sum', 'age': 'max'}
+
+    pd.testing.assert_frame_equal(cube.rollup(['user_id'], calculations),
+                                  sample_df.groupby('user_id').agg(calculations).reset_index())
+
+
+def test_time_grains_and_totals(sample_df):
+    cube = AggregationCube(sample_df, ['user_id'], ['amount'], date_column='date')
+
+    weeks = sample_df.assign(week=sample_df['date'].dt.to_period('W').dt.start_time)
+    pd.testing.assert_frame_equal(cube.rollup(['week'], {'amount': 'mean'}),
+                                  weeks.groupby('week').agg({'amount': 'mean'}).reset_index())
+
+    days = sample_df.assign(date=sample_df['date'].dt.floor('D'))
+    pd.testing.assert_frame_equal(cube.rollup(['date'], {'amount': 'sum'}),
+                                  days.groupby('date').agg({'amount': 'sum'}).reset_index())
+
+    totals = cube.rollup([], {'amount': ['sum', 'count']})
+    assert totals[('amount', 'sum')].iloc[0] == pytest.approx(sample_df['amount'].sum())
+    assert totals[('amount', 'count')].iloc[0] == sample_df['amount'].count()
+
+
+def test_rollups_reuse_partials(sample_df):
+    cube = AggregationCube(sample_df, ['user_id', 'type'], ['amount'])
+    results = cube.rollups([['user_id'], ['type']], {'amount': 'sum'})
+
+    assert set(results) == {('user_id',), ('type',)}
+    assert len(cube.partials) <= sample_df['user_id'].nunique(dropna=False) * 2
+
+
+def test_unsupported_rollups(sample_df):
+    cube = AggregationCube(sample_df, ['user_id'], ['amount'])
+    with pytest.raises(ValueError):
+        cube.rollup(['user_id'], {'amount': 'median'})
+    with pytest.raises(ValueError):
+        cube.rollup(['type'], {'amount': 'sum'})
+    with pytest.raises(ValueError):
+        cube.rollup(['user_id'], {'age': 'sum'})
@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+from AggregationState import AggregationState
+
+@pytest.fixture
+def history_df():
+    data = {
+        'user_id': [1, 2, 1, 3],
+        'amount': [100, 200, 150, 400]
+    }
+    return pd.DataFrame(data)
+
+@pytest.fixture
+def delta_df():
+    data = {
+        'user_id': [1, 4],
+        'amount': [50, 10]
+    }
+    return pd.DataFrame(data)
+
+@pytest.mark.parametrize('rule', ['sum', 'count', 'mean', 'min', 'max'])
+def test_update_matches_full_groupby(history_df, delta_df, rule):
+    state = AggregationState()
+    state.update(history_df, ['amount'])
+    state.update(delta_df, ['amount'])
+
+    # Merging partials gives the same result as aggregating all rows at once
+    expected = pd.concat([history_df, delta_df]).groupby('user_id')['amount'].agg(rule)
+    pd.testing.assert_series_equal(state.values('amount', rule), expected, check_dtype=False, check_names=False)
+
+def test_save_and_load(history_df, delta_df, tmp_path):
+    path = tmp_path / 'aggregation_state.pkl'
+    state = AggregationState.load(path)
+    state.update(history_df, ['amount'])
+    state.save()
+
+    reloaded = AggregationState.load(path)
+    reloaded.update(delta_df, ['amount'])
+    assert reloaded.values('amount', 'sum').to_dict() == {1: 300, 2: 200, 3: 400, 4: 10}
+
+def test_unsupported_rule(history_df):
+    state = AggregationState()
+    state.update(history_df, ['amount'])
+    with pytest.raises(ValueError, match="Unsupported incremental aggregation: std"):
+        state.values('amount', 'std')
+    # Approximate rules need their sketch, which is only kept when update() gets the rule
+    with pytest.raises(KeyError):
+        state.values('amount', 'median')
+
+def test_approximate_rules_merge_across_states(history_df):
+    first, second = AggregationState(), AggregationState()
+    rules = {'amount': 'median', 'user_id': 'nunique'}
+    first.update(history_df.iloc[:2], rules)
+    second.update(history_df.iloc[2:], rules)
+    first.merge(second)
+
+    expected = history_df.groupby('user_id')['amount'].median()
+    pd.testing.assert_series_equal(first.values('amount', 'median'), expected, check_names=False)
+    assert (first.values('user_id', 'nunique') == 1).all()
+
+if __name__ == '__main__':
+    pytest.main()
@@ -56,5 +56,15 @@ def test_calculate_aggregated_values_custom_agg(sample_df):
 
     pd.testing.assert_frame_equal(aggregated_df, expected_df)
 
+def test_calculate_aggregated_values_approximate(sample_df):
+    aggregator = Aggregator(sample_df)
+    calculations = {'amount': ['median', 'p100', 'sum'], 'age': 'nunique'}
+    aggregated_df = aggregator.calculate_aggregated_values(['user_id'], calculations, approximate=True)
+
+    # Small groups fit in single-value centroids and registers, so the sketches are exact
+    expected_df = aggregator.calculate_aggregated_values(['user_id'], {'amount': ['median', 'max', 'sum'], 'age': 'nunique'})
+    expected_df.columns = aggregated_df.columns
+    pd.testing.assert_frame_equal(aggregated_df, expected_df, check_dtype=False)
+
 if __name__ == '__main__':
     pytest.main()
@@ -25,3 +25,47 @@ def test_parse_dates_invalid_format(sample_df):
     expected_df = pd.DataFrame(expected_data)
 
     pd.testing.assert_frame_equal(parsed_df, expected_df)
+
+def test_parse_dates_mixed_formats(sample_df):
+    date_parser = DateParser(
+        sample_df,
+        date_columns=['date_of_birth'],
+        date_formats=['%Y-%m-%d', '%m/%d/%Y', '%d-%m-%Y']
+    )
+    parsed_df = date_parser.parse_dates()
+
+    # Every format is tried on the rows the previous ones left unparsed
+    expected = pd.Series(pd.to_datetime(['1990-01-01', '1985-02-28', '2000-12-31', None]), name='date_of_birth')
+    pd.testing.assert_series_equal(parsed_df['date_of_birth'], expected)
+
+def test_parse_dates_inferred_formats(sample_df):
+    date_parser = DateParser(sample_df, date_columns=['date_of_birth', 'registration_date'])
+    parsed_df = date_parser.parse_dates()
+
+    assert parsed_df['date_of_birth'].tolist()[:3] == list(pd.to_datetime(['1990-01-01', '1985-02-28', '2000-12-31']))
+    assert pd.isna(parsed_df.loc[3, 'date_of_birth'])
+    assert parsed_df.loc[3, 'registration_date'] == pd.Timestamp('2023-04-05')
+
+def test_inferred_formats_are_cached(sample_df):
+    date_parser = DateParser(sample_df, date_columns=['date_of_birth'], date_formats=['%m/%d/%Y', '%Y-%m-%d'])
+    date_parser.parse_dates()
+    assert date_parser.inferred_formats['date_of_birth'] == ['%m/%d/%Y', '%Y-%m-%d']
+
+    # A later chunk reuses the cached formats instead of sampling again
+    date_parser.df = pd.DataFrame({'date_of_birth': ['2024-03-01']})
+    date_parser.date_formats = None
+    assert date_parser.parse_dates()['date_of_birth'].tolist() == [pd.Timestamp('2024-03-01')]
+    assert date_parser.inferred_formats['date_of_birth'] == ['%m/%d/%Y', '%Y-%m-%d']
+
+def test_parse_dates_keeps_time_zones():
+    df = pd.DataFrame({
+        'aware': ['2024-01-01 10:00 +0100', None, '2024-01-02 11:30 +0100'],
+        'mixed': ['2024-01-01 10:00 +0100', '2024-01-01', '2024-01-02 11:30 +0100'],
+    })
+    parsed_df = DateParser(df, date_columns=['aware', 'mixed'], date_formats=['%Y-%m-%d %H:%M %z', '%Y-%m-%d']).parse_dates()
+
+    expected = pd.Series(pd.to_datetime(['2024-01-01 10:00 +0100', None, '2024-01-02 11:30 +0100']), name='aware')
+    pd.testing.assert_series_equal(parsed_df['aware'], expected)
+    # Values with and without a zone are kept as they were parsed
+    assert parsed_df['mixed'].tolist() == [pd.Timestamp('2024-01-01 10:00+0100'), pd.Timestamp('2024-01-01'),
+                                           pd.Timestamp('2024-01-02 11:30+0100')]
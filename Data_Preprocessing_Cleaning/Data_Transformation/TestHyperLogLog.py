@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from HyperLogLog import HyperLogLog
+
+
+@pytest.mark.parametrize('error', [0.05, 0.01])
+def test_estimate_within_error(error):
+    rng = np.random.default_rng(0)
+    keys = rng.integers(0, 5, 200_000)
+    values = rng.integers(0, 50_000, 200_000)
+
+    estimate = HyperLogLog(error).update(keys, values).estimate()
+    exact = pd.Series(values).groupby(keys).nunique()
+    assert ((estimate - exact).abs() / exact).max() < 4 * error
+
+
+
+@pytest.mark.parametrize('multiple', [0.5, 2, 2.5, 3, 4])
+def test_estimate_within_error_around_linear_counting_range(multiple):
+    # 40 keys are 40 independent sketches of the same cardinality, around 2.5 m registers
+    error, trials = 0.02, 40
+    n = int(multiple * (1 << HyperLogLog(error).precision))
+    keys = np.repeat(np.arange(trials), n)
+    values = keys * 10_000_000 + np.tile(np.arange(n), trials)
+
+    relative = HyperLogLog(error).update(keys, values).estimate() / n - 1
+    assert abs(relative.mean()) < error / 4
+    assert np.sqrt((relative ** 2).mean()) < error
+
+def test_merge_matches_single_sketch():
+    rng = np.random.default_rng(1)
+    keys = rng.integers(0, 3, 10_000)
+    values = rng.integers(0, 5_000, 10_000)
+
+    merged = HyperLogLog().update(keys[:5_000], values[:5_000]).merge(HyperLogLog().update(keys[5_000:], values[5_000:]))
+    pd.testing.assert_series_equal(merged.estimate(), HyperLogLog().update(keys, values).estimate())
+
+
+def test_small_counts_and_missing_values():
+    sketch = HyperLogLog().update(['a', 'a', 'a', 'b', 'b'], ['x', 'y', None, 'x', 'x'])
+    assert sketch.estimate().to_dict() == {'a': 2, 'b': 1}
+
+
+def test_merge_requires_same_precision():
+    with pytest.raises(ValueError):
+        HyperLogLog(0.01).merge(HyperLogLog(0.1))
+
+
+def test_equal_numbers_of_different_dtypes_count_once():
+    sketch = HyperLogLog()
+    sketch.update([1, 1], pd.Series([1, 2], dtype='int64'))
+    sketch.update([1, 1], pd.Series([1.0, 2.0], dtype='float64'))
+    sketch.update([1, 1, 1], pd.Series([1, 2.0, -0.0], dtype=object))
+    sketch.update([1], pd.Series([0], dtype='Int64'))
+    assert sketch.estimate().to_dict() == {1: 3}
+
+
+def test_strings_are_not_numbers():
+    sketch = HyperLogLog().update([1, 1, 1], pd.Series(['1', 1, 'a'], dtype=object))
+    assert sketch.estimate().to_dict() == {1: 3}
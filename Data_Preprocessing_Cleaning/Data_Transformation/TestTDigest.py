@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from TDigest import TDigest
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 4, 100_000), rng.lognormal(0, 1, 100_000)
+
+
+@pytest.mark.parametrize('q', [0.01, 0.5, 0.99])
+def test_quantile_rank_error(values, q):
+    keys, data = values
+    estimate = TDigest(compression=100).update(keys, data).quantile(q)
+    for key, value in estimate.items():
+        assert abs((data[keys == key] <= value).mean() - q) < 0.01
+
+
+def test_merge_matches_single_digest(values):
+    keys, data = values
+    merged = TDigest().update(keys[:50_000], data[:50_000]).merge(TDigest().update(keys[50_000:], data[50_000:]))
+    exact = pd.Series(data).groupby(keys).quantile(0.9)
+    pd.testing.assert_series_equal(merged.quantile(0.9), exact, rtol=0.01)
+    assert len(merged.centroids) <= 4 * 100
+
+
+def test_extremes_and_small_groups():
+    digest = TDigest().update([1, 1, 1, 1, 2], [1.0, 2.0, 3.0, 4.0, 7.0])
+    assert digest.quantile(0.5).to_dict() == {1: 2.5, 2: 7.0}
+    assert digest.quantile(0).to_dict() == {1: 1.0, 2: 7.0}
+    assert digest.quantile(1).to_dict() == {1: 4.0, 2: 7.0}
+
+
+@pytest.mark.parametrize('rule, expected', [('median', 0.5), ('p95', 0.95), ('p99.9', 0.999), ('sum', None), ('p101', None)])
+def test_parse_quantile(rule, expected):
+    assert TDigest.parse_quantile(rule) == (None if expected is None else pytest.approx(expected))
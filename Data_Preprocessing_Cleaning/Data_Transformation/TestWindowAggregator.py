@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from WindowAggregator import WindowAggregator
+
+
+@pytest.fixture
+def sample_df():
+    rng = np.random.default_rng(0)
+    n = 2_000
+    df = pd.DataFrame({
+        'user_id': rng.integers(1, 20, n),
+        'date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 120 * 24, n), unit='h'),
+        'amount': rng.normal(100, 10, n),
+    })
+    df.loc[::13, 'amount'] = np.nan
+    df.loc[::31, 'date'] = pd.NaT
+    return df
+
+
+@pytest.mark.parametrize('rule', ['sum', 'count', 'mean'])
+def test_rolling_matches_pandas(sample_df, rule):
+    result = WindowAggregator(['amount'], rolling=['7D', '30D'], rule=rule).transform(sample_df)
+
+    valid = sample_df.dropna(subset=['date']).sort_values(['user_id', 'date'], kind='stable')
+    for window in ['7D', '30D']:
+        expected = valid.groupby('user_id').rolling(window, on='date')['amount'].agg(rule)
+        np.testing.assert_allclose(result.loc[valid.index, f'amount_{rule}_{window}'], expected, rtol=1e-9)
+    # Rows without a date keep their place and get no window value
+    assert result.index.equals(sample_df.index)
+    assert result.loc[sample_df['date'].isna(), f'amount_{rule}_7D'].isna().all()
+
+
+def test_tumbling_windows(sample_df):
+    windows = WindowAggregator(['amount'], tumbling=['D', 'W']).tumbling_windows(sample_df)
+
+    weeks = sample_df.assign(window_start=sample_df['date'].dt.to_period('W').dt.start_time)
+    expected = weeks.groupby(['user_id', 'window_start'])[['amount']].sum().reset_index()
+    pd.testing.assert_frame_equal(windows['W'], expected)
+    assert set(windows) == {'D', 'W'}
+
+
+def test_incremental_updates_match_full_history(sample_df):
+    ordered = sample_df.dropna(subset=['date']).sort_values('date')
+    full = WindowAggregator(['amount'], rolling=['7D', '30D']).transform(ordered)
+
+    windows = WindowAggregator(['amount'], rolling=['7D', '30D'], tumbling=['W'])
+    updates, weeks = [], []
+    for part in np.array_split(np.arange(len(ordered)), 6):
+        updates.append(windows.update(ordered.iloc[part]))
+        weeks.append(windows.tumbling_updates['W'])
+
+    pd.testing.assert_frame_equal(pd.concat(updates), full)
+    # Later updates replace the weeks they touched again
+    latest = pd.concat(weeks).drop_duplicates(['user_id', 'window_start'], keep='last')
+    expected = WindowAggregator(['amount'], tumbling=['W']).tumbling_windows(ordered)['W']
+    pd.testing.assert_frame_equal(latest.sort_values(['user_id', 'window_start']).reset_index(drop=True), expected)
+    # Only rows that can still fall into a window are kept
+    assert len(windows.tail) < len(ordered)
+
+
+def test_unsupported_rule():
+    with pytest.raises(ValueError):
+        WindowAggregator(['amount'], rule='median')
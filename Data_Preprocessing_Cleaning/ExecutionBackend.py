@@ -0,0 +1,235 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+def _import_polars():
+    try:
+        import polars
+    except ImportError as e:
+        raise ImportError("polars is required for the Polars backend. Install it with 'pip install polars'.") from e
+    return polars
+
+
+def _import_duckdb():
+    try:
+        import duckdb
+    except ImportError as e:
+        raise ImportError("duckdb is required for the DuckDB backend. Install it with 'pip install duckdb'.") from e
+    return duckdb
+
+
+def _quote(column):
+    return '"' + str(column).replace('"', '""') + '"'
+
+
+class ExecutionBackend:
+    """
+    Engine that runs the deduplication and groupby work of DataPipeline, Aggregator
+    and DuplicateRemover.
+
+    Every method takes and returns pandas objects, so backends can be swapped without
+    changing pipeline definitions. This base class runs everything on pandas; the
+    Polars and DuckDB backends hand the same work to a multi-threaded columnar engine
+    and fall back to pandas for rules they do not support.
+    """
+
+    name = 'pandas'
+
+    def drop_duplicates(self, df: pd.DataFrame, subset: List[str] = None, keep='first') -> pd.DataFrame:
+        """
+        Drop duplicate rows, like DataFrame.drop_duplicates.
+
+        :param df: Data to deduplicate.
+        :param subset: Columns that identify a duplicate; all columns when None.
+        :param keep: Which duplicates to keep ('first', 'last', or False).
+        :return: Rows that are kept, with their original index.
+        """
+        return df.drop_duplicates(subset=subset, keep=keep)
+
+    def aggregate(self, df: pd.DataFrame, by: List[str], calculations: Dict[str, str]) -> pd.DataFrame:
+        """
+        Aggregate columns per group, like df.groupby(by).agg(calculations).reset_index().
+
+        :param df: Data to aggregate.
+        :param by: Columns to group by.
+        :param calculations: Dictionary with column names and aggregation functions.
+        :return: One row per group, sorted by the group columns.
+        """
+        return df.groupby(by).agg(calculations).reset_index()
+
+    def group_transform(self, df: pd.DataFrame, key: str, rules: Dict[str, str]) -> Dict[str, pd.Series]:
+        """
+        Compute the per-group aggregate of each column, broadcast back to every row.
+
+        :param df: Data to aggregate.
+        :param key: Column to group by.
+        :param rules: Dictionary with column names and aggregation functions.
+        :return: Dictionary with column names and Series aligned with df.
+        """
+        grouped = df.groupby(key)
+        return {column: grouped[column].transform(rule) for column, rule in rules.items()}
+
+    def _broadcast(self, values, df, key, rules):
+        """
+        Wrap per-row group values from another engine in Series with the dtypes pandas gives.
+
+        Dtypes come from the pandas transform of an empty frame, e.g. Int64 sums stay Int64
+        instead of float64, so schema checks and cached stages see the same dtypes on every
+        backend. Like pandas, rows without a key get no group value.
+        """
+        dtypes = ExecutionBackend.group_transform(self, df.iloc[:0], key, rules)
+        has_key = df[key].notna()
+        return {column: pd.Series(values[column], index=df.index, name=column).astype(dtypes[column].dtype)
+                .where(has_key) for column in rules}
+
+    def _restore_dtypes(self, result, df, by, calculations):
+        """Cast an aggregate from another engine to the dtypes of the pandas aggregate, keys included."""
+        dtypes = ExecutionBackend.aggregate(self, df.iloc[:0], by, calculations).dtypes
+        return result.astype(dtypes.to_dict())
+
+
+class PolarsBackend(ExecutionBackend):
+    """Runs deduplication and aggregation on Polars (requires polars and pyarrow)."""
+
+    name = 'polars'
+    RULES = {'sum': 'sum', 'mean': 'mean', 'min': 'min', 'max': 'max', 'count': 'count',
+             'median': 'median', 'std': 'std', 'var': 'var', 'nunique': 'n_unique',
+             'first': 'first', 'last': 'last'}
+
+    def _supported(self, rules):
+        return all(isinstance(rule, str) and rule in self.RULES for rule in rules.values())
+
+    def _expression(self, pl, column, rule):
+        expression = pl.col(column)
+        if rule in ('first', 'last', 'nunique'):
+            # pandas skips missing values here, Polars takes or counts them
+            expression = expression.drop_nulls()
+        return getattr(expression, self.RULES[rule])()
+
+    def drop_duplicates(self, df, subset=None, keep='first'):
+        pl = _import_polars()
+        keys = pl.from_pandas(df if subset is None else df[subset])
+        rows = pl.struct(keys.columns)
+        if keep == 'first':
+            mask = keys.select(rows.is_first_distinct()).to_series()
+        elif keep == 'last':
+            mask = keys.select(rows.is_last_distinct()).to_series()
+        else:
+            mask = keys.select(rows.is_unique()).to_series()
+        return df[mask.to_numpy()]
+
+    def aggregate(self, df, by, calculations):
+        if not self._supported(calculations):
+            return super().aggregate(df, by, calculations)
+        pl = _import_polars()
+        frame = pl.from_pandas(df[list(by) + list(calculations)]).drop_nulls(subset=list(by))
+        expressions = [self._expression(pl, column, rule) for column, rule in calculations.items()]
+        result = frame.group_by(by).agg(expressions).sort(by)
+        return self._restore_dtypes(result.to_pandas(), df, by, calculations)
+
+    def group_transform(self, df, key, rules):
+        if not self._supported(rules):
+            return super().group_transform(df, key, rules)
+        pl = _import_polars()
+        frame = pl.from_pandas(df[[key] + list(rules)])
+        result = frame.select([self._expression(pl, column, rule).over(key) for column, rule in rules.items()])
+        return self._broadcast({column: result.get_column(column).to_numpy() for column in rules}, df, key, rules)
+
+
+class DuckDBBackend(ExecutionBackend):
+    """
+    Runs deduplication and aggregation as SQL on an embedded DuckDB database (requires duckdb).
+
+    :param threads: Number of DuckDB worker threads; all cores when None.
+    """
+
+    name = 'duckdb'
+    RULES = {'sum': 'sum', 'mean': 'avg', 'min': 'min', 'max': 'max', 'count': 'count',
+             'median': 'median', 'std': 'stddev_samp', 'var': 'var_samp', 'first': 'first', 'last': 'last'}
+
+    def __init__(self, threads=None):
+        self.threads = threads
+
+    def _supported(self, rules):
+        return all(isinstance(rule, str) and rule in self.RULES for rule in rules.values())
+
+    def _query(self, sql, frame):
+        duckdb = _import_duckdb()
+        connection = duckdb.connect()
+        try:
+            if self.threads:
+                connection.execute(f'SET threads = {int(self.threads)}')
+            connection.register('frame', frame)
+            return connection.execute(sql).df()
+        finally:
+            connection.close()
+
+    def _expression(self, column, rule, window=''):
+        if rule in ('first', 'last'):
+            # The value of the first or last row in which it is present, like pandas
+            function = 'arg_min' if rule == 'first' else 'arg_max'
+            return f'{function}({_quote(column)}, __row) FILTER (WHERE {_quote(column)} IS NOT NULL){window}'
+        expression = f'{self.RULES[rule]}({_quote(column)}){window}'
+        # pandas sums of empty or all-null groups are 0, SQL sums are NULL
+        return f'coalesce({expression}, 0)' if rule == 'sum' else expression
+
+    def drop_duplicates(self, df, subset=None, keep='first'):
+        keys = df if subset is None else df[subset]
+        frame = keys.reset_index(drop=True).assign(__row=np.arange(len(keys)))
+        partition = ', '.join(_quote(column) for column in keys.columns)
+        if keep is False:
+            condition = f'count(*) OVER (PARTITION BY {partition}) = 1'
+        else:
+            order = 'DESC' if keep == 'last' else 'ASC'
+            condition = f'row_number() OVER (PARTITION BY {partition} ORDER BY __row {order}) = 1'
+        rows = self._query(f'SELECT __row FROM frame QUALIFY {condition} ORDER BY __row', frame)
+        return df.iloc[rows['__row'].to_numpy()]
+
+    def aggregate(self, df, by, calculations):
+        if not self._supported(calculations):
+            return super().aggregate(df, by, calculations)
+        keys = ', '.join(_quote(column) for column in by)
+        columns = ', '.join(f'{self._expression(column, rule)} AS {_quote(column)}'
+                            for column, rule in calculations.items())
+        not_null = ' AND '.join(f'{_quote(column)} IS NOT NULL' for column in by)
+        sql = f'SELECT {keys}, {columns} FROM frame WHERE {not_null} GROUP BY {keys} ORDER BY {keys}'
+        frame = df[list(by) + list(calculations)].reset_index(drop=True).assign(__row=np.arange(len(df)))
+        return self._restore_dtypes(self._query(sql, frame), df, by, calculations)
+
+    def group_transform(self, df, key, rules):
+        if not self._supported(rules):
+            return super().group_transform(df, key, rules)
+        frame = df[[key] + list(rules)].reset_index(drop=True).assign(__row=np.arange(len(df)))
+        window = f' OVER (PARTITION BY {_quote(key)})'
+        columns = ', '.join(f'{self._expression(column, rule, window)} AS {_quote(column)}'
+                            for column, rule in rules.items())
+        result = self._query(f'SELECT {columns} FROM frame ORDER BY __row', frame)
+        return self._broadcast({column: result[column].to_numpy() for column in rules}, df, key, rules)
+
+
+BACKENDS = {'pandas': ExecutionBackend, 'polars': PolarsBackend, 'duckdb': DuckDBBackend}
+
+
+def get_backend(backend=None) -> ExecutionBackend:
+    """
+    Resolve a backend name ('pandas', 'polars' or 'duckdb') or instance.
+
+    :param backend: Backend name, ExecutionBackend instance, or None for pandas.
+    :return: ExecutionBackend instance.
+    """
+    if backend is None:
+        return ExecutionBackend()
+    if isinstance(backend, ExecutionBackend):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unsupported backend: {backend}. Choose one of {', '.join(BACKENDS)}")
+    return BACKENDS[backend]()
+
+# Example usage:
+# pipeline = DataPipeline(df)
+# pipeline.backend = get_backend('duckdb')
+# pipeline.run_pipeline(n_chunks=1)
+#
+# aggregated_df = Aggregator(df, backend='polars').calculate_aggregated_values(['user_id'], {'amount': 'sum'})
@@ -0,0 +1,200 @@
+import logging
+from typing import List
+
+import pandas as pd
+
+
+class LazyPipeline:
+    """
+    Records DataPipeline stages as a plan and runs an optimized version of it on collect().
+
+    The plan only reads the columns the selected output and the stages need, drops
+    duplicates right after converting the key columns so the remaining conversions
+    only run on unique rows, and parses each distinct date string once. Converted and
+    derived columns are written into the frame the plan already copied (by the forward
+    fill or deduplication) instead of copying the whole frame per step. pipeline.df
+    always holds the current frame, so the input is released once the first copy exists.
+    """
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.stages = []
+        self.columns = None
+
+    def select(self, columns: List[str]) -> 'LazyPipeline':
+        """
+        Restrict the output to these columns (plus their aggregated fields).
+
+        :param columns: Columns to keep.
+        """
+        self.columns = list(columns)
+        return self
+
+    def clean(self) -> 'LazyPipeline':
+        """Record data_cleaning. Stages always run in pipeline order, whatever order they are recorded in."""
+        self.stages.append('clean')
+        return self
+
+    def transform(self) -> 'LazyPipeline':
+        """Record data_transformation."""
+        self.stages.append('transform')
+        return self
+
+    def store(self) -> 'LazyPipeline':
+        """
+        Record validate_and_store, checking only the schema columns kept in the output.
+
+        Like run_pipeline, the aggregation_state and deduplicator are saved once the output is stored.
+        """
+        self.stages.append('store')
+        return self
+
+    def optimize(self) -> List[tuple]:
+        """
+        Turn the recorded stages into the list of operations collect() runs.
+
+        :return: List of (operation, argument) tuples.
+        """
+        pipeline = self.pipeline
+        available = list(pipeline.df.columns)
+        subset = None
+        if 'clean' in self.stages:
+            deduplicator = pipeline.deduplicator
+            if deduplicator is None:
+                subset = list(pipeline.duplicate_criteria)
+            elif deduplicator.subset is not None:
+                subset = list(deduplicator.subset)
+            else:
+                subset = available  # The deduplicator hashes every column, as in data_cleaning
+        rules = {}
+        windows = None
+        if 'transform' in self.stages:
+            rules = {column: rule for column, rule in pipeline.aggregation_rules.items() if column in available}
+            windows = pipeline.windows
+
+        if self.columns is not None:
+            output = [column for column in available if column in self.columns]
+            rules = {column: rule for column, rule in rules.items() if column in output}
+            needed = set(output) | set(rules)
+            if rules:
+                needed.add('user_id')
+            if windows is not None:
+                needed |= {windows.key, windows.date_column} | set(windows.columns)
+            if subset is not None:
+                needed |= set(subset)
+            needed = [column for column in available if column in needed]
+        else:
+            output = needed = available
+
+        plan = []
+        if needed != available:
+            plan.append(('project', needed))
+        schema = {column: dtype for column, dtype in pipeline.schema.items() if column in needed}
+        if 'clean' in self.stages:
+            # The key columns are converted first, so duplicates are found on the same values as in data_cleaning
+            keys = {column: dtype for column, dtype in schema.items() if column in subset}
+            rest = {column: dtype for column, dtype in schema.items() if column not in keys}
+            plan.append(('ffill', None))
+            if keys:
+                plan.append(('convert', keys))
+            plan.append(('deduplicate', subset))
+            if rest:
+                plan.append(('convert', rest))
+        if rules:
+            plan.append(('aggregate', rules))
+        if windows is not None:
+            plan.append(('windows', windows.output_columns()))
+        if needed != output:
+            derived = [f'{column}_aggregated' for column in rules]
+            if windows is not None:
+                derived += windows.output_columns()
+            plan.append(('project', output + derived))
+        if 'store' in self.stages:
+            plan.append(('store', {column: dtype for column, dtype in schema.items() if column in output}))
+        return plan
+
+    def _converted_columns(self, df: pd.DataFrame, schema) -> dict:
+        """Convert like DataPipeline.converted_columns, but parse each distinct date string only once."""
+        pipeline = self.pipeline
+        dates = [column for column, dtype in schema.items()
+                 if 'datetime' in dtype and pd.api.types.is_object_dtype(df[column])]
+        others = {column: dtype for column, dtype in schema.items() if column not in dates}
+        converted = pipeline.converted_columns(df, others, pipeline.conversion_workers, pipeline.conversion_block_size)
+        for column in dates:
+            codes, uniques = pd.factorize(df[column])
+            parsed = pipeline.converted_columns(pd.DataFrame({column: uniques}), {column: schema[column]}, 1)[column]
+            converted[column] = pd.Series(parsed.array.take(codes, allow_fill=True), index=df.index, name=column)
+        return converted
+
+    def explain(self) -> str:
+        """Describe the optimized plan, one operation per line."""
+        lines = []
+        for operation, argument in self.optimize():
+            if isinstance(argument, dict):
+                argument = ', '.join(f'{key}: {value}' for key, value in argument.items())
+            elif isinstance(argument, list):
+                argument = ', '.join(argument)
+            lines.append(operation if argument is None else f'{operation} [{argument}]')
+        return '\n'.join(lines)
+
+    def collect(self) -> pd.DataFrame:
+        """
+        Run the optimized plan and leave the result in pipeline.df.
+
+        :return: Resulting DataFrame.
+        """
+        pipeline = self.pipeline
+        try:
+            logging.info('Lazy pipeline execution started.')
+            for operation, argument in self.optimize():
+                df = pipeline.df
+                if operation == 'project':
+                    df = df[argument]
+                elif operation == 'ffill':
+                    # Complete numeric columns are shared with the input instead of copied;
+                    # later operations replace columns and never write into them
+                    df = df.copy(deep=False)
+                    for position in range(df.shape[1]):
+                        column = df.iloc[:, position]
+                        if not (pd.api.types.is_numeric_dtype(column) and not column.hasnans):
+                            df.isetitem(position, column.ffill())
+                elif operation == 'convert':
+                    for column, values in self._converted_columns(df, argument).items():
+                        df[column] = values
+                elif operation == 'deduplicate':
+                    if pipeline.deduplicator is not None:
+                        df = pipeline.deduplicator.drop_duplicates(df)
+                    else:
+                        df = pipeline.backend.drop_duplicates(df, subset=argument)
+                elif operation == 'aggregate':
+                    state = pipeline.aggregation_state
+                    if state is not None:
+                        state.update(df, argument)
+                        for column, rule in argument.items():
+                            df[f'{column}_aggregated'] = df['user_id'].map(state.values(column, rule))
+                    else:
+                        for column, values in pipeline.backend.group_transform(df, 'user_id', argument).items():
+                            df[f'{column}_aggregated'] = values
+                elif operation == 'windows':
+                    for column, values in pipeline.windows.rolling_windows(df).items():
+                        df[column] = values
+                elif operation == 'store':
+                    schema = pipeline.schema
+                    pipeline.schema = argument
+                    try:
+                        pipeline.validate_and_store()
+                    finally:
+                        pipeline.schema = schema
+                    pipeline._save_state()
+                # Drop the pipeline's reference to the previous frame as soon as possible
+                pipeline.df = df
+            logging.info('Lazy pipeline execution completed.')
+            return pipeline.df
+        except Exception as e:
+            logging.error(f'Lazy pipeline execution failed: {e}')
+            raise
+
+# Example usage:
+# plan = DataPipeline(df).plan().select(['date', 'user_id', 'amount']).clean().transform().store()
+# print(plan.explain())
+# result = plan.collect()
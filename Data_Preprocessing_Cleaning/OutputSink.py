@@ -0,0 +1,166 @@
+import os
+import shutil
+from abc import ABC, abstractmethod
+
+import pandas as pd
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("pyarrow is required for Parquet and Feather output. Install it with 'pip install pyarrow'.") from e
+    return pyarrow
+
+
+class OutputSink(ABC):
+    """
+    Base class for the destinations validate_and_store writes to.
+
+    write() is called once per chunk: append=False starts a new output, later calls
+    with append=True add to it, and close() finalizes the file.
+    """
+
+    @abstractmethod
+    def write(self, df: pd.DataFrame, append: bool = False):
+        """
+        Write a chunk.
+
+        :param df: Rows to write.
+        :param append: Add to the current output instead of starting a new one.
+        """
+
+    def close(self):
+        pass
+
+
+class CsvSink(OutputSink):
+    def __init__(self, path, compression=None):
+        """
+        Write CSV text, optionally compressed ('gzip', 'bz2', 'zstd', 'xz', ...).
+
+        :param path: Output file.
+        :param compression: Compression passed to DataFrame.to_csv.
+        """
+        self.path = path
+        self.compression = compression
+
+    def write(self, df, append=False):
+        df.to_csv(self.path, index=False, mode='a' if append else 'w', header=not append,
+                  compression=self.compression)
+
+
+class ArrowSink(OutputSink):
+    """
+    Keeps one pyarrow writer open across chunks so each chunk becomes its own row group.
+
+    Every chunk of an output is converted to the same schema: the one passed in, or
+    the one inferred from the first chunk. Columns of the first chunk that hold only
+    None infer Arrow's null type, which no later value fits, so they are written as
+    strings; pass a schema when such columns hold other types.
+    """
+
+    def __init__(self, path, compression=None, row_group_size=None, schema=None):
+        self.path = path
+        self.compression = compression
+        self.row_group_size = row_group_size
+        self.schema = schema
+        self.output_schema = None
+        self.writer = None
+
+    def _table(self, df):
+        pa = _import_pyarrow()
+        if self.output_schema is None:
+            if self.schema is not None:
+                self.output_schema = self.schema
+            else:
+                inferred = pa.Table.from_pandas(df, preserve_index=False).schema
+                fields = [field.with_type(pa.string()) if pa.types.is_null(field.type) else field for field in inferred]
+                self.output_schema = pa.schema(fields, metadata=inferred.metadata)
+        return pa.Table.from_pandas(df, schema=self.output_schema, preserve_index=False)
+
+    @abstractmethod
+    def _open(self, schema):
+        """Open the pyarrow writer of a new output."""
+
+    def write(self, df, append=False):
+        if not append:
+            self.close()
+            self.output_schema = None
+        table = self._table(df)
+        if self.writer is None:
+            self.writer = self._open(table.schema)
+        self.writer.write_table(table, self.row_group_size)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class ParquetSink(ArrowSink):
+    def __init__(self, path, partition_cols=None, compression='snappy', row_group_size=None, date_format='%Y-%m-%d',
+                 schema=None):
+        """
+        Write Parquet, one row group per chunk (or per row_group_size rows).
+
+        With partition_cols, path is a directory of hive-style partitions such as
+        date=2024-01-01/. Datetime partition columns are partitioned by day.
+
+        :param path: Output file, or directory when partition_cols is given.
+        :param partition_cols: Columns to partition by.
+        :param compression: Parquet codec ('snappy', 'gzip', 'zstd', 'brotli', or None).
+        :param row_group_size: Maximum number of rows per row group.
+        :param date_format: Format of datetime partition values.
+        :param schema: pyarrow schema of the output; inferred from the first chunk when None.
+        """
+        super().__init__(path, compression, row_group_size, schema)
+        self.partition_cols = partition_cols or []
+        self.date_format = date_format
+        self.parts = 0
+
+    def _open(self, schema):
+        return _import_pyarrow().parquet.ParquetWriter(self.path, schema, compression=self.compression)
+
+    def write(self, df, append=False):
+        if not self.partition_cols:
+            return super().write(df, append)
+
+        if not append:
+            self.output_schema = None
+            self.parts = 0
+            if os.path.isdir(self.path):
+                shutil.rmtree(self.path)
+        df = df.copy()
+        for column in self.partition_cols:
+            if pd.api.types.is_datetime64_any_dtype(df[column]):
+                df[column] = df[column].dt.strftime(self.date_format)
+        _import_pyarrow().parquet.write_to_dataset(
+            self._table(df), self.path, partition_cols=self.partition_cols, compression=self.compression,
+            row_group_size=self.row_group_size, basename_template=f'part-{self.parts}-{{i}}.parquet',
+            existing_data_behavior='overwrite_or_ignore')
+        self.parts += 1
+
+
+class FeatherSink(ArrowSink):
+    def __init__(self, path, compression='lz4', row_group_size=None, schema=None):
+        """
+        Write a Feather (Arrow IPC) file, one record batch per chunk.
+
+        :param path: Output file.
+        :param compression: IPC codec ('lz4', 'zstd', or None).
+        :param row_group_size: Maximum number of rows per record batch.
+        :param schema: pyarrow schema of the output; inferred from the first chunk when None.
+        """
+        super().__init__(path, compression, row_group_size, schema)
+
+    def _open(self, schema):
+        pa = _import_pyarrow()
+        options = pa.ipc.IpcWriteOptions(compression=self.compression)
+        return pa.ipc.new_file(self.path, schema, options=options)
+
+# Example usage:
+# pipeline = DataPipeline.from_csv('raw_data.csv')
+# pipeline.sink = ParquetSink('cleaned_data', partition_cols=['date'], compression='zstd')
+# pipeline.run_pipeline()
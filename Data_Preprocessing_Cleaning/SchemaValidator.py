@@ -0,0 +1,111 @@
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class ValidationError(AssertionError):
+    """Raised when data does not match the schema; report holds every violation found."""
+
+    def __init__(self, message: str, report: pd.DataFrame):
+        super().__init__(message)
+        self.report = report
+
+
+class SchemaValidator:
+    REPORT_COLUMNS = ['column', 'check', 'count', 'rows']
+
+    def __init__(self, schema: Dict[str, str], ranges: Dict[str, Tuple] = None,
+                 allowed_values: Dict[str, Iterable] = None, nullable: Iterable[str] = ()):
+        """
+        Compile a schema once into per-column checks that run in one vectorized pass.
+
+        :param schema: Dictionary with column names and their expected dtypes.
+        :param ranges: Dictionary with column names and inclusive (min, max) bounds; None means unbounded.
+        :param allowed_values: Dictionary with column names and their allowed categories.
+        :param nullable: Columns that may contain missing values. All other columns may not.
+        """
+        self.schema = dict(schema)
+        self.ranges = dict(ranges or {})
+        self.allowed_values = {column: pd.Index(list(values)) for column, values in (allowed_values or {}).items()}
+        self.nullable = set(nullable)
+
+    def validate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Check nulls, dtypes, ranges and allowed categories for every column.
+
+        :param df: Data to validate; can be a single chunk of a larger dataset.
+        :return: Violation report with one row per failed check and the offending row indices.
+        """
+        violations = []
+        wrong_dtype = set()
+        for column in self.schema:
+            if column not in df.columns:
+                violations.append((column, 'missing column', 0, np.array([])))
+            elif str(df[column].dtype) != self.schema[column]:
+                violations.append((column, f'dtype {df[column].dtype}, expected {self.schema[column]}', 0, np.array([])))
+                wrong_dtype.add(column)
+
+        for column in df.columns:
+            series = df[column]
+            missing = series.isna().to_numpy()
+            checks = []
+            if column not in self.nullable:
+                checks.append(('missing values', missing))
+            # A column with the wrong dtype is already reported; comparing it could raise
+            if column in self.ranges and column not in wrong_dtype:
+                low, high = self.ranges[column]
+                outside = np.zeros(len(series), dtype=bool)
+                try:
+                    if low is not None:
+                        outside |= (series < low).to_numpy(dtype=bool, na_value=False)
+                    if high is not None:
+                        outside |= (series > high).to_numpy(dtype=bool, na_value=False)
+                except TypeError:
+                    violations.append((column, f'dtype {series.dtype} not comparable with range [{low}, {high}]',
+                                       0, np.array([])))
+                else:
+                    checks.append((f'outside range [{low}, {high}]', outside))
+            if column in self.allowed_values:
+                checks.append(('value not allowed', ~series.isin(self.allowed_values[column]).to_numpy() & ~missing))
+            for check, mask in checks:
+                if mask.any():
+                    rows = df.index.to_numpy()[mask]
+                    violations.append((column, check, len(rows), rows))
+
+        return pd.DataFrame(violations, columns=self.REPORT_COLUMNS)
+
+    @staticmethod
+    def summarize(report: pd.DataFrame, max_rows: int = 5) -> str:
+        """
+        Describe a violation report in a single message.
+
+        :param report: Report returned by validate.
+        :param max_rows: Number of row indices to show per violation.
+        """
+        messages = []
+        for violation in report.itertuples(index=False):
+            message = f'{violation.column}: {violation.check}'
+            if violation.count:
+                rows = ', '.join(str(row) for row in violation.rows[:max_rows])
+                more = ', ...' if violation.count > max_rows else ''
+                message += f' ({violation.count} rows: {rows}{more})'
+            messages.append(message)
+        return 'Validation failed: ' + '; '.join(messages)
+
+    def check(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Validate and raise a ValidationError listing every violation.
+
+        :param df: Data to validate.
+        :return: Empty violation report when the data is valid.
+        """
+        report = self.validate(df)
+        if not report.empty:
+            raise ValidationError(self.summarize(report), report)
+        return report
+
+# Example usage:
+# validator = SchemaValidator({'amount': 'float64', 'type': 'object'},
+#                             ranges={'amount': (0, None)}, allowed_values={'type': ['sale', 'refund']})
+# report = validator.validate(df)
@@ -0,0 +1,114 @@
+from multiprocessing import shared_memory
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+class SharedFrame:
+    """
+    A DataFrame whose numeric and datetime columns live in shared memory.
+
+    Pickling a SharedFrame only sends the block names, dtypes and the remaining
+    (object, string, extension) columns, so another process can map the same
+    numeric data instead of receiving a copy of it.
+    """
+
+    def __init__(self, columns: List[str], blocks: Dict[str, tuple], rest: pd.DataFrame,
+                 start: int = 0, stop: int = None):
+        self.columns = columns
+        self.blocks = blocks
+        self.rest = rest
+        self.start = start
+        self.stop = stop if stop is not None else start + len(rest)
+        self._handles = {}
+
+    @staticmethod
+    def is_shareable(dtype) -> bool:
+        """Whether a column with this dtype can be placed in shared memory."""
+        return isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM'
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'SharedFrame':
+        """
+        Copy the numeric and datetime columns of a DataFrame into shared memory blocks.
+
+        The index is shared as well, so row positions survive the round trip.
+
+        :param df: DataFrame to share.
+        :return: SharedFrame owning the new blocks; call unlink() once it is no longer needed.
+        """
+        shared = cls(list(df.columns), {}, df.loc[:, [c for c in df.columns if not cls.is_shareable(df[c].dtype)]])
+        arrays = {'__index__': df.index.to_numpy()} if cls.is_shareable(df.index.dtype) else {}
+        arrays.update({c: df[c].to_numpy() for c in df.columns if cls.is_shareable(df[c].dtype)})
+        if '__index__' in arrays:
+            shared.rest = shared.rest.reset_index(drop=True)
+        for name, values in arrays.items():
+            handle = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            np.ndarray(values.shape, dtype=values.dtype, buffer=handle.buf)[:] = values
+            shared.blocks[name] = (handle.name, values.dtype.str, len(values))
+            shared._handles[name] = handle
+        return shared
+
+    def slice(self, start: int, stop: int) -> 'SharedFrame':
+        """
+        Return a view of rows start:stop that shares the same memory blocks.
+
+        :param start: First row position.
+        :param stop: Row position after the last row.
+        """
+        return SharedFrame(self.columns, self.blocks, self.rest.iloc[start:stop],
+                           self.start + start, self.start + stop)
+
+    def _array(self, name: str) -> np.ndarray:
+        if name not in self._handles:
+            self._handles[name] = shared_memory.SharedMemory(name=self.blocks[name][0])
+        _, dtype, length = self.blocks[name]
+        values = np.ndarray((length,), dtype=np.dtype(dtype), buffer=self._handles[name].buf)
+        return values[self.start:self.stop]
+
+    def to_frame(self, copy: bool = False) -> pd.DataFrame:
+        """
+        Rebuild the DataFrame from the shared blocks.
+
+        :param copy: Copy the data out of shared memory. Required when the frame must
+                     outlive the blocks, for example before calling unlink().
+        :return: DataFrame with the original column order.
+        """
+        data = {}
+        for column in self.columns:
+            if column in self.blocks:
+                data[column] = self._array(column).copy() if copy else self._array(column)
+            else:
+                values = self.rest[column].array
+                data[column] = values.copy() if copy else values
+        if '__index__' in self.blocks:
+            index = pd.Index(self._array('__index__').copy())
+        else:
+            index = self.rest.index
+        return pd.DataFrame(data, index=index, columns=self.columns, copy=copy)
+
+    def close(self):
+        """Release this process's mappings of the shared blocks."""
+        for handle in self._handles.values():
+            try:
+                handle.close()
+            except BufferError:
+                pass  # A view is still alive; the mapping is released when it is collected
+        self._handles = {}
+
+    def unlink(self):
+        """Close and free the shared blocks. Only the owner should call this, once."""
+        for name in self.blocks:
+            handle = self._handles.get(name) or shared_memory.SharedMemory(name=self.blocks[name][0])
+            self._handles[name] = handle
+            handle.unlink()
+        self.close()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_handles'] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
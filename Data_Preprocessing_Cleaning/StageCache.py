@@ -0,0 +1,168 @@
+import contextlib
+import glob
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+
+class StageCache:
+    SUFFIX = '.pkl'
+
+    def __init__(self, directory, max_bytes=1 << 30, code_version=None):
+        """
+        Keep the output of pipeline stages on disk, addressed by the inputs that produced it.
+
+        A stage key hashes the input fingerprint with everything that determines the
+        stage output, so a rerun on the same data and settings finds the earlier output,
+        while a changed parameter or changed pipeline code misses the cache. Entries are
+        pickles, which keep every dtype; reading an entry refreshes its modification
+        time, and once the directory grows beyond max_bytes the least recently used
+        entries are removed.
+
+        :param directory: Directory for the cached stage outputs; created if missing.
+        :param max_bytes: Size cap of the directory.
+        :param code_version: Version included in every key; defaults to a hash of the
+                             pipeline source files, so code changes invalidate the cache.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.code_version = code_version if code_version is not None else self.source_version()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def source_version():
+        """Hash the pipeline modules next to this file and in its subpackages, leaving out tests."""
+        root = os.path.dirname(os.path.abspath(__file__))
+        digest = hashlib.sha256()
+        for path in sorted(glob.glob(os.path.join(root, '**', '*.py'), recursive=True)):
+            if os.path.basename(path).startswith('Test'):
+                continue
+            digest.update(os.path.relpath(path, root).encode())
+            with open(path, 'rb') as file:
+                digest.update(file.read())
+        return digest.hexdigest()
+
+    @staticmethod
+    def fingerprint(df: pd.DataFrame) -> str:
+        """
+        Hash the contents of a DataFrame, including its index, column names and dtypes.
+
+        Object columns holding unhashable values such as lists or dicts are hashed by the
+        repr of their values, printed in full so that large arrays do not collide.
+
+        :param df: Data to fingerprint.
+        :return: Hex digest.
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps([[str(column), str(dtype)] for column, dtype in df.dtypes.items()]).encode())
+        try:
+            hashes = pd.util.hash_pandas_object(df, index=True)
+        except TypeError:
+            with np.printoptions(threshold=sys.maxsize):
+                printed = {column: df[column].map(repr) for column in df.select_dtypes(include='object')}
+            hashes = pd.util.hash_pandas_object(df.assign(**printed), index=True)
+        digest.update(hashes.to_numpy().tobytes())
+        return digest.hexdigest()
+
+    def key(self, stage: str, parent: str, params) -> str:
+        """
+        Build the key of a stage output.
+
+        :param stage: Stage name.
+        :param parent: Fingerprint of the input or key of the stage the input came from.
+        :param params: JSON-serializable settings that determine the stage output.
+        :return: Hex digest.
+        """
+        payload = json.dumps([stage, parent, params, self.code_version], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    @staticmethod
+    def _touch(path):
+        # The file system clock can be too coarse to order entries used in quick succession
+        now = time.time_ns()
+        os.utime(path, ns=(now, now))
+
+    def get(self, key: str):
+        """
+        Load a cached stage output.
+
+        :param key: Key from key().
+        :return: DataFrame, or None when it is not cached.
+        """
+        path = self._path(key)
+        try:
+            df = pd.read_pickle(path)
+            self._touch(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # A damaged entry is a miss; the stage runs again and rewrites it
+            logging.error(f'Reading cached stage output {key} failed: {e}')
+            return None
+        return df
+
+    def put(self, key: str, df: pd.DataFrame):
+        """
+        Store a stage output and evict the least recently used entries beyond max_bytes.
+
+        :param key: Key from key().
+        :param df: Stage output.
+        """
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(descriptor)
+        try:
+            df.to_pickle(temporary)
+            # Readers never see a partly written entry
+            os.replace(temporary, self._path(key))
+        except Exception:
+            os.remove(temporary)
+            raise
+        self._touch(self._path(key))
+        self.evict(keep=key)
+
+    def evict(self, keep: str = None):
+        """
+        Remove the least recently used entries until the cache fits into max_bytes.
+
+        :param keep: Key that is only removed when it alone exceeds max_bytes.
+        """
+        kept = self._path(keep) if keep else None
+        entries = []
+        for path in glob.glob(os.path.join(self.directory, '*' + self.SUFFIX)):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((path == kept, stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, _, size, _ in entries)
+        # Oldest first, and the entry to keep last
+        for _, _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            total -= size
+
+    def size(self) -> int:
+        """Total size of the cached entries in bytes."""
+        return sum(os.path.getsize(path) for path in glob.glob(os.path.join(self.directory, '*' + self.SUFFIX)))
+
+    def clear(self):
+        """Remove every cached entry."""
+        for path in glob.glob(os.path.join(self.directory, '*' + self.SUFFIX)):
+            os.remove(path)
+
+# Example usage:
+# pipeline = DataPipeline(df, schema)
+# pipeline.cache = StageCache('.pipeline_cache', max_bytes=2 << 30)
+# pipeline.run_pipeline(n_chunks=1)   # a rerun after a failed store resumes from the cached stages
@@ -0,0 +1,168 @@
+import contextlib
+import functools
+import json
+import os
+import time
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def profiled(stage):
+    """
+    Decorate a DataPipeline method so it is recorded as a stage when the pipeline has a profiler.
+
+    :param stage: Stage name used in the report.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            profiler = getattr(self, 'profiler', None)
+            if profiler is None:
+                return method(self, *args, **kwargs)
+            with profiler.stage(stage, lambda: self.df):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class StageProfiler:
+    COLUMNS = ['calls', 'failures', 'wall_seconds', 'cpu_seconds', 'rows_in', 'rows_out',
+               'peak_rss_bytes', 'peak_rss_delta_bytes', 'memory_in_bytes', 'memory_out_bytes']
+    # Cumulative columns, exported as Prometheus counters
+    COUNTERS = ['calls', 'failures', 'wall_seconds', 'cpu_seconds', 'rows_in', 'rows_out']
+
+    def __init__(self, deep_memory=False):
+        """
+        Record wall time, CPU time, rows in/out, peak RSS and frame memory of pipeline stages.
+
+        CPU time includes worker processes that finished during the stage. peak_rss_bytes is
+        the peak RSS of the process when the stage ended and peak_rss_delta_bytes how far the
+        stage raised it; a stage that stays below an earlier peak reports a delta of 0. The
+        process-wide high-water mark is only read, never reset.
+
+        :param deep_memory: Measure object columns exactly with memory_usage(deep=True);
+                            this scans every string, so it is off by default.
+        """
+        self.deep_memory = deep_memory
+        self.records = []
+
+    def _memory(self, df):
+        if df is None:
+            return 0
+        return int(df.memory_usage(deep=self.deep_memory, index=True).sum())
+
+    @staticmethod
+    def _peak_rss():
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+    @staticmethod
+    def _cpu_time():
+        times = os.times()
+        return times.user + times.system + times.children_user + times.children_system
+
+    @contextlib.contextmanager
+    def stage(self, name, frame):
+        """
+        Profile the code run inside the with block as one call of a stage.
+
+        :param name: Stage name.
+        :param frame: Callable returning the stage's current DataFrame, read before and after.
+        """
+        df = frame()
+        record = {'stage': name, 'failed': False, 'rows_in': 0 if df is None else len(df),
+                  'memory_in_bytes': self._memory(df)}
+        peak = self._peak_rss()
+        wall, cpu = time.perf_counter(), self._cpu_time()
+        try:
+            yield record
+        except BaseException:
+            record['failed'] = True
+            raise
+        finally:
+            record['wall_seconds'] = time.perf_counter() - wall
+            record['cpu_seconds'] = self._cpu_time() - cpu
+            record['peak_rss_bytes'] = self._peak_rss()
+            record['peak_rss_delta_bytes'] = None if peak is None else record['peak_rss_bytes'] - peak
+            df = frame()
+            record['rows_out'] = 0 if df is None else len(df)
+            record['memory_out_bytes'] = self._memory(df)
+            self.records.append(record)
+
+    def report(self):
+        """
+        Summarize the recorded calls per stage.
+
+        Times and row counts are summed over the calls of a stage, memory figures are the maximum.
+
+        :return: DataFrame indexed by stage, in the order the stages first ran.
+        """
+        if not self.records:
+            return pd.DataFrame(columns=self.COLUMNS, index=pd.Index([], name='stage'))
+        records = pd.DataFrame(self.records)
+        grouped = records.groupby('stage', sort=False)
+        report = grouped.agg(
+            calls=('stage', 'size'),
+            failures=('failed', 'sum'),
+            wall_seconds=('wall_seconds', 'sum'),
+            cpu_seconds=('cpu_seconds', 'sum'),
+            rows_in=('rows_in', 'sum'),
+            rows_out=('rows_out', 'sum'),
+            peak_rss_bytes=('peak_rss_bytes', 'max'),
+            peak_rss_delta_bytes=('peak_rss_delta_bytes', 'max'),
+            memory_in_bytes=('memory_in_bytes', 'max'),
+            memory_out_bytes=('memory_out_bytes', 'max'),
+        )
+        return report[self.COLUMNS]
+
+    def to_json(self, path=None):
+        """
+        Export the per-stage report as JSON.
+
+        :param path: File to write to; only the string is returned when None.
+        :return: JSON string with one object per stage.
+        """
+        text = self.report().reset_index().to_json(orient='records', indent=2)
+        if path is not None:
+            with open(path, 'w') as file:
+                file.write(text)
+        return text
+
+    def to_prometheus(self, prefix='data_pipeline_stage'):
+        """
+        Export the per-stage report in the Prometheus text exposition format.
+
+        :param prefix: Prefix of the metric names.
+        :return: Metrics text, one metric per report column with a stage label; cumulative
+                 columns are counters named with a _total suffix, memory figures are gauges.
+        """
+        report = self.report()
+        lines = []
+        for column in self.COLUMNS:
+            counter = column in self.COUNTERS
+            metric = f'{prefix}_{column}_total' if counter else f'{prefix}_{column}'
+            lines.append(f'# HELP {metric} Pipeline stage {column.replace("_", " ")}.')
+            lines.append(f'# TYPE {metric} {"counter" if counter else "gauge"}')
+            for stage, value in report[column].items():
+                if pd.notna(value):
+                    lines.append(f'{metric}{{stage={json.dumps(stage)}}} {float(value)!r}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        """Forget all recorded calls."""
+        self.records = []
+
+# Example usage:
+# pipeline = DataPipeline(df)
+# pipeline.profiler = StageProfiler()
+# pipeline.run_pipeline(n_chunks=4)
+# print(pipeline.profiler.report())
+# pipeline.profiler.to_json('pipeline_profile.json')
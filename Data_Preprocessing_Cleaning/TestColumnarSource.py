@@ -0,0 +1,121 @@
+import os
+
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip('pyarrow')
+import pyarrow.csv
+import pyarrow.ipc
+
+from ColumnarSource import ColumnarSource
+from DataPipeline import DataPipeline
+
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    data = {
+        'date': ['2024-01-01', '2024-01-02', None, '2024-01-04', '2024-01-05', '2024-01-05', '2024-01-06'],
+        'user_id': [1, 2, 1, 2, 3, 3, 1],
+        'amount': [10.5, 20.0, 30.0, 40.0, 50.0, 50.0, 60.0],
+        'comment': ['a', '', 'c', 'd', 'e', 'f', 'g'],
+    }
+    path = tmp_path / 'raw_data.csv'
+    pd.DataFrame(data).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def stream_schema():
+    return {'date': 'datetime64[ns]', 'amount': 'float64'}
+
+
+def test_convert_once_and_read_selected_columns(raw_csv):
+    source = ColumnarSource.convert(raw_csv)
+    assert source.path.endswith('raw_data.arrow')
+    modified = os.path.getmtime(source.path)
+
+    # A second conversion reuses the up-to-date file
+    assert ColumnarSource.convert(raw_csv).path == source.path
+    assert os.path.getmtime(source.path) == modified
+
+    source.columns = ['user_id', 'comment']
+    df = source.read()
+    expected = pd.read_csv(raw_csv, usecols=['user_id', 'comment'])
+    assert list(df.columns) == ['user_id', 'comment']
+    pd.testing.assert_series_equal(df['user_id'], expected['user_id'])
+    # Empty fields are missing values, as with pd.read_csv
+    assert df['comment'].isna().tolist() == expected['comment'].isna().tolist()
+
+
+
+def test_convert_streams_the_csv(tmp_path, monkeypatch):
+    csv_path = tmp_path / 'large.csv'
+    expected = pd.DataFrame({'user_id': range(2_000), 'amount': [i / 4 for i in range(2_000)]})
+    expected.to_csv(csv_path, index=False)
+
+    def read_csv(*args, **kwargs):
+        raise AssertionError('the whole CSV was read into memory')
+    monkeypatch.setattr(pa.csv, 'read_csv', read_csv)
+    source = ColumnarSource.convert(str(csv_path), block_size=4_096)
+    with pa.OSFile(source.path, 'rb') as file:
+        assert pa.ipc.open_file(file).num_record_batches > 1
+    with source:
+        pd.testing.assert_frame_equal(source.read(), expected)
+
+
+def test_convert_infers_types_from_all_rows_when_a_later_block_differs(tmp_path):
+    csv_path = tmp_path / 'mixed.csv'
+    amounts = [str(i) for i in range(1_000)] + ['1.5']
+    csv_path.write_text('amount\n' + '\n'.join(amounts) + '\n')
+
+    with ColumnarSource.convert(str(csv_path), block_size=1_024) as source:
+        pd.testing.assert_frame_equal(source.read(), pd.read_csv(csv_path))
+        assert not os.path.exists(source.path + '.tmp')
+
+
+def test_chunks_are_numbered_like_read_csv(raw_csv):
+    source = ColumnarSource(ColumnarSource.convert(raw_csv).path, columns=['user_id', 'amount'])
+    chunks = list(source.iter_chunks(3))
+
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    expected = list(pd.read_csv(raw_csv, usecols=['user_id', 'amount'], chunksize=3))
+    for chunk, expected_chunk in zip(chunks, expected):
+        pd.testing.assert_frame_equal(chunk, expected_chunk)
+
+
+def test_one_memory_map_per_source(raw_csv):
+    with ColumnarSource.convert(raw_csv) as source:
+        source.column_names()
+        mapped = source._file
+        df = source.read()
+        assert source._file is mapped
+
+    assert mapped.closed
+    # Frames read before closing stay usable, and a later read maps the file again
+    assert df['user_id'].sum() == 13
+    assert source.column_names() == ['date', 'user_id', 'amount', 'comment']
+    source.close()
+
+
+def test_streamed_source_is_closed_after_the_run(raw_csv, stream_schema, tmp_path):
+    pipeline = DataPipeline.from_columnar(raw_csv, chunksize=3, schema=stream_schema)
+    pipeline.output_path = str(tmp_path / 'columnar.csv')
+    pipeline.run_pipeline()
+
+    assert pipeline.source._file is None
+
+
+@pytest.mark.parametrize('chunksize', [None, 3])
+def test_from_columnar_matches_from_csv(raw_csv, stream_schema, tmp_path, chunksize):
+    pipeline = DataPipeline.from_columnar(raw_csv, chunksize=chunksize, schema=stream_schema)
+    pipeline.output_path = str(tmp_path / 'columnar.csv')
+    pipeline.run_pipeline(n_chunks=1)
+
+    expected = DataPipeline.from_csv(raw_csv, chunksize=3, schema=stream_schema)
+    expected.output_path = str(tmp_path / 'csv.csv')
+    expected.run_pipeline()
+
+    # Columns the schema and stages do not name are never read
+    stored = pd.read_csv(pipeline.output_path)
+    assert 'comment' not in stored.columns
+    pd.testing.assert_frame_equal(stored, pd.read_csv(expected.output_path).drop(columns='comment'))
@@ -1,9 +1,17 @@
+import gc
+import os
+import warnings
 from unittest.mock import MagicMock
 
+import numpy as np
 import pandas as pd
 import pytest
 
 from DataPipeline import DataPipeline  # Adjust import based on your module name
+from Data_Transformation.AggregationState import AggregationState
+from OutputSink import ParquetSink
+from Data_Cleaning.HashDeduplicator import HashDeduplicator
+from Data_Transformation.WindowAggregator import WindowAggregator
 
 
 @pytest.fixture
@@ -34,6 +42,12 @@ def test_batch_process(sample_df):
     # Check if data is split into chunks and processed
     assert len(pipeline.df) == len(sample_df)
 
+def test_batch_process_requires_user_id_in_duplicate_criteria(sample_df):
+    pipeline = DataPipeline(sample_df)
+    pipeline.duplicate_criteria = ['date']
+    with pytest.raises(ValueError, match='duplicate_criteria'):
+        pipeline.batch_process(n_chunks=2)
+
 def test_run_pipeline(sample_df):
     pipeline = DataPipeline(sample_df)
     pipeline.data_cleaning = MagicMock()  # Mock methods to avoid actual processing
@@ -43,8 +57,298 @@ def test_run_pipeline(sample_df):
 
     pipeline.run_pipeline(n_chunks=2)
 
-    # Check if all pipeline steps are called
+    # Cleaning and transformation run inside the batch_process workers
+    pipeline.data_cleaning.assert_not_called()
+    pipeline.data_transformation.assert_not_called()
+    pipeline.batch_process.assert_called_once_with(2)  # Corrected the argument here
+    pipeline.validate_and_store.assert_called_once()
+
+def test_run_pipeline_single_chunk(sample_df):
+    pipeline = DataPipeline(sample_df)
+    pipeline.data_cleaning = MagicMock()
+    pipeline.data_transformation = MagicMock()
+    pipeline.batch_process = MagicMock()
+    pipeline.validate_and_store = MagicMock()
+
+    pipeline.run_pipeline(n_chunks=1)
+
+    # A single chunk runs the stages in-process
     pipeline.data_cleaning.assert_called_once()
     pipeline.data_transformation.assert_called_once()
-    pipeline.batch_process.assert_called_once_with(2)  # Corrected the argument here
+    pipeline.batch_process.assert_not_called()
     pipeline.validate_and_store.assert_called_once()
+
+@pytest.mark.parametrize('use_shared_memory', [True, False])
+def test_batch_process_matches_serial_run(use_shared_memory):
+    df = pd.DataFrame({
+        'date': ['2024-01-01', '2024-01-02', None, '2024-01-04', '2024-01-04', '2024-01-05'],
+        'user_id': [1, 2, 3, 2, 2, 1],
+        'amount': [10.0, 20.0, 30.0, 40.0, 40.0, 60.0]
+    })
+    schema = {'date': 'datetime64[ns]', 'amount': 'float64'}
+
+    serial = DataPipeline(df.copy(), schema)
+    serial.data_cleaning()
+    serial.data_transformation()
+
+    parallel = DataPipeline(df.copy(), schema)
+    parallel.use_shared_memory = use_shared_memory
+    parallel.batch_process(n_chunks=3, max_workers=2)
+
+    # Row order, deduplication and per-user aggregates match the serial path
+    pd.testing.assert_frame_equal(parallel.df, serial.df.reset_index(drop=True))
+
+def test_single_chunk_run_numbers_rows_like_batch_run(tmp_path):
+    df = pd.DataFrame({
+        'date': ['2024-01-01', '2024-01-01', '2024-01-02', '2024-01-03'],
+        'user_id': [1, 1, 2, 1],
+        'amount': [10.0, 10.0, 20.0, 30.0]
+    })
+    runs = []
+    for n_chunks in [1, 2]:
+        pipeline = DataPipeline(df.copy(), {'date': 'datetime64[ns]', 'amount': 'float64'})
+        pipeline.output_path = str(tmp_path / f'{n_chunks}.csv')
+        pipeline.run_pipeline(n_chunks=n_chunks)
+        runs.append(pipeline.df)
+
+    assert list(runs[0].index) == [0, 1, 2]
+    pd.testing.assert_frame_equal(runs[0], runs[1])
+
+def total_of_positive_amounts(amounts):
+    if (amounts < 0).any():
+        raise ValueError('negative amount')
+    return amounts.sum()
+
+@pytest.mark.skipif(not os.path.isdir('/dev/shm'), reason='shared memory blocks are not listed in /dev/shm')
+def test_failed_batch_unlinks_shared_results():
+    # User 0 lands in the first chunk, so the chunks behind the failed one still share results
+    df = pd.DataFrame({'date': ['2024-01-01'] * 8, 'user_id': range(8), 'amount': [-1.0] + [1.0] * 7})
+    pipeline = DataPipeline(df, {'date': 'datetime64[ns]', 'amount': 'float64'})
+    pipeline.aggregation_rules = {'amount': total_of_positive_amounts}
+    before = set(os.listdir('/dev/shm'))
+
+    with pytest.raises(ValueError, match='negative amount'):
+        pipeline.batch_process(n_chunks=4, max_workers=4)
+
+    assert set(os.listdir('/dev/shm')) - before == set()
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    data = {
+        'date': ['2024-01-01', '2024-01-02', None, '2024-01-04', '2024-01-05', '2024-01-05', '2024-01-06'],
+        'user_id': [1, 2, 1, 2, 3, 3, 1],
+        'amount': [10.5, 20.0, 30.0, 40.0, 50.0, 50.0, 60.0]
+    }
+    path = tmp_path / 'raw_data.csv'
+    pd.DataFrame(data).to_csv(path, index=False)
+    return path
+
+@pytest.fixture
+def stream_schema():
+    return {'date': 'datetime64[ns]', 'amount': 'float64'}
+
+def test_streamed_duplicates_match_in_memory_run(tmp_path):
+    path = tmp_path / 'raw_data.csv'
+    path.write_text('date,user_id,amount\n2024-01-01,1,10.0\n2024-01-02,1,6.0\n2024-01-01,1,10.0\n2024-01-03,,5.0\n')
+    schema = {'date': 'datetime64[ns]', 'amount': 'float64'}
+
+    in_memory = DataPipeline(pd.read_csv(path), schema)
+    in_memory.output_path = tmp_path / 'in_memory.csv'
+    in_memory.run_pipeline(n_chunks=1)
+
+    # The second chunk reads user_id as float64, so its key must still match the int64 one
+    streamed = DataPipeline.from_csv(path, chunksize=2, schema=schema)
+    streamed.output_path = tmp_path / 'streamed.csv'
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        streamed.run_pipeline()
+        gc.collect()
+
+    assert pd.read_csv(streamed.output_path)['amount_aggregated'].tolist() == [21.0, 21.0, 21.0]
+    assert pd.read_csv(in_memory.output_path)['amount_aggregated'].tolist() == [21.0, 21.0, 21.0]
+    # The temporary deduplicator is closed instead of cleaned up by the garbage collector
+    assert not [warning for warning in caught if issubclass(warning.category, ResourceWarning)]
+
+def test_from_csv_streams_in_chunks(raw_csv, stream_schema, tmp_path):
+    pipeline = DataPipeline.from_csv(raw_csv, chunksize=2, schema=stream_schema)
+    pipeline.output_path = tmp_path / 'cleaned_data.csv'
+    chunks = list(pipeline.stream())
+
+    # Each processed chunk stays within the chunk size
+    assert all(len(chunk) <= 2 for chunk in chunks)
+    # Forward fill carries across chunk boundaries
+    stored = pd.read_csv(pipeline.output_path)
+    assert stored['date'].isnull().sum() == 0
+    assert stored.loc[2, 'date'] == '2024-01-02'
+
+def test_from_csv_matches_in_memory_aggregation(raw_csv, stream_schema, tmp_path):
+    pipeline = DataPipeline.from_csv(raw_csv, chunksize=3, schema=stream_schema)
+    pipeline.output_path = tmp_path / 'cleaned_data.csv'
+    pipeline.run_pipeline()
+
+    expected = DataPipeline(pd.read_csv(raw_csv), stream_schema)
+    expected.data_cleaning()
+    expected.data_transformation()
+
+    stored = pd.read_csv(pipeline.output_path)
+    assert stored['amount_aggregated'].tolist() == expected.df['amount_aggregated'].tolist()
+
+def test_from_csv_streams_approximate_median(raw_csv, stream_schema, tmp_path):
+    pipeline = DataPipeline.from_csv(raw_csv, chunksize=3, schema=stream_schema)
+    pipeline.output_path = tmp_path / 'cleaned_data.csv'
+    pipeline.aggregation_rules = {'amount': 'median'}
+    pipeline.run_pipeline()
+
+    expected = DataPipeline(pd.read_csv(raw_csv), stream_schema)
+    expected.aggregation_rules = {'amount': 'median'}
+    expected.data_cleaning()
+    expected.data_transformation()
+
+    # The t-digest of a few values per user is exact
+    stored = pd.read_csv(pipeline.output_path)
+    assert stored['amount_aggregated'].tolist() == expected.df['amount_aggregated'].tolist()
+
+def test_from_csv_rejects_unsupported_streaming_rule(raw_csv, stream_schema):
+    pipeline = DataPipeline.from_csv(raw_csv, chunksize=2, schema=stream_schema)
+    pipeline.aggregation_rules = {'amount': 'std'}
+    with pytest.raises(ValueError, match="Unsupported incremental aggregation: std"):
+        list(pipeline.stream())
+
+@pytest.mark.parametrize('n_chunks', [1, 2])
+def test_incremental_aggregation_state(tmp_path, n_chunks):
+    schema = {'date': 'datetime64[ns]', 'amount': 'float64'}
+    history = pd.DataFrame({'date': ['2024-01-01', '2024-01-01'], 'user_id': [1, 2], 'amount': [10.0, 20.0]})
+    delta = pd.DataFrame({'date': ['2024-01-02', '2024-01-02'], 'user_id': [1, 3], 'amount': [5.0, 7.0]})
+    state_path = tmp_path / 'aggregation_state.pkl'
+
+    for df in [history, delta]:
+        pipeline = DataPipeline(df, schema)
+        pipeline.output_path = tmp_path / 'cleaned_data.csv'
+        pipeline.aggregation_state = AggregationState.load(state_path)
+        pipeline.run_pipeline(n_chunks=n_chunks)
+
+    # Only the delta rows were processed, but the totals cover the whole history
+    assert pipeline.df['amount_aggregated'].tolist() == [15.0, 7.0]
+
+def test_streaming_into_parquet_sink(raw_csv, stream_schema, tmp_path):
+    pytest.importorskip('pyarrow')
+    pipeline = DataPipeline.from_csv(raw_csv, chunksize=2, schema=stream_schema)
+    pipeline.sink = ParquetSink(tmp_path / 'cleaned_data.parquet')
+    pipeline.run_pipeline()
+
+    # Corrected dtypes are kept instead of being flattened to CSV text
+    stored = pd.read_parquet(tmp_path / 'cleaned_data.parquet')
+    assert str(stored['date'].dtype) == 'datetime64[ns]'
+    assert len(stored) == 6
+
+def test_validate_and_store_reports_all_violations(tmp_path):
+    df = pd.DataFrame({'date': pd.to_datetime(['2024-01-01', None]), 'user_id': [1, 2], 'amount': [-5.0, 10.0]})
+    pipeline = DataPipeline(df)
+    pipeline.output_path = tmp_path / 'cleaned_data.csv'
+    pipeline.value_ranges = {'amount': (0, None)}
+
+    with pytest.raises(AssertionError, match='Validation failed'):
+        pipeline.validate_and_store()
+
+    # Nothing is stored and the report points at the offending rows
+    assert not pipeline.output_path.exists()
+    assert set(pipeline.validation_report['column']) == {'date', 'amount'}
+
+def test_streaming_drops_duplicates_across_chunks(raw_csv, stream_schema, tmp_path):
+    pipeline = DataPipeline.from_csv(raw_csv, chunksize=5, schema=stream_schema)
+    pipeline.output_path = tmp_path / 'cleaned_data.csv'
+    pipeline.run_pipeline()
+
+    # (3, 2024-01-05) appears on both sides of the chunk boundary and is kept once
+    stored = pd.read_csv(pipeline.output_path)
+    assert stored.duplicated(subset=['user_id', 'date']).sum() == 0
+    assert len(stored) == 6
+
+@pytest.mark.parametrize('n_chunks', [1, 2])
+def test_deduplicator_drops_rows_from_earlier_runs(tmp_path, n_chunks):
+    schema = {'date': 'datetime64[ns]', 'amount': 'float64'}
+    history = pd.DataFrame({'date': ['2024-01-01', '2024-01-01'], 'user_id': [1, 2], 'amount': [10.0, 20.0]})
+    delta = pd.DataFrame({'date': ['2024-01-01', '2024-01-02'], 'user_id': [1, 1], 'amount': [10.0, 5.0]})
+
+    for df in [history, delta]:
+        pipeline = DataPipeline(df, schema)
+        pipeline.output_path = tmp_path / 'cleaned_data.csv'
+        pipeline.deduplicator = HashDeduplicator(pipeline.duplicate_criteria, spill_dir=tmp_path / 'dedup')
+        pipeline.run_pipeline(n_chunks=n_chunks)
+
+    assert pipeline.df['date'].tolist() == [pd.Timestamp('2024-01-02')]
+    # The row dropped as a duplicate of the earlier run is not aggregated
+    assert pipeline.df['amount_aggregated'].tolist() == [5.0]
+
+def test_rolling_windows_in_batch_and_serial_runs():
+    df = pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=12, freq='3D').astype(str),
+        'user_id': [1, 2, 3] * 4,
+        'amount': [float(i) for i in range(12)],
+    })
+    schema = {'date': 'datetime64[ns]', 'amount': 'float64'}
+
+    serial = DataPipeline(df.copy(), schema)
+    serial.windows = WindowAggregator(['amount'], rolling=['7D'])
+    serial.data_cleaning()
+    serial.data_transformation()
+    # Each user has a row every 9 days, so a 7-day window only holds the row itself
+    assert serial.df['amount_sum_7D'].tolist() == serial.df['amount'].tolist()
+
+    parallel = DataPipeline(df.copy(), schema)
+    parallel.windows = serial.windows
+    parallel.batch_process(n_chunks=2, max_workers=2)
+    pd.testing.assert_frame_equal(parallel.df, serial.df.reset_index(drop=True))
+
+@pytest.mark.parametrize('chunksize', [2, 5])
+def test_rolling_windows_when_streaming(tmp_path, chunksize):
+    df = pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=12, freq='2D').astype(str),
+        'user_id': [1, 2] * 6,
+        'amount': [float(i) for i in range(12)],
+    })
+    schema = {'date': 'datetime64[ns]', 'amount': 'float64'}
+    df.to_csv(tmp_path / 'raw.csv', index=False)
+
+    serial = DataPipeline(df.copy(), schema)
+    serial.windows = WindowAggregator(['amount'], rolling=['7D'])
+    serial.data_cleaning()
+    serial.data_transformation()
+
+    streamed = DataPipeline.from_csv(tmp_path / 'raw.csv', chunksize=chunksize, schema=schema)
+    streamed.windows = serial.windows
+    streamed.output_path = tmp_path / 'cleaned_data.csv'
+    result = pd.concat(list(streamed.stream()), ignore_index=True)
+    # Windows reach back across chunk boundaries
+    pd.testing.assert_series_equal(result['amount_sum_7D'], serial.df['amount_sum_7D'].reset_index(drop=True))
+    assert serial.windows.tail is None
+
+def test_streaming_rejects_windows_over_missing_columns(raw_csv, stream_schema):
+    pipeline = DataPipeline.from_csv(raw_csv, chunksize=2, schema=stream_schema)
+    pipeline.windows = WindowAggregator(['fee'], rolling=['7D'])
+    with pytest.raises(ValueError, match='fee'):
+        next(pipeline.stream())
+
+@pytest.mark.parametrize('max_workers, block_size', [(4, None), (4, 64), (2, 999)])
+def test_parallel_conversion_matches_serial(max_workers, block_size):
+    rng = np.random.default_rng(0)
+    n = 1_000
+    dates = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, n), unit='D')
+    raw_df = pd.DataFrame({
+        'date': dates.strftime('%Y-%m-%d').astype(object),
+        'mixed_date': dates.strftime('%d/%m/%Y').astype(object),
+        'user_id': rng.integers(1, 100, n).astype(str).astype(object),
+        'amount': rng.normal(100, 10, n).round(2).astype(str).astype(object),
+    })
+    raw_df.loc[3::7, 'date'] = 'not a date'
+    raw_df.loc[::11, 'amount'] = None
+    raw_df.loc[::13, 'user_id'] = 'n/a'
+    # After the first value, a different format that the inferred one does not parse
+    raw_df.loc[500:, 'mixed_date'] = dates[500:].strftime('%Y-%m-%d')
+    schema = {'date': 'datetime64[ns]', 'mixed_date': 'datetime64[ns]', 'user_id': 'int64', 'amount': 'float64'}
+
+    serial = DataPipeline.convert_columns(raw_df, schema, max_workers=1)
+    parallel = DataPipeline.convert_columns(raw_df, schema, max_workers=max_workers, block_size=block_size)
+
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert serial['date'].isna().sum() == len(raw_df[3::7])
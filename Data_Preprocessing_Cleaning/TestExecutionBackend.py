@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from DataPipeline import DataPipeline
+from ExecutionBackend import ExecutionBackend, get_backend
+from Data_Cleaning.DuplicateRemover import DuplicateRemover
+from Data_Transformation.Aggregator import Aggregator
+
+
+@pytest.fixture(params=['pandas', 'polars', 'duckdb'])
+def backend(request):
+    if request.param != 'pandas':
+        pytest.importorskip(request.param)
+    if request.param == 'polars':
+        pytest.importorskip('pyarrow')
+    return get_backend(request.param)
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({
+        'user_id': [3, 1, 2, 1, 2, 1],
+        'date': ['2024-01-01', '2024-01-01', '2024-01-02', '2024-01-01', '2024-01-03', '2024-01-04'],
+        'amount': [10.0, 20.0, 30.0, 40.0, 50.0, 60.0],
+    }, index=[10, 11, 12, 13, 14, 15])
+
+
+def test_get_backend():
+    assert get_backend().name == 'pandas'
+    pandas_backend = ExecutionBackend()
+    assert get_backend(pandas_backend) is pandas_backend
+    with pytest.raises(ValueError):
+        get_backend('spark')
+
+
+@pytest.mark.parametrize('keep', ['first', 'last', False])
+def test_drop_duplicates_matches_pandas(backend, sample_df, keep):
+    result = backend.drop_duplicates(sample_df, subset=['user_id', 'date'], keep=keep)
+    pd.testing.assert_frame_equal(result, sample_df.drop_duplicates(subset=['user_id', 'date'], keep=keep))
+
+
+def test_aggregate_matches_pandas(backend, sample_df):
+    result = Aggregator(sample_df, backend=backend).calculate_aggregated_values(['user_id'], {'amount': 'sum'})
+    expected = Aggregator(sample_df).calculate_aggregated_values(['user_id'], {'amount': 'sum'})
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_group_transform_matches_pandas(backend, sample_df):
+    result = backend.group_transform(sample_df, 'user_id', {'amount': 'mean'})
+    expected = sample_df.groupby('user_id')['amount'].transform('mean')
+    pd.testing.assert_series_equal(result['amount'], expected)
+
+
+def test_duplicate_remover_uses_backend(backend, sample_df):
+    result = DuplicateRemover(sample_df.copy(), backend=backend).remove_duplicates(subset=['user_id', 'date'])
+    assert list(result.index) == [10, 11, 12, 14, 15]
+
+
+def test_pipeline_backend_matches_pandas(backend, sample_df):
+    expected = DataPipeline(sample_df.copy())
+    expected.data_cleaning()
+    expected.data_transformation()
+
+    pipeline = DataPipeline(sample_df.copy())
+    pipeline.backend = backend
+    pipeline.data_cleaning()
+    pipeline.data_transformation()
+
+    pd.testing.assert_frame_equal(pipeline.df, expected.df)
+
+
+@pytest.fixture
+def null_df():
+    return pd.DataFrame({
+        'user_id': [1.0, 1.0, 2.0, 2.0, np.nan, 3.0],
+        'amount': [np.nan, 2.0, 3.0, np.nan, 9.0, np.nan],
+    }, index=[10, 11, 12, 13, 14, 15])
+
+
+RULES = ['sum', 'mean', 'min', 'max', 'count', 'median', 'std', 'var', 'first', 'last']
+
+
+@pytest.mark.parametrize('rule', RULES)
+def test_group_transform_with_nulls_matches_pandas(backend, null_df, rule):
+    result = backend.group_transform(null_df, 'user_id', {'amount': rule})
+    expected = null_df.groupby('user_id')['amount'].transform(rule)
+    # Rows without a key get NaN and first/last skip missing values, as in pandas
+    pd.testing.assert_series_equal(result['amount'], expected)
+
+
+@pytest.mark.parametrize('rule', RULES)
+def test_aggregate_with_nulls_matches_pandas(backend, null_df, rule):
+    result = backend.aggregate(null_df, ['user_id'], {'amount': rule})
+    expected = null_df.groupby(['user_id']).agg({'amount': rule}).reset_index()
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_nunique_with_nulls_matches_pandas(backend, null_df):
+    result = backend.group_transform(null_df, 'user_id', {'amount': 'nunique'})
+    expected = null_df.groupby('user_id')['amount'].transform('nunique')
+    pd.testing.assert_series_equal(result['amount'], expected)
+
+
+@pytest.mark.parametrize('rule', RULES + ['nunique'])
+def test_nullable_integers_keep_pandas_dtypes(backend, rule):
+    df = pd.DataFrame({'user_id': pd.array([1, 1, 2, None], dtype='Int64'),
+                       'amount': pd.array([1, None, 3, 4], dtype='Int64')})
+
+    result = backend.group_transform(df, 'user_id', {'amount': rule})
+    pd.testing.assert_series_equal(result['amount'], df.groupby('user_id')['amount'].transform(rule))
+    result = backend.aggregate(df, ['user_id'], {'amount': rule})
+    pd.testing.assert_frame_equal(result, df.groupby(['user_id']).agg({'amount': rule}).reset_index())
+
+
+def test_backend_names_are_resolved(backend, sample_df):
+    result = Aggregator(sample_df, backend=backend.name).calculate_aggregated_values(['user_id'], {'amount': 'sum'})
+    expected = Aggregator(sample_df).calculate_aggregated_values(['user_id'], {'amount': 'sum'})
+    pd.testing.assert_frame_equal(result, expected)
+    remover = DuplicateRemover(sample_df.copy(), backend=backend.name)
+    assert remover.backend.name == backend.name
+    assert list(remover.remove_duplicates(subset=['user_id', 'date']).index) == [10, 11, 12, 14, 15]
@@ -0,0 +1,133 @@
+import weakref
+
+import pandas as pd
+import pytest
+
+from DataPipeline import DataPipeline
+from Data_Cleaning.HashDeduplicator import HashDeduplicator
+from Data_Transformation.AggregationState import AggregationState
+
+
+@pytest.fixture
+def raw_df():
+    return pd.DataFrame({
+        'date': ['2024-01-01', '2024-01-02', None, '2024-01-02', '2024-01-03', '2024-01-01'],
+        'user_id': [1, 2, 2, 2, 3, 1],
+        'amount': [10.0, 20.0, 30.0, 40.0, 50.0, 60.0],
+        'note': ['a', 'b', 'c', 'd', 'e', 'f'],
+    })
+
+
+@pytest.fixture
+def schema():
+    return {'date': 'datetime64[ns]', 'amount': 'float64'}
+
+
+def test_collect_matches_eager(raw_df):
+    eager = DataPipeline(raw_df.copy())
+    eager.data_cleaning()
+    eager.data_transformation()
+
+    source = raw_df.copy()
+    lazy = DataPipeline(source)
+    result = lazy.plan().clean().transform().collect()
+
+    pd.testing.assert_frame_equal(result, eager.df)
+    assert lazy.df is result
+    # Columns shared with the input are never written to
+    pd.testing.assert_frame_equal(source, raw_df)
+
+
+def test_explain_deduplicates_before_converting_other_columns(raw_df):
+    schema = {'date': 'datetime64[ns]', 'user_id': 'int64', 'amount': 'float64', 'note': 'object'}
+    plan = DataPipeline(raw_df, schema=schema).plan().clean().transform()
+    lines = plan.explain().splitlines()
+
+    assert lines[0] == 'ffill'
+    assert lines[1] == 'convert [date: datetime64[ns], user_id: int64]'
+    assert lines[2] == 'deduplicate [user_id, date]'
+    assert lines[3] == 'convert [amount: float64, note: object]'
+    assert lines[4] == 'aggregate [amount: sum]'
+
+
+def test_select_prunes_unused_columns(raw_df):
+    plan = DataPipeline(raw_df).plan().select(['user_id', 'amount']).clean().transform()
+    operations = plan.optimize()
+
+    assert operations[0] == ('project', ['date', 'user_id', 'amount'])
+    assert operations[-1] == ('project', ['user_id', 'amount', 'amount_aggregated'])
+    assert list(plan.collect().columns) == ['user_id', 'amount', 'amount_aggregated']
+
+
+def test_collect_releases_the_input(raw_df, schema):
+    pipeline = DataPipeline(raw_df.copy(), schema=schema)
+    released = []
+    weakref.finalize(pipeline.df, released.append, True)
+    aggregated_after_release = []
+
+    def total(amounts):
+        aggregated_after_release.append(bool(released))
+        return amounts.sum()
+
+    pipeline.aggregation_rules = {'amount': total}
+    pipeline.plan().clean().transform().collect()
+
+    # The input frame is gone before the plan reaches its last operation
+    assert aggregated_after_release and all(aggregated_after_release)
+
+
+def test_deduplicator_without_subset_matches_eager(schema, tmp_path):
+    df = pd.DataFrame({'date': ['2024-01-01', '2024-01-01'], 'user_id': [1, 1], 'amount': ['10', '10.0']})
+    eager = DataPipeline(df.copy(), schema=schema)
+    eager.deduplicator = HashDeduplicator(spill_dir=tmp_path / 'eager')
+    eager.data_cleaning()
+
+    lazy = DataPipeline(df.copy(), schema=schema)
+    lazy.deduplicator = HashDeduplicator(spill_dir=tmp_path / 'lazy')
+    plan = lazy.plan().clean()
+
+    # Every column is hashed, so every schema column is converted before deduplicating
+    assert plan.explain().splitlines()[1] == 'convert [date: datetime64[ns], amount: float64]'
+    pd.testing.assert_frame_equal(plan.collect(), eager.df)
+
+
+def test_store_writes_output(raw_df, schema, tmp_path):
+    pipeline = DataPipeline(raw_df, schema=schema)
+    pipeline.output_path = str(tmp_path / 'out.csv')
+    pipeline.plan().select(['date', 'user_id', 'amount']).clean().transform().store().collect()
+
+    stored = pd.read_csv(pipeline.output_path)
+    assert list(stored.columns) == ['date', 'user_id', 'amount', 'amount_aggregated']
+    assert len(stored) == 3
+    # The full schema is restored after storing the pruned output
+    assert pipeline.schema == schema
+
+
+def test_run_pipeline_lazy(raw_df, schema, tmp_path):
+    eager = DataPipeline(raw_df.copy(), schema=schema)
+    eager.output_path = str(tmp_path / 'eager.csv')
+    eager.run_pipeline(n_chunks=1)
+
+    lazy = DataPipeline(raw_df.copy(), schema=schema)
+    lazy.output_path = str(tmp_path / 'lazy.csv')
+    lazy.lazy = True
+    lazy.run_pipeline(n_chunks=1)
+
+    pd.testing.assert_frame_equal(pd.read_csv(lazy.output_path), pd.read_csv(eager.output_path))
+
+
+def test_store_saves_incremental_state(schema, tmp_path):
+    history = pd.DataFrame({'date': ['2024-01-01', '2024-01-01'], 'user_id': [1, 2], 'amount': [10.0, 20.0]})
+    delta = pd.DataFrame({'date': ['2024-01-01', '2024-01-02'], 'user_id': [1, 1], 'amount': [10.0, 5.0]})
+    state_path = tmp_path / 'aggregation_state.pkl'
+
+    for df in [history, delta]:
+        pipeline = DataPipeline(df, schema)
+        pipeline.output_path = str(tmp_path / 'out.csv')
+        pipeline.aggregation_state = AggregationState.load(state_path)
+        pipeline.deduplicator = HashDeduplicator(pipeline.duplicate_criteria, spill_dir=tmp_path / 'dedup')
+        pipeline.plan().clean().transform().store().collect()
+
+    # The row seen in the first run is dropped and the totals include that run
+    assert pipeline.df['date'].tolist() == [pd.Timestamp('2024-01-02')]
+    assert pipeline.df['amount_aggregated'].tolist() == [15.0]
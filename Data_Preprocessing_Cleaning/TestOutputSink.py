@@ -0,0 +1,84 @@
+import pandas as pd
+import pytest
+from OutputSink import OutputSink, ArrowSink, CsvSink, ParquetSink, FeatherSink
+
+pytest.importorskip('pyarrow')
+
+
+@pytest.fixture
+def chunks():
+    first = pd.DataFrame({
+        'date': pd.to_datetime(['2024-01-01', '2024-01-01']),
+        'user_id': pd.array([1, 2], dtype='Int64'),
+        'amount': [10.0, 20.0]
+    })
+    second = pd.DataFrame({
+        'date': pd.to_datetime(['2024-01-02']),
+        'user_id': pd.array([1], dtype='Int64'),
+        'amount': [30.0]
+    })
+    return [first, second]
+
+def write_all(sink, chunks):
+    for i, chunk in enumerate(chunks):
+        sink.write(chunk, append=i > 0)
+    sink.close()
+
+def test_csv_sink_compressed(chunks, tmp_path):
+    path = tmp_path / 'cleaned_data.csv.gz'
+    write_all(CsvSink(path, compression='gzip'), chunks)
+
+    stored = pd.read_csv(path)
+    assert stored['amount'].tolist() == [10.0, 20.0, 30.0]
+
+def test_parquet_sink_row_group_per_chunk(chunks, tmp_path):
+    import pyarrow.parquet as pq
+    path = tmp_path / 'cleaned_data.parquet'
+    write_all(ParquetSink(path, compression='zstd'), chunks)
+
+    # Each chunk is written as its own row group and dtypes survive the round trip
+    assert pq.ParquetFile(path).num_row_groups == 2
+    pd.testing.assert_frame_equal(pd.read_parquet(path), pd.concat(chunks, ignore_index=True))
+
+def test_parquet_sink_partitioned_by_date(chunks, tmp_path):
+    path = tmp_path / 'cleaned_data'
+    write_all(ParquetSink(path, partition_cols=['date']), chunks)
+
+    assert sorted(p.name for p in path.iterdir()) == ['date=2024-01-01', 'date=2024-01-02']
+    stored = pd.read_parquet(path / 'date=2024-01-01')
+    assert stored['amount'].tolist() == [10.0, 20.0]
+
+def test_parquet_sink_overwrites_previous_output(chunks, tmp_path):
+    path = tmp_path / 'cleaned_data'
+    write_all(ParquetSink(path, partition_cols=['date']), chunks)
+    write_all(ParquetSink(path, partition_cols=['date']), chunks[1:])
+
+    assert [p.name for p in path.iterdir()] == ['date=2024-01-02']
+
+def test_feather_sink(chunks, tmp_path):
+    path = tmp_path / 'cleaned_data.feather'
+    write_all(FeatherSink(path), chunks)
+
+    pd.testing.assert_frame_equal(pd.read_feather(path), pd.concat(chunks, ignore_index=True))
+
+def test_output_sink_is_abstract():
+    with pytest.raises(TypeError):
+        OutputSink()
+    with pytest.raises(TypeError):
+        ArrowSink('out.arrow')
+
+def test_all_null_first_chunk_is_written_as_strings(tmp_path):
+    path = tmp_path / 'cleaned_data.parquet'
+    chunks = [pd.DataFrame({'user_id': [1], 'note': [None]}), pd.DataFrame({'user_id': [2], 'note': ['late']})]
+    write_all(ParquetSink(path), chunks)
+    assert pd.read_parquet(path)['note'].tolist() == [None, 'late']
+
+def test_explicit_schema(tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    path = tmp_path / 'cleaned_data.feather'
+    schema = pa.schema([('user_id', pa.int64()), ('amount', pa.float64())])
+    chunks = [pd.DataFrame({'user_id': [1], 'amount': [None]}), pd.DataFrame({'user_id': [2], 'amount': [2.5]})]
+    write_all(FeatherSink(path, schema=schema), chunks)
+    result = pd.read_feather(path)
+    assert result['amount'].isna().tolist() == [True, False]
+    assert str(result['amount'].dtype) == 'float64'
@@ -0,0 +1,49 @@
+import pickle
+
+import pandas as pd
+import pytest
+from SharedFrame import SharedFrame
+
+
+@pytest.fixture
+def sample_df():
+    data = {
+        'date': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04']),
+        'user_id': [1, 2, 1, 2],
+        'amount': [10.0, 20.0, 30.0, 40.0],
+        'type': ['sale', 'refund', None, 'sale']
+    }
+    return pd.DataFrame(data, index=[3, 1, 2, 0])
+
+def test_round_trip(sample_df):
+    shared = SharedFrame.from_frame(sample_df)
+    try:
+        pd.testing.assert_frame_equal(shared.to_frame(copy=True), sample_df)
+    finally:
+        shared.unlink()
+
+def test_only_object_columns_are_pickled(sample_df):
+    shared = SharedFrame.from_frame(sample_df)
+    try:
+        # Numeric and datetime columns travel as shared memory blocks
+        assert set(shared.blocks) == {'__index__', 'date', 'user_id', 'amount'}
+        assert list(shared.rest.columns) == ['type']
+
+        received = pickle.loads(pickle.dumps(shared.slice(1, 3)))
+        frame = received.to_frame(copy=True)
+        received.close()
+        pd.testing.assert_frame_equal(frame, sample_df.iloc[1:3])
+    finally:
+        shared.unlink()
+
+def test_views_share_memory(sample_df):
+    shared = SharedFrame.from_frame(sample_df)
+    try:
+        view = shared.to_frame()
+        other = pickle.loads(pickle.dumps(shared))
+        other._array('amount')[0] = 99.0
+        assert view['amount'].iloc[0] == 99.0
+        del view
+        other.close()
+    finally:
+        shared.unlink()
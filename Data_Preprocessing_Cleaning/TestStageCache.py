@@ -0,0 +1,114 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from DataPipeline import DataPipeline
+from ExecutionBackend import get_backend
+from StageCache import StageCache
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({
+        'date': ['2024-01-01', '2024-01-02', None, '2024-01-02'],
+        'user_id': [1, 2, 2, 2],
+        'amount': [10.0, 20.0, 30.0, 40.0],
+    })
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return StageCache(str(tmp_path / 'cache'), code_version='test')
+
+
+def make_pipeline(df, cache, tmp_path):
+    pipeline = DataPipeline(df.copy(), schema={'date': 'datetime64[ns]', 'amount': 'float64'})
+    pipeline.output_path = str(tmp_path / 'out.csv')
+    pipeline.cache = cache
+    return pipeline
+
+
+def count_calls(pipeline, stage):
+    calls = []
+    method = getattr(pipeline, stage)
+
+    def wrapper(*args, **kwargs):
+        calls.append(stage)
+        return method(*args, **kwargs)
+    setattr(pipeline, stage, wrapper)
+    return calls
+
+
+def test_rerun_after_failed_store_resumes_from_transformation(sample_df, cache, tmp_path):
+    pipeline = make_pipeline(sample_df, cache, tmp_path)
+    pipeline.value_ranges = {'amount': (0, 15)}
+    with pytest.raises(AssertionError):
+        pipeline.run_pipeline(n_chunks=1)
+    expected = pipeline.df
+
+    rerun = make_pipeline(sample_df, cache, tmp_path)
+    cleaning, transformation = count_calls(rerun, 'data_cleaning'), count_calls(rerun, 'data_transformation')
+    rerun.run_pipeline(n_chunks=1)
+
+    assert cleaning == [] and transformation == []
+    pd.testing.assert_frame_equal(rerun.df, expected)
+    assert os.path.exists(rerun.output_path)
+
+
+def test_changed_aggregation_rules_resume_from_cleaning(sample_df, cache, tmp_path):
+    make_pipeline(sample_df, cache, tmp_path).run_pipeline(n_chunks=1)
+
+    rerun = make_pipeline(sample_df, cache, tmp_path)
+    rerun.aggregation_rules = {'amount': 'mean'}
+    cleaning, transformation = count_calls(rerun, 'data_cleaning'), count_calls(rerun, 'data_transformation')
+    rerun.run_pipeline(n_chunks=1)
+
+    assert cleaning == [] and transformation == ['data_transformation']
+    uncached = make_pipeline(sample_df, None, tmp_path)
+    uncached.aggregation_rules = {'amount': 'mean'}
+    uncached.run_pipeline(n_chunks=1)
+    pd.testing.assert_frame_equal(rerun.df, uncached.df)
+
+
+def test_keys_depend_on_input_settings_and_code(sample_df, cache, tmp_path):
+    pipeline = make_pipeline(sample_df, cache, tmp_path)
+    keys = pipeline._stage_keys()
+
+    changed = make_pipeline(sample_df.assign(amount=sample_df['amount'] + 1), cache, tmp_path)
+    assert changed._stage_keys()['data_cleaning'] != keys['data_cleaning']
+    pipeline.duplicate_criteria = ['user_id']
+    assert pipeline._stage_keys()['data_cleaning'] != keys['data_cleaning']
+    pipeline.duplicate_criteria = ['user_id', 'date']
+    pipeline.backend = get_backend('duckdb')
+    assert pipeline._stage_keys()['data_transformation'] != keys['data_transformation']
+
+    other_code = make_pipeline(sample_df, StageCache(cache.directory, code_version='other'), tmp_path)
+    assert other_code._stage_keys() != keys
+
+
+def test_fingerprint_of_unhashable_values():
+    df = pd.DataFrame({'user_id': [1, 2], 'tags': [['a'], {'b': np.arange(2_000)}]})
+    assert StageCache.fingerprint(df) == StageCache.fingerprint(df.copy(deep=True))
+
+    changed = df.copy()
+    changed.at[1, 'tags'] = {'b': np.arange(2_000) + (np.arange(2_000) == 1_000)}
+    assert StageCache.fingerprint(changed) != StageCache.fingerprint(df)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    frames = {name: pd.DataFrame({'value': range(1000)}) for name in 'abc'}
+    cache = StageCache(str(tmp_path), code_version='test')
+    cache.put('a', frames['a'])
+    entry_size = cache.size()
+    cache.max_bytes = 2 * entry_size
+
+    cache.put('b', frames['b'])
+    assert cache.get('a') is not None  # a is now more recently used than b
+    cache.put('c', frames['c'])
+
+    assert cache.get('b') is None
+    pd.testing.assert_frame_equal(cache.get('a'), frames['a'])
+    pd.testing.assert_frame_equal(cache.get('c'), frames['c'])
+    assert cache.size() <= cache.max_bytes
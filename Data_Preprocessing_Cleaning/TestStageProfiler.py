@@ -0,0 +1,84 @@
+import json
+
+import pandas as pd
+import pytest
+
+from DataPipeline import DataPipeline
+from StageProfiler import StageProfiler
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({
+        'date': ['2024-01-01', '2024-01-02', None, '2024-01-02'],
+        'user_id': [1, 2, 2, 2],
+        'amount': [10.0, 20.0, 30.0, 40.0],
+    })
+
+
+@pytest.fixture
+def profiled_pipeline(sample_df, tmp_path):
+    pipeline = DataPipeline(sample_df, schema={'date': 'datetime64[ns]', 'amount': 'float64'})
+    pipeline.output_path = str(tmp_path / 'out.csv')
+    pipeline.profiler = StageProfiler()
+    return pipeline
+
+
+def test_run_pipeline_records_every_stage(profiled_pipeline):
+    profiled_pipeline.run_pipeline(n_chunks=1)
+    report = profiled_pipeline.profiler.report()
+
+    assert list(report.index) == ['data_cleaning', 'data_transformation', 'validate_and_store']
+    assert report.loc['data_cleaning', 'rows_in'] == 4
+    # The forward-filled row duplicates (2, 2024-01-02)
+    assert report.loc['data_cleaning', 'rows_out'] == 2
+    assert (report['calls'] == 1).all()
+    assert (report['wall_seconds'] >= 0).all()
+    assert (report['cpu_seconds'] >= 0).all()
+    assert (report['peak_rss_bytes'] > 0).all()
+    assert (report['peak_rss_delta_bytes'] >= 0).all()
+    assert (report['peak_rss_delta_bytes'] <= report['peak_rss_bytes']).all()
+    assert (report['memory_in_bytes'] > 0).all()
+
+
+def test_batch_process_is_one_stage(profiled_pipeline):
+    profiled_pipeline.batch_process(n_chunks=2)
+    report = profiled_pipeline.profiler.report()
+
+    # Stages run inside the workers are not profiled separately
+    assert list(report.index) == ['batch_process']
+    assert report.loc['batch_process', 'rows_out'] == 2
+
+
+def test_failed_stage_is_recorded(profiled_pipeline):
+    profiled_pipeline.value_ranges = {'amount': (0, 15)}
+    with pytest.raises(AssertionError):
+        profiled_pipeline.validate_and_store()
+
+    assert profiled_pipeline.profiler.report().loc['validate_and_store', 'failures'] == 1
+
+
+def test_exports(profiled_pipeline, tmp_path):
+    profiled_pipeline.data_cleaning()
+    profiled_pipeline.data_cleaning()
+    profiler = profiled_pipeline.profiler
+
+    path = tmp_path / 'profile.json'
+    records = json.loads(profiler.to_json(path))
+    assert records == json.loads(path.read_text())
+    assert records[0]['stage'] == 'data_cleaning'
+    assert records[0]['calls'] == 2
+
+    metrics = profiler.to_prometheus()
+    assert '# TYPE data_pipeline_stage_wall_seconds_total counter' in metrics
+    assert '# TYPE data_pipeline_stage_memory_out_bytes gauge' in metrics
+    assert 'data_pipeline_stage_calls_total{stage="data_cleaning"} 2.0' in metrics
+
+    profiler.reset()
+    assert profiler.report().empty
+
+
+def test_no_profiler_by_default(sample_df):
+    pipeline = DataPipeline(sample_df)
+    pipeline.data_cleaning()
+    assert pipeline.profiler is None
@@ -0,0 +1,16 @@
+from Benchmarks.PasswordHashBenchmark import PasswordHashBenchmark, main
+
+
+def test_benchmark_and_recommendation():
+    benchmark = PasswordHashBenchmark(['pbkdf2:sha256:1000', 'pbkdf2:sha256:20000'], repeat=2)
+    results = benchmark.run()
+
+    assert results['method'].tolist() == ['pbkdf2:sha256:1000', 'pbkdf2:sha256:20000']
+    assert (results['hash_ms'] > 0).all()
+    assert benchmark.recommend(float(results['verify_ms'].max()) + 1) == 'pbkdf2:sha256:20000'
+    assert benchmark.recommend(0) is None
+
+
+def test_cli(capsys):
+    assert main(['--methods', 'pbkdf2:sha256:1000', '--repeat', '1', '--budget-ms', '1000']) == 0
+    assert "Recommended PASSWORD_HASH_METHOD for 1000.0 ms: 'pbkdf2:sha256:1000'" in capsys.readouterr().out
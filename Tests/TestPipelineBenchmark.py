@@ -0,0 +1,84 @@
+import pandas as pd
+import pytest
+
+from Benchmarks.PipelineBenchmark import PipelineBenchmark, main
+from Benchmarks.SyntheticDataGenerator import SyntheticDataGenerator
+
+
+def test_generator_is_repeatable():
+    first = SyntheticDataGenerator(1_000, seed=1).generate()
+    second = SyntheticDataGenerator(1_000, seed=1).generate()
+    pd.testing.assert_frame_equal(first, second)
+    assert not first.equals(SyntheticDataGenerator(1_000, seed=2).generate())
+
+
+def test_generator_shape():
+    df = SyntheticDataGenerator(10_000, n_users=50, null_rate=0.1, duplicate_rate=0.2,
+                                date_formats=['%Y-%m-%d', '%m/%d/%Y']).generate()
+
+    assert len(df) == 10_000
+    assert list(df.columns) == ['date', 'user_id', 'amount', 'age', 'type']
+    assert df['user_id'].nunique() <= 50
+    assert df['user_id'].notna().all()
+    assert df['amount'].isna().mean() == pytest.approx(0.1, abs=0.02)
+    # At least the generated repeats share a (user_id, date) key with another row
+    assert df.duplicated(subset=['user_id', 'date']).mean() >= 0.2 - 0.02
+    dates = df['date'].dropna()
+    assert dates.str.contains('/').any() and dates.str.contains('-').any()
+
+
+def test_generator_rejects_bad_rates():
+    with pytest.raises(ValueError):
+        SyntheticDataGenerator(10, null_rate=1.5)
+
+
+def test_run_and_compare(tmp_path):
+    benchmark = PipelineBenchmark(sizes=[500], cases=['DataCleaner', 'Aggregator'], repeat=2, warmup=0)
+    results = benchmark.run()
+
+    assert list(results['case']) == ['DataCleaner', 'Aggregator']
+    assert (results['median_seconds'] > 0).all()
+
+    path = tmp_path / 'baseline.json'
+    benchmark.save_baseline(path)
+    comparison = benchmark.compare(path)
+    assert (comparison['ratio'] == 1).all()
+    assert not comparison['regression'].any()
+
+    benchmark.results['median_seconds'] *= 2
+    assert benchmark.compare(path, tolerance=0.5)['regression'].all()
+
+
+def test_compare_fails_without_baseline_result(tmp_path):
+    path = tmp_path / 'baseline.json'
+    baseline = PipelineBenchmark(sizes=[500], cases=['DataCleaner'], repeat=1, warmup=0)
+    baseline.run()
+    baseline.save_baseline(path)
+
+    benchmark = PipelineBenchmark(sizes=[500], cases=['DataCleaner', 'Aggregator'], repeat=1, warmup=0)
+    benchmark.run()
+    comparison = benchmark.compare(path, tolerance=100).set_index('case')
+
+    assert comparison['missing_baseline'].tolist() == [False, True]
+    assert comparison['regression'].tolist() == [False, True]
+
+
+def test_lazy_pipeline_allocates_less_than_eager():
+    benchmark = PipelineBenchmark(sizes=[20_000], cases=['DataPipeline', 'DataPipeline.lazy'], repeat=1, warmup=0)
+    results = benchmark.run().set_index('case')
+
+    # The lazy plan skips the full-frame copies and parses each distinct date once
+    assert results.loc['DataPipeline.lazy', 'peak_memory_bytes'] < results.loc['DataPipeline', 'peak_memory_bytes']
+
+
+def test_unknown_case():
+    with pytest.raises(ValueError):
+        PipelineBenchmark(cases=['Missing'])
+
+
+def test_main(tmp_path, capsys):
+    path = str(tmp_path / 'baseline.json')
+    arguments = ['--sizes', '300', '--cases', 'DuplicateRemover', 'DataPipeline', '--repeat', '1', '--warmup', '0']
+    assert main(arguments + ['--save-baseline', path]) == 0
+    assert main(arguments + ['--baseline', path, '--tolerance', '100']) == 0
+    assert 'DuplicateRemover' in capsys.readouterr().out
@@ -0,0 +1,19 @@
+from Benchmarks.RequestLatencyBenchmark import RequestLatencyBenchmark, load_apps, main
+
+
+def test_benchmark_times_both_modes(tmp_path):
+    benchmark = RequestLatencyBenchmark('/login', requests=5, warmup=1,
+                                        database_url=f"sqlite:///{tmp_path / 'benchmark.db'}")
+    results = benchmark.run()
+
+    assert results['mode'].tolist() == RequestLatencyBenchmark.MODES
+    assert (results['median_ms'] > 0).all()
+    apps = load_apps(benchmark.database_url)
+    # The per-request hook is removed again and the schema was bootstrapped once
+    assert apps.app.before_request_funcs[None] == [apps.ensure_schema]
+    assert apps.schema_ready.is_set()
+
+
+def test_cli(capsys):
+    assert main(['--requests', '3', '--warmup', '0']) == 0
+    assert 'Median latency' in capsys.readouterr().out
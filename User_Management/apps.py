@@ -1,17 +1,29 @@
 from flask import Flask, request, redirect, url_for, flash, render_template, session
 from flask_sqlalchemy import SQLAlchemy
 from flask_mail import Mail, Message
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateIndex
 import secrets
+import threading
 from datetime import datetime, timedelta, timezone
 import os
 from dotenv import load_dotenv
 
+try:
+    from .mail_queue import MailQueue
+    from .password_hasher import PasswordHasher
+    from .permission_cache import PermissionCache
+except ImportError:
+    from mail_queue import MailQueue
+    from password_hasher import PasswordHasher
+    from permission_cache import PermissionCache
+
 load_dotenv()  # Load environment variables from .env file
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key'  # Set a default SECRET_KEY for Flask
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///app.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///app.db')
 app.config['MAIL_SERVER'] = 'smtp.gmail.com'
 app.config['MAIL_PORT'] = 587
 app.config['MAIL_USERNAME'] = os.getenv('MAIL_USERNAME')
@@ -24,6 +36,9 @@ if app.config.get('TESTING'):
 
 db = SQLAlchemy(app)
 mail = Mail(app)
+mail_queue = MailQueue(app)  # Sends mail from background workers instead of the request
+password_hasher = PasswordHasher(app)  # Hashes passwords on a bounded process pool
+permission_cache = PermissionCache(app)  # Serves role and permission lookups from memory
 
 # Models
 # Ensure the user_roles table is defined before referencing it in the User class
@@ -44,6 +59,12 @@ class User(db.Model):
     roles = db.relationship('Role', secondary=user_roles, backref='users')
     reset_tokens = db.relationship('ResetToken', backref='user', lazy=True)
 
+    # Case-insensitive uniqueness, and indexes for the lower() lookups in register and login
+    __table_args__ = (
+        db.Index('ix_user_username_lower', db.func.lower(username), unique=True),
+        db.Index('ix_user_email_lower', db.func.lower(email), unique=True),
+    )
+
 class Role(db.Model):
     role_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     role_name = db.Column(db.String(50), unique=True, nullable=False)
@@ -70,9 +91,95 @@ class ResetToken(db.Model):
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
 
 # Create Database
+schema_ready = threading.Event()
+_schema_lock = threading.Lock()
+
+def bootstrap_schema():
+    """
+    Create any missing tables and User indexes once per process and mark the app as ready.
+
+    Called when the server starts (see start() and `flask --app apps init-db`), so a
+    server that cannot create the schema fails at startup instead of answering every
+    request with an error; requests to a process that skipped it bootstrap on first use.
+    Importing this module does not run it, so spawned password hash workers skip it.
+    """
+    with _schema_lock:
+        if not schema_ready.is_set():
+            try:
+                with app.app_context():
+                    db.create_all()
+                    # create_all skips tables that already exist, so add indexes introduced since;
+                    # expression indexes are not reflected, hence IF NOT EXISTS instead of checkfirst
+                    with db.engine.begin() as connection:
+                        for index in User.__table__.indexes:
+                            connection.execute(CreateIndex(index, if_not_exists=True))
+            except Exception:
+                # e.g. users whose usernames or emails differ only in case block the unique indexes
+                app.logger.exception('Creating the database schema failed')
+                raise
+            schema_ready.set()
+
 @app.before_request
-def create_tables():
-    db.create_all()
+def ensure_schema():
+    # Only a flag check once the schema exists; the readiness probe reports a failure itself
+    if not schema_ready.is_set() and request.endpoint != 'ready':
+        bootstrap_schema()
+
+@app.route('/ready')
+def ready():
+    if not schema_ready.is_set():
+        try:
+            bootstrap_schema()
+        except Exception:
+            return 'schema unavailable', 503
+    return 'ready', 200
+
+# Role and Permission Lookups
+def user_role_ids(user_id):
+    """
+    Ids of the roles assigned to a user, through UserRole or User.roles.
+
+    :param user_id: User id.
+    :return: Frozenset of role ids, cached for PERMISSION_CACHE_TTL seconds.
+    """
+    user_id = int(user_id)
+    query = db.select(UserRole.role_id).where(UserRole.user_id == user_id).union(
+        db.select(user_roles.c.role_id).where(user_roles.c.user_id == user_id))
+    return permission_cache.get(('user', user_id), lambda: frozenset(db.session.execute(query).scalars()))
+
+def role_permission_names(role_id):
+    """
+    Names of the permissions granted to a role.
+
+    :param role_id: Role id.
+    :return: Frozenset of permission names, cached for PERMISSION_CACHE_TTL seconds.
+    """
+    role_id = int(role_id)
+    query = (db.select(Permission.permission_name)
+             .join(RolePermission, RolePermission.permission_id == Permission.permission_id)
+             .where(RolePermission.role_id == role_id))
+    return permission_cache.get(('role', role_id), lambda: frozenset(db.session.execute(query).scalars()))
+
+def all_roles():
+    """
+    Every role as rows with role_id, role_name and description.
+
+    :return: Tuple of rows ordered by id, cached for PERMISSION_CACHE_TTL seconds.
+    """
+    query = db.select(Role.role_id, Role.role_name, Role.description).order_by(Role.role_id)
+    return permission_cache.get(('roles',), lambda: tuple(db.session.execute(query).all()))
+
+def has_permission(user, name):
+    """
+    Check whether any role of a user grants a permission, without querying the database while cached.
+
+    :param user: User or user id.
+    :param name: Permission name.
+    """
+    user_id = getattr(user, 'user_id', user)
+    if user_id is None:
+        return False
+    return any(name in role_permission_names(role_id) for role_id in user_role_ids(user_id))
 
 # Routes
 
@@ -91,14 +198,18 @@ def register():
         elif len(password) < 8 or not any(c.isupper() for c in password) or not any(c.islower() for c in password) or not any(c.isdigit() for c in password) or not any(c in "!@#$%^&*()_+" for c in password):
             flash('Password does not meet complexity requirements.')
             return redirect(url_for('register'))
-        elif User.query.filter_by(email=email).first() or User.query.filter_by(username=username).first():
-            flash('Email or Username already exists.')
-            return redirect(url_for('register'))
         else:
-            hashed_password = generate_password_hash(password)
+            # The unique lower() indexes reject taken usernames and emails in any case,
+            # so the insert doubles as the existence check
+            hashed_password = password_hasher.hash(password)
             new_user = User(username=username, email=email, password_hash=hashed_password)
             db.session.add(new_user)
-            db.session.commit()
+            try:
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+                flash('Email or Username already exists.')
+                return redirect(url_for('register'))
             flash('Registration successful. Please check your email to verify your account.')
             return redirect(url_for('login'))
 
@@ -111,9 +222,17 @@ def login():
     if request.method == 'POST':
         username_or_email = request.form['username_or_email']
         password = request.form['password']
-        user = User.query.filter((User.username == username_or_email) | (User.email == username_or_email)).first()
+        # One lookup on a single lower() index instead of an OR across both columns
+        column = User.email if '@' in username_or_email else User.username
+        user = User.query.filter(func.lower(column) == username_or_email.lower()).first()
+        if user is None and column is User.email:
+            user = User.query.filter(func.lower(User.username) == username_or_email.lower()).first()
 
-        if user and check_password_hash(user.password_hash, password):
+        if user and password_hasher.verify(user.password_hash, password):
+            if password_hasher.needs_rehash(user.password_hash):
+                # The configured cost changed since this hash was made
+                user.password_hash = password_hasher.hash(password)
+                db.session.commit()
             if user.is_verified:
                 session['user_id'] = user.user_id
                 flash('Login successful.')
@@ -139,9 +258,10 @@ def manage_roles():
             new_role = Role(role_name=role_name, description=description)
             db.session.add(new_role)
             db.session.commit()
+            permission_cache.invalidate(('roles',), ('role', new_role.role_id))
             flash('Role created successfully.')
 
-    roles = Role.query.all()
+    roles = all_roles()
     return render_template('manage_roles.html', roles=roles)
 
 @app.route('/assign_role', methods=['POST'])
@@ -154,6 +274,7 @@ def assign_role():
         new_user_role = UserRole(user_id=user_id, role_id=role_id)
         db.session.add(new_user_role)
         db.session.commit()
+        permission_cache.invalidate(('user', int(user_id)))
         flash('Role assigned successfully.')
     else:
         flash('Role already assigned to the user.')
@@ -165,7 +286,7 @@ def assign_role():
 def forgot_password():
     if request.method == 'POST':
         email = request.form['email']
-        user = User.query.filter_by(email=email).first()
+        user = User.query.filter(func.lower(User.email) == email.lower()).first()
 
         if user:
             token = secrets.token_urlsafe(32)
@@ -179,7 +300,7 @@ def forgot_password():
             msg.body = f'Click the link to reset your password: {reset_link}'
             # Suppress email sending in test mode
             if not app.config.get('TESTING', False):
-                mail.send(msg)
+                mail_queue.enqueue(msg)
             flash('Password reset link sent to your email address.')
             return redirect(url_for('forgot_password'))
         else:
@@ -210,7 +331,7 @@ def reset_password(token):
             flash('Password does not meet complexity requirements.')
         else:
             user = db.session.get(User, reset_token.user_id)
-            user.password_hash = generate_password_hash(password)
+            user.password_hash = password_hasher.hash(password)
             db.session.commit()
             db.session.delete(reset_token)
             db.session.commit()
@@ -222,5 +343,18 @@ def reset_password(token):
 def dashboard():
     return 'Dashboard (Implement your dashboard here)'
 
+@app.cli.command('init-db')
+def init_db():
+    """Create any missing tables and indexes."""
+    bootstrap_schema()
+
+def start():
+    """Bootstrap the schema and start the mail queue workers in the serving process."""
+    bootstrap_schema()
+    mail_queue.start()
+
 if __name__ == '__main__':
+    # debug=True runs the reloader, so only the child process it starts serves requests
+    if os.environ.get('WERKZEUG_RUN_MAIN'):
+        start()
     app.run(debug=True)
@@ -0,0 +1,243 @@
+import json
+import logging
+import os
+import smtplib
+import threading
+import time
+import uuid
+
+from flask_mail import Message
+
+MESSAGE_FIELDS = ('subject', 'recipients', 'body', 'html', 'sender', 'cc', 'bcc', 'reply_to', 'charset',
+                  'extra_headers')
+
+# Tells this process apart from an earlier one with the same pid, e.g. pid 1 of a restarted container
+BOOT_ID = uuid.uuid4().hex
+
+
+class MailQueue:
+    def __init__(self, app=None):
+        """
+        Deliver Flask-Mail messages from background threads instead of the request.
+
+        enqueue() writes the message to a spool directory and returns at once. Worker
+        threads claim due messages by renaming them into a processing directory, send
+        them in batches over a single SMTP connection and remove them once delivered.
+        Failed messages are retried with exponential backoff and moved to a failed
+        directory after MAIL_QUEUE_MAX_ATTEMPTS attempts or a permanent (5xx) rejection.
+        Messages still in the spool when the process stops, including those it had
+        claimed, are sent by the workers started with the next process.
+
+        Settings (app.config):
+            MAIL_QUEUE_SPOOL: Spool directory; defaults to mail_spool in the instance folder.
+            MAIL_QUEUE_WORKERS: Number of worker threads.
+            MAIL_QUEUE_BATCH_SIZE: Maximum number of messages sent over one connection.
+            MAIL_QUEUE_MAX_ATTEMPTS: Attempts before a message is given up.
+            MAIL_QUEUE_BACKOFF: Seconds before the first retry, doubled after every failure.
+            MAIL_QUEUE_POLL_INTERVAL: Longest time in seconds an idle worker waits before checking for due retries.
+            MAIL_QUEUE_AUTOSTART: Start the workers in init_app; otherwise they start with start() or the
+                                  first enqueue(). Off by default, so importing an app module, e.g. in a
+                                  spawned worker process, never starts threads that claim spool messages.
+
+        :param app: Flask app with Flask-Mail initialized.
+        """
+        self.app = None
+        self._wakeup = threading.Condition()
+        self._workers = []
+        self._stopping = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('MAIL_QUEUE_SPOOL', os.path.join(app.instance_path, 'mail_spool'))
+        app.config.setdefault('MAIL_QUEUE_WORKERS', 2)
+        app.config.setdefault('MAIL_QUEUE_BATCH_SIZE', 50)
+        app.config.setdefault('MAIL_QUEUE_MAX_ATTEMPTS', 6)
+        app.config.setdefault('MAIL_QUEUE_BACKOFF', 30)
+        app.config.setdefault('MAIL_QUEUE_POLL_INTERVAL', 5)
+        app.config.setdefault('MAIL_QUEUE_AUTOSTART', False)
+        app.extensions['mail_queue'] = self
+        self.app = app
+        if app.config['MAIL_QUEUE_AUTOSTART']:
+            # Deliver what an earlier process left in the spool without waiting for new mail
+            self.start()
+
+    def _directory(self, name):
+        path = os.path.join(self.app.config['MAIL_QUEUE_SPOOL'], name)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def _write(self, path, record):
+        # Write next to the target and rename, so workers never read a partly written message
+        temporary = os.path.join(self._directory('tmp'), os.path.basename(path))
+        with open(temporary, 'w') as file:
+            json.dump(record, file)
+        os.replace(temporary, path)
+
+    @staticmethod
+    def _owner():
+        # Checked on every claim, so a forked worker process does not share its parent's tag
+        return f'{os.getpid()}.{BOOT_ID}'
+
+    @staticmethod
+    def _due_name(due, message_id):
+        # Names start with the due time, so sorting them gives the delivery order
+        return f'{due:020d}-{message_id}.json'
+
+    def enqueue(self, msg: Message) -> str:
+        """
+        Spool a message for delivery and wake a worker.
+
+        :param msg: Flask-Mail message.
+        :return: Id of the spooled message.
+        """
+        message_id = uuid.uuid4().hex
+        fields = {field: getattr(msg, field) for field in MESSAGE_FIELDS}
+        record = {'id': message_id, 'attempts': 0, 'message': fields}
+        self._write(os.path.join(self._directory('pending'), self._due_name(time.time_ns(), message_id)), record)
+        self.start()
+        with self._wakeup:
+            self._wakeup.notify()
+        return message_id
+
+    def _claim(self, limit):
+        """Move up to limit due messages into the processing directory; a rename succeeds for one worker only."""
+        pending, processing = self._directory('pending'), self._directory('processing')
+        now = time.time_ns()
+        claimed = []
+        owner = self._owner()
+        for name in sorted(os.listdir(pending)):
+            if len(claimed) >= limit or int(name.split('-', 1)[0]) > now:
+                break
+            path = os.path.join(processing, f'{owner}-{name}')
+            try:
+                os.rename(os.path.join(pending, name), path)
+            except FileNotFoundError:
+                continue  # Claimed by another worker
+            claimed.append(path)
+        return claimed
+
+    @staticmethod
+    def _permanent(error):
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            return all(code >= 500 for code, _ in error.recipients.values())
+        return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code >= 500
+
+    def _retry(self, path, record, error):
+        record['attempts'] += 1
+        record['error'] = str(error)
+        if record['attempts'] >= self.app.config['MAIL_QUEUE_MAX_ATTEMPTS'] or self._permanent(error):
+            logging.error(f"Mail {record['id']} failed after {record['attempts']} attempts: {error}")
+            self._write(os.path.join(self._directory('failed'), f"{record['id']}.json"), record)
+        else:
+            delay = self.app.config['MAIL_QUEUE_BACKOFF'] * 2 ** (record['attempts'] - 1)
+            due = time.time_ns() + int(delay * 1e9)
+            logging.warning(f"Mail {record['id']} attempt {record['attempts']} failed, retrying in {delay}s: {error}")
+            self._write(os.path.join(self._directory('pending'), self._due_name(due, record['id'])), record)
+        os.remove(path)
+
+    def process(self) -> int:
+        """
+        Send one batch of due messages over a single SMTP connection.
+
+        :return: Number of messages taken from the spool.
+        """
+        claimed = self._claim(self.app.config['MAIL_QUEUE_BATCH_SIZE'])
+        if not claimed:
+            return 0
+        batch = []
+        for path in claimed:
+            try:
+                with open(path) as file:
+                    batch.append((path, json.load(file)))
+            except ValueError as e:
+                logging.error(f'Mail {os.path.basename(path)} is unreadable and was moved to failed: {e}')
+                os.replace(path, os.path.join(self._directory('failed'), os.path.basename(path)))
+        remaining = list(batch)
+        with self.app.app_context():
+            try:
+                with self.app.extensions['mail'].connect() as connection:
+                    while remaining:
+                        path, record = remaining[0]
+                        fields = dict(record['message'])
+                        if isinstance(fields['sender'], list):
+                            fields['sender'] = tuple(fields['sender'])
+                        try:
+                            connection.send(Message(**fields))
+                        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+                            # The server rejected this message only; the connection stays usable
+                            self._retry(path, record, e)
+                        else:
+                            os.remove(path)
+                        remaining.pop(0)
+            except (smtplib.SMTPException, OSError) as e:
+                for path, record in remaining:
+                    self._retry(path, record, e)
+        return len(claimed)
+
+    def drain(self):
+        """Send every due message from the calling thread, e.g. before shutting down."""
+        while self.process():
+            pass
+
+    def _recover(self):
+        """Return messages claimed by processes that no longer run to the pending directory."""
+        processing, pending = self._directory('processing'), self._directory('pending')
+        owner = self._owner()
+        for name in os.listdir(processing):
+            claimed_by, original = name.split('-', 1)
+            if claimed_by == owner:
+                continue
+            pid = int(claimed_by.split('.', 1)[0])
+            if pid != os.getpid():
+                # With our own pid but another boot id, the claim is from an earlier process
+                try:
+                    os.kill(pid, 0)
+                    continue
+                except ProcessLookupError:
+                    pass
+                except OSError:
+                    continue  # Running, but owned by another user
+            os.replace(os.path.join(processing, name), os.path.join(pending, original))
+
+    def _run(self):
+        while not self._stopping:
+            try:
+                sent = self.process()
+            except Exception as e:
+                logging.error(f'Mail queue worker failed: {e}')
+                sent = 0
+            if not sent:
+                with self._wakeup:
+                    if not self._stopping:
+                        self._wakeup.wait(self.app.config['MAIL_QUEUE_POLL_INTERVAL'])
+
+    def start(self):
+        """Start the worker threads, recovering messages left behind by a previous process."""
+        with self._wakeup:
+            if any(worker.is_alive() for worker in self._workers):
+                return
+            self._stopping = False
+            self._recover()
+            self._workers = [threading.Thread(target=self._run, name=f'mail-queue-{i}', daemon=True)
+                             for i in range(self.app.config['MAIL_QUEUE_WORKERS'])]
+            for worker in self._workers:
+                worker.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop the worker threads after their current batch.
+
+        :param timeout: Seconds to wait for each worker.
+        """
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+
+# Example usage:
+# mail_queue = MailQueue(app)
+# mail_queue.start()  # When the server starts; deliver what an earlier process left in the spool
+# mail_queue.enqueue(Message('Password Reset Request', recipients=[email], body=body))
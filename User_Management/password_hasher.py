@@ -0,0 +1,116 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when every hashing slot stays taken for PASSWORD_HASH_TIMEOUT seconds."""
+
+
+class PasswordHasher:
+    def __init__(self, app=None):
+        """
+        Hash and check passwords on a bounded process pool instead of the request thread.
+
+        At most PASSWORD_HASH_WORKERS hashes run at once and PASSWORD_HASH_QUEUE_SIZE more
+        may wait; further requests block for up to PASSWORD_HASH_TIMEOUT seconds and are then
+        answered with 503, so a login storm queues in front of the pool instead of
+        occupying every request thread with key stretching.
+
+        Settings (app.config):
+            PASSWORD_HASH_METHOD: werkzeug method and cost, e.g. 'scrypt:32768:8:1' or
+                                  'pbkdf2:sha256:600000'; werkzeug's default when None.
+                                  Hashes made with other parameters are replaced on the
+                                  next successful login.
+            PASSWORD_HASH_WORKERS: Worker processes; 0 hashes in the request thread.
+            PASSWORD_HASH_QUEUE_SIZE: Hashes allowed to wait for a free worker.
+            PASSWORD_HASH_TIMEOUT: Seconds to wait for a slot before PasswordHasherBusy is raised.
+
+        :param app: Flask app.
+        """
+        self.app = None
+        self._pool = None
+        self._slots = None
+        self._prefix = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PASSWORD_HASH_METHOD', None)
+        app.config.setdefault('PASSWORD_HASH_WORKERS', os.cpu_count() or 1)
+        app.config.setdefault('PASSWORD_HASH_QUEUE_SIZE', 64)
+        app.config.setdefault('PASSWORD_HASH_TIMEOUT', 5)
+        app.extensions['password_hasher'] = self
+        app.register_error_handler(PasswordHasherBusy, lambda e: ('Server busy, please try again.', 503,
+                                                                  {'Retry-After': '1'}))
+        self.app = app
+
+    def _run(self, function, *args):
+        workers = self.app.config['PASSWORD_HASH_WORKERS']
+        if not workers:
+            return function(*args)
+        with self._lock:
+            if self._pool is None:
+                # spawn, so workers never inherit locks held by other request threads
+                self._pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+                self._slots = threading.BoundedSemaphore(workers + self.app.config['PASSWORD_HASH_QUEUE_SIZE'])
+        if not self._slots.acquire(timeout=self.app.config['PASSWORD_HASH_TIMEOUT']):
+            raise PasswordHasherBusy()
+        try:
+            future = self._pool.submit(function, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+    def hash(self, password: str) -> str:
+        """
+        Hash a password with the configured method.
+
+        :param password: Plain text password.
+        :return: Password hash.
+        """
+        method = self.app.config['PASSWORD_HASH_METHOD']
+        if method is None:
+            return self._run(generate_password_hash, password)
+        return self._run(generate_password_hash, password, method)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        """
+        Check a password against a hash made with any method.
+
+        :param password_hash: Stored password hash.
+        :param password: Plain text password.
+        """
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """
+        Tell whether a hash was made with other parameters than PASSWORD_HASH_METHOD.
+
+        :param password_hash: Stored password hash.
+        """
+        method = self.app.config['PASSWORD_HASH_METHOD']
+        if self._prefix is None or self._prefix[0] != method:
+            # werkzeug fills in the default method and the default cost of a bare method such
+            # as 'scrypt', so compare against the parameters of a hash it actually makes
+            self._prefix = (method, self.hash('').split('$', 1)[0])
+        return password_hash.split('$', 1)[0] != self._prefix[1]
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+# Example usage:
+# password_hasher = PasswordHasher(app)
+# user.password_hash = password_hasher.hash(password)
+# if password_hasher.verify(user.password_hash, password) and password_hasher.needs_rehash(user.password_hash):
+#     user.password_hash = password_hasher.hash(password)
@@ -0,0 +1,83 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class PermissionCache:
+    def __init__(self, app=None):
+        """
+        Keep role and permission lookups in memory for a limited time.
+
+        Values are stored under keys such as ('user', user_id) or ('role', role_id)
+        and loaded again once they are older than PERMISSION_CACHE_TTL seconds. Code
+        that changes role assignments or roles invalidates the affected keys, so this
+        process sees its own changes at once; other processes see them within the TTL.
+
+        Settings (app.config):
+            PERMISSION_CACHE_TTL: Seconds a value is served before it is loaded again; 0 disables caching.
+            PERMISSION_CACHE_MAX_ENTRIES: Entries kept before the oldest are dropped.
+
+        :param app: Flask app.
+        """
+        self.app = None
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PERMISSION_CACHE_TTL', 60)
+        app.config.setdefault('PERMISSION_CACHE_MAX_ENTRIES', 10000)
+        app.extensions['permission_cache'] = self
+        self.app = app
+
+    def get(self, key, load):
+        """
+        Return the cached value for key, calling load() when it is missing or expired.
+
+        :param key: Hashable key, e.g. ('user', user_id).
+        :param load: Function without arguments that reads the value from the database.
+        :return: Cached or freshly loaded value; cache immutable values only.
+        """
+        ttl = self.app.config['PERMISSION_CACHE_TTL']
+        if not ttl:
+            return load()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+            generation = self._generation
+        # Load outside the lock, so one slow query does not block lookups of other keys
+        value = load()
+        with self._lock:
+            if generation != self._generation:
+                return value  # Invalidated while loading; the value may predate the change
+            self._entries.pop(key, None)
+            self._entries[key] = (now + ttl, value)
+            while len(self._entries) > self.app.config['PERMISSION_CACHE_MAX_ENTRIES']:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, *keys):
+        """
+        Drop cached values, so the next lookup reads them from the database.
+
+        :param keys: Keys to drop.
+        """
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every cached value."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+# Example usage:
+# permission_cache = PermissionCache(app)
+# role_ids = permission_cache.get(('user', user_id), lambda: load_role_ids(user_id))
+# permission_cache.invalidate(('user', user_id))
@@ -1,17 +1,23 @@
 import pytest
-from apps import app, db, User, Role, UserRole, ResetToken
+import apps
+from apps import app, db, User, Role, Permission, UserRole, RolePermission, ResetToken
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_mail import Mail, Message
 from datetime import datetime, timedelta, timezone
 import secrets
+import threading
 import os
+import subprocess
+import sys
 
 # Configure the app for testing
 @pytest.fixture
-def client():
+def client(tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, 'MAIL_QUEUE_SPOOL', str(tmp_path / 'mail_spool'))
     app.config['TESTING'] = True
     app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///test.db'
     app.config['MAIL_SUPPRESS_SEND'] = True  # Disable email sending during tests
+    apps.permission_cache.clear()  # Ids are reused once the test database is dropped
     with app.test_client() as client:
         with app.app_context():
             db.create_all()
@@ -45,6 +51,18 @@ def test_register_password_mismatch(client):
     })
     assert response.status_code == 302  # Expects redirect to register page
 
+def test_register_rejects_username_or_email_in_other_case(client, sample_user):
+    for username, email in [('TestUser', 'other@example.com'), ('otheruser', 'Test@Example.com')]:
+        response = client.post('/register', data={
+            'username': username,
+            'email': email,
+            'password': 'Password1!',
+            'password_confirm': 'Password1!'
+        })
+        assert response.status_code == 302
+        assert response.location.endswith('/register')
+    assert User.query.count() == 1
+
 def test_login_success(client, sample_user):
     # Need to mark user as verified for successful login
     sample_user.is_verified = True
@@ -56,6 +74,30 @@ def test_login_success(client, sample_user):
     })
     assert response.status_code == 302  # Expects redirect to dashboard
 
+def test_login_by_email_ignores_case(client, sample_user):
+    sample_user.is_verified = True
+    db.session.commit()
+
+    response = client.post('/login', data={
+        'username_or_email': 'TEST@example.com',
+        'password': 'TestPassword123!'
+    })
+    assert response.location.endswith('/dashboard')
+
+def test_login_rehashes_when_the_cost_changes(client, sample_user, monkeypatch):
+    sample_user.is_verified = True
+    db.session.commit()
+    monkeypatch.setitem(app.config, 'PASSWORD_HASH_METHOD', 'pbkdf2:sha256:1000')
+
+    response = client.post('/login', data={
+        'username_or_email': 'testuser',
+        'password': 'TestPassword123!'
+    })
+    assert response.status_code == 302
+    user = db.session.get(User, sample_user.user_id)
+    assert user.password_hash.startswith('pbkdf2:sha256:1000$')
+    assert check_password_hash(user.password_hash, 'TestPassword123!')
+
 def test_login_failure(client):
     response = client.post('/login', data={
         'username_or_email': 'testuser',
@@ -83,6 +125,29 @@ def test_assign_role(client, sample_user):
     user_role = UserRole.query.filter_by(user_id=sample_user.user_id, role_id=role.role_id).first()
     assert user_role is not None
 
+def test_has_permission_is_cached_until_a_role_is_assigned(client, sample_user, monkeypatch):
+    role = Role(role_name='editor')
+    permission = Permission(permission_name='edit_posts')
+    db.session.add_all([role, permission])
+    db.session.commit()
+    db.session.add(RolePermission(role_id=role.role_id, permission_id=permission.permission_id))
+    db.session.commit()
+    assert not apps.has_permission(sample_user, 'edit_posts')
+
+    client.post('/assign_role', data={'user_id': sample_user.user_id, 'role_id': role.role_id})
+    assert apps.has_permission(sample_user, 'edit_posts')
+    assert not apps.has_permission(sample_user.user_id, 'delete_posts')
+
+    def fail(*args, **kwargs):
+        raise AssertionError('permission lookup reached the database')
+    monkeypatch.setattr(db.session, 'execute', fail)
+    assert apps.has_permission(sample_user.user_id, 'edit_posts')
+
+def test_manage_roles_lists_a_new_role_despite_the_cache(client):
+    client.get('/manage_roles')
+    client.post('/manage_roles', data={'role_name': 'admin', 'description': 'Administrator role'})
+    assert [role.role_name for role in apps.all_roles()] == ['admin']
+
 def test_forgot_password(client, sample_user):
     response = client.post('/forgot_password', data={
         'email': 'test@example.com'
@@ -90,6 +155,17 @@ def test_forgot_password(client, sample_user):
     assert response.status_code == 302  # Redirects after sending email
     assert ResetToken.query.filter_by(user_id=sample_user.user_id).count() == 1
 
+def test_forgot_password_queues_mail(client, sample_user, monkeypatch):
+    queued = []
+    monkeypatch.setitem(app.config, 'TESTING', False)
+    monkeypatch.setattr(apps.mail_queue, 'enqueue', queued.append)
+    response = client.post('/forgot_password', data={
+        'email': 'test@example.com'
+    })
+    assert response.status_code == 302
+    # The request only spools the message; the queue workers send it
+    assert [msg.recipients for msg in queued] == [['test@example.com']]
+
 def test_reset_password(client, sample_user):
     token = secrets.token_urlsafe(32)
     expires_at = datetime.now(timezone.utc) + timedelta(minutes=30)
@@ -110,3 +186,40 @@ def test_reset_password_invalid_token(client):
         'password_confirm': 'NewPassword1!'
     })
     assert response.status_code == 302  # Expects redirect to forgot_password
+
+def test_schema_is_created_once_per_process(client, monkeypatch):
+    calls = []
+    monkeypatch.setattr(apps, 'schema_ready', threading.Event())  # A process whose bootstrap was skipped
+    monkeypatch.setattr(db, 'create_all', lambda: calls.append(1))
+    assert client.get('/ready').status_code == 200  # The probe bootstraps too
+
+    client.get('/login')
+    client.get('/login')
+    assert calls == [1]
+
+def test_failed_bootstrap_is_raised(client, monkeypatch, caplog):
+    def create_all():
+        raise RuntimeError('duplicate rows')
+    monkeypatch.setattr(apps, 'schema_ready', threading.Event())
+    monkeypatch.setattr(db, 'create_all', create_all)
+    with pytest.raises(RuntimeError):
+        apps.bootstrap_schema()
+    assert not apps.schema_ready.is_set()
+    assert 'Creating the database schema failed' in caplog.text
+
+def test_ready_reports_failed_bootstrap(client, monkeypatch):
+    def create_all():
+        raise RuntimeError('duplicate rows')
+    monkeypatch.setattr(apps, 'schema_ready', threading.Event())
+    monkeypatch.setattr(db, 'create_all', create_all)
+    assert client.get('/ready').status_code == 503
+    assert not apps.schema_ready.is_set()
+
+def test_import_starts_nothing(tmp_path):
+    # Spawned password hash workers import apps again; they must not bootstrap or send mail
+    script = ('import threading, apps; '
+              'print(apps.schema_ready.is_set(), [t.name for t in threading.enumerate() if t.name.startswith("mail-queue")])')
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'import.db'}")
+    result = subprocess.run([sys.executable, '-c', script], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.splitlines()[-1] == 'False []'
@@ -0,0 +1,191 @@
+import os
+import socketserver
+import threading
+import time
+
+import pytest
+from flask import Flask
+from flask_mail import Mail, Message
+
+from mail_queue import MailQueue
+
+
+class StubSMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self.reply('220 stub ready')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command[:4].upper()
+            if verb in ('EHLO', 'HELO', 'RSET', 'NOOP'):
+                self.reply('250 ok')
+            elif verb == 'MAIL':
+                if server.transient_failures:
+                    server.transient_failures -= 1
+                    self.reply('451 try again later')
+                else:
+                    self.reply('250 ok')
+            elif verb == 'RCPT':
+                self.reply('550 no such user' if 'bounce' in command else '250 ok')
+            elif verb == 'DATA':
+                self.reply('354 end with .')
+                lines = []
+                while (data := self.rfile.readline()) not in (b'.\r\n', b'.\n', b''):
+                    lines.append(data)
+                server.messages.append(b''.join(lines).decode())
+                self.reply('250 queued')
+            elif verb == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                self.reply('502 not implemented')
+
+
+@pytest.fixture
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), StubSMTPHandler)
+    server.daemon_threads = True
+    server.connections, server.messages, server.transient_failures = 0, [], 0
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_queue(smtp_server, spool, autostart=False):
+    app = Flask(__name__)
+    app.config.update(MAIL_SERVER='127.0.0.1', MAIL_PORT=smtp_server.server_address[1], MAIL_USE_TLS=False,
+                      MAIL_DEFAULT_SENDER='noreply@example.com', MAIL_QUEUE_SPOOL=str(spool),
+                      MAIL_QUEUE_BACKOFF=0, MAIL_QUEUE_MAX_ATTEMPTS=3, MAIL_QUEUE_BATCH_SIZE=10,
+                      MAIL_QUEUE_POLL_INTERVAL=0.05, MAIL_QUEUE_AUTOSTART=autostart)
+    Mail(app)
+    queue = MailQueue(app)
+    if not autostart:
+        queue.start = lambda: None  # Deliver from the test thread with drain()
+    return app, queue
+
+
+def message(app, recipient, body='Hello'):
+    with app.app_context():
+        return Message('Subject', recipients=[recipient], body=body)
+
+
+def spooled(spool, name):
+    path = os.path.join(spool, name)
+    return sorted(os.listdir(path)) if os.path.isdir(path) else []
+
+
+def test_messages_are_sent_in_one_batch(smtp_server, tmp_path):
+    app, queue = make_queue(smtp_server, tmp_path)
+    for i in range(5):
+        queue.enqueue(message(app, f'user{i}@example.com', body=f'Message {i}'))
+    assert spooled(tmp_path, 'pending') and smtp_server.messages == []
+
+    queue.drain()
+
+    assert smtp_server.connections == 1
+    assert [f'Message {i}' in sent for i, sent in enumerate(smtp_server.messages)] == [True] * 5
+    assert spooled(tmp_path, 'pending') == spooled(tmp_path, 'processing') == []
+
+
+def test_transient_failures_are_retried(smtp_server, tmp_path):
+    app, queue = make_queue(smtp_server, tmp_path)
+    smtp_server.transient_failures = 2
+    queue.enqueue(message(app, 'user@example.com'))
+
+    queue.drain()
+
+    assert len(smtp_server.messages) == 1
+    assert spooled(tmp_path, 'failed') == []
+
+
+def test_permanent_and_repeated_failures_are_given_up(smtp_server, tmp_path):
+    app, queue = make_queue(smtp_server, tmp_path)
+    message_id = queue.enqueue(message(app, 'bounce@example.com'))
+    queue.drain()
+    # The rejected recipient is not retried
+    assert spooled(tmp_path, 'failed') == [f'{message_id}.json']
+
+    smtp_server.transient_failures = 10
+    queue.enqueue(message(app, 'user@example.com'))
+    queue.drain()
+
+    # The other message used all three attempts
+    assert smtp_server.transient_failures == 10 - 3
+    assert smtp_server.messages == []
+    assert len(spooled(tmp_path, 'failed')) == 2
+    assert spooled(tmp_path, 'pending') == []
+
+
+def wait_for_messages(smtp_server, count):
+    deadline = time.monotonic() + 5
+    while len(smtp_server.messages) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize('owner', ['999999999.0123', f'{os.getpid()}.0123'])
+def test_spooled_mail_is_sent_when_the_app_restarts(smtp_server, tmp_path, owner):
+    app, queue = make_queue(smtp_server, tmp_path)
+    queue.enqueue(message(app, 'pending@example.com'))
+    queue.enqueue(message(app, 'claimed@example.com'))
+    # A process that stopped while sending left its claimed message behind; after a
+    # container restart the new process may well have the same pid
+    claimed = spooled(tmp_path, 'pending')[-1]
+    os.rename(os.path.join(tmp_path, 'pending', claimed), os.path.join(queue._directory('processing'), f'{owner}-{claimed}'))
+
+    app, restarted = make_queue(smtp_server, tmp_path, autostart=True)
+    try:
+        wait_for_messages(smtp_server, 2)
+    finally:
+        restarted.stop(timeout=5)
+
+    assert len(smtp_server.messages) == 2
+    assert spooled(tmp_path, 'processing') == []
+
+
+def test_claims_of_running_processes_are_kept(smtp_server, tmp_path):
+    app, queue = make_queue(smtp_server, tmp_path)
+    queue.enqueue(message(app, 'user@example.com'))
+    claimed = queue._claim(1)
+    parent = f'{os.getppid()}.0123-{os.path.basename(claimed[0]).split("-", 1)[1]}'
+    os.rename(claimed[0], os.path.join(tmp_path, 'processing', parent))
+
+    queue._recover()
+
+    assert spooled(tmp_path, 'processing') == [parent]
+
+
+def test_unreadable_message_is_moved_to_failed(smtp_server, tmp_path):
+    app, queue = make_queue(smtp_server, tmp_path)
+    queue.enqueue(message(app, 'user@example.com'))
+    name = spooled(tmp_path, 'pending')[0]
+    with open(os.path.join(tmp_path, 'pending', name), 'w') as file:
+        file.write('{')
+    queue.enqueue(message(app, 'other@example.com'))
+
+    queue.drain()
+
+    assert len(smtp_server.messages) == 1
+    assert spooled(tmp_path, 'processing') == []
+    assert len(spooled(tmp_path, 'failed')) == 1
+
+
+def test_background_workers_deliver(smtp_server, tmp_path):
+    app, queue = make_queue(smtp_server, tmp_path)
+    del queue.start
+    try:
+        queue.enqueue(message(app, 'user@example.com'))
+        wait_for_messages(smtp_server, 1)
+    finally:
+        queue.stop(timeout=5)
+
+    assert len(smtp_server.messages) == 1
+    assert not any(worker.is_alive() for worker in queue._workers)
@@ -0,0 +1,58 @@
+import pytest
+from flask import Flask
+
+from password_hasher import PasswordHasher, PasswordHasherBusy
+
+
+@pytest.fixture
+def hasher():
+    app = Flask(__name__)
+    app.config.update(PASSWORD_HASH_METHOD='pbkdf2:sha256:1000', PASSWORD_HASH_WORKERS=1,
+                      PASSWORD_HASH_QUEUE_SIZE=0, PASSWORD_HASH_TIMEOUT=0.1)
+    hasher = PasswordHasher(app)
+
+    @app.route('/hash')
+    def hash_password():
+        return hasher.hash('Password1!')
+
+    yield hasher
+    hasher.shutdown()
+
+
+def test_hash_and_verify_on_the_pool(hasher):
+    password_hash = hasher.hash('Password1!')
+
+    assert password_hash.startswith('pbkdf2:sha256:1000$')
+    assert hasher.verify(password_hash, 'Password1!')
+    assert not hasher.verify(password_hash, 'Wrong1!')
+
+
+def test_needs_rehash_when_the_cost_changes(hasher):
+    password_hash = hasher.hash('Password1!')
+    assert not hasher.needs_rehash(password_hash)
+
+    hasher.app.config['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:2000'
+    assert hasher.needs_rehash(password_hash)
+    # A bare method is compared with the cost werkzeug fills in for it
+    hasher.app.config['PASSWORD_HASH_METHOD'] = 'scrypt'
+    assert not hasher.needs_rehash(hasher.hash('Password1!'))
+
+
+def test_full_pool_is_rejected_with_503(hasher):
+    hasher.hash('Password1!')
+    assert hasher._slots.acquire(timeout=1)  # Every slot is taken
+    try:
+        with pytest.raises(PasswordHasherBusy):
+            hasher.hash('Password1!')
+        response = hasher.app.test_client().get('/hash')
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+    finally:
+        hasher._slots.release()
+    assert hasher.hash('Password1!')
+
+
+def test_inline_hashing_without_workers(hasher):
+    hasher.app.config['PASSWORD_HASH_WORKERS'] = 0
+    assert hasher.verify(hasher.hash('Password1!'), 'Password1!')
+    assert hasher._pool is None
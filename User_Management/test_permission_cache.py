@@ -0,0 +1,68 @@
+import pytest
+from flask import Flask
+
+from permission_cache import PermissionCache
+
+
+@pytest.fixture
+def cache():
+    app = Flask(__name__)
+    return PermissionCache(app)
+
+def counting_loader(value):
+    calls = []
+
+    def load():
+        calls.append(1)
+        return value
+    return load, calls
+
+def test_value_is_loaded_once_within_the_ttl(cache):
+    load, calls = counting_loader(frozenset({1, 2}))
+    assert cache.get(('user', 1), load) == frozenset({1, 2})
+    assert cache.get(('user', 1), load) == frozenset({1, 2})
+    assert len(calls) == 1
+
+def test_expired_value_is_loaded_again(cache, monkeypatch):
+    load, calls = counting_loader('roles')
+    now = [1000.0]
+    monkeypatch.setattr('permission_cache.time.monotonic', lambda: now[0])
+    cache.get(('roles',), load)
+    now[0] += cache.app.config['PERMISSION_CACHE_TTL'] + 1
+    cache.get(('roles',), load)
+    assert len(calls) == 2
+
+def test_invalidate_drops_only_the_given_keys(cache):
+    load_user, user_calls = counting_loader(frozenset())
+    load_role, role_calls = counting_loader(frozenset({'edit'}))
+    cache.get(('user', 1), load_user)
+    cache.get(('role', 1), load_role)
+    cache.invalidate(('user', 1))
+    cache.get(('user', 1), load_user)
+    cache.get(('role', 1), load_role)
+    assert (len(user_calls), len(role_calls)) == (2, 1)
+
+def test_value_loaded_during_an_invalidation_is_not_stored(cache):
+    def load():
+        cache.invalidate(('user', 1))  # e.g. assign_role committing in another thread
+        return frozenset()
+    cache.get(('user', 1), load)
+    reload, calls = counting_loader(frozenset({3}))
+    assert cache.get(('user', 1), reload) == frozenset({3})
+    assert len(calls) == 1
+
+def test_oldest_entries_are_dropped_beyond_the_limit(cache):
+    cache.app.config['PERMISSION_CACHE_MAX_ENTRIES'] = 2
+    for user_id in range(3):
+        cache.get(('user', user_id), lambda: frozenset())
+    load, calls = counting_loader(frozenset())
+    cache.get(('user', 0), load)
+    cache.get(('user', 2), load)
+    assert len(calls) == 1
+
+def test_zero_ttl_disables_caching(cache):
+    cache.app.config['PERMISSION_CACHE_TTL'] = 0
+    load, calls = counting_loader(frozenset())
+    cache.get(('user', 1), load)
+    cache.get(('user', 1), load)
+    assert len(calls) == 2
@@ -4,28 +4,43 @@ import string
 from datetime import datetime, timedelta
 import secrets
 import logging
+import os
 
 from flask import Flask, render_template, request, redirect, url_for, flash
 from flask_mail import Mail, Message
 from flask_migrate import Migrate
 import flask_sqlalchemy
-from werkzeug.security import generate_password_hash
-
-app = Flask(__name__)
-app.config.from_object('config.Config')
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+try:
+    from .config import Config
+    from .db import db
+    from .models import User, Token
+    from ..mail_queue import MailQueue
+    from ..password_hasher import PasswordHasher
+except ImportError:
+    # Run from this directory; the shared modules come from User_Management on the import path
+    from config import Config
+    from db import db
+    from models import User, Token
+    from mail_queue import MailQueue
+    from password_hasher import PasswordHasher
+
+# Keep the instance folder (users.db) next to this file also when imported as User_Management.user_registration
+app = Flask(__name__, instance_path=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance'))
+app.config.from_object(Config)
 app.config['MAIL_DEFAULT_SENDER'] = 'noreply@example.com'
 
 # Configure security audit logging
 logging.basicConfig(filename='security_audit.log', level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
 
-from db import db
 db.init_app(app)
 migrate = Migrate(app, db)
 mail = Mail(app)
-
-# Models
-from models import User, Token
+mail_queue = MailQueue(app)  # Sends mail from background workers instead of the request
+password_hasher = PasswordHasher(app)  # Hashes passwords on a bounded process pool
 
 @app.route('/register', methods=['GET', 'POST'])
 def register():
@@ -46,21 +61,21 @@ def register():
             flash('Password must be at least 8 characters long, include at least one uppercase letter, one lowercase letter, one number, and one special character.')
             return redirect(url_for('register'))
 
-        existing_user = User.query.filter_by(username=username).first()
-        if existing_user:
-            flash('Username already exists.')
-            return redirect(url_for('register'))
-
-        existing_email = User.query.filter_by(email=email).first()
-        if existing_email:
-            flash('Email already registered.')
-            return redirect(url_for('register'))
-
-        hashed_password = generate_password_hash(password, method='pbkdf2:sha256')
+        hashed_password = password_hasher.hash(password)
 
+        # The unique lower() indexes reject existing usernames and emails in any case, so
+        # the insert itself is the lookup; only a rejected insert queries which one exists
         new_user = User(username=username, password_hash=hashed_password, email=email, is_verified=False)
         db.session.add(new_user)
-        db.session.commit()
+        try:
+            db.session.flush()
+        except IntegrityError:
+            db.session.rollback()
+            if User.query.filter(func.lower(User.username) == username.lower()).first():
+                flash('Username already exists.')
+            else:
+                flash('Email already registered.')
+            return redirect(url_for('register'))
 
         token = secrets.token_urlsafe(32)
         logging.info(f'Security Audit: Token generated for user {new_user.id} ({email})')
@@ -75,7 +90,7 @@ def register():
         msg.body = f'Please click the following link to verify your email: {verification_link}'
         # Suppress email sending in test mode
         if not app.config.get('TESTING', False):
-            mail.send(msg)
+            mail_queue.enqueue(msg)
 
         flash('Registration successful! Please check your email to verify your account.')
         return redirect(url_for('register'))
@@ -113,6 +128,9 @@ def verify_email(token):
     return redirect(url_for('register'))
 
 if __name__ == '__main__':
-    with app.app_context():
-        db.create_all()
+    # debug=True runs the reloader, so only the child process it starts serves requests
+    if os.environ.get('WERKZEUG_RUN_MAIN'):
+        with app.app_context():
+            db.create_all()
+        mail_queue.start()
     app.run(debug=True)
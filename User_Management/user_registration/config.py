@@ -11,3 +11,4 @@ class Config:
     MAIL_USE_TLS = True
     MAIL_USE_SSL = False
     MAIL_DEFAULT_SENDER = 'your-email@example.com'
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256'
@@ -0,0 +1,28 @@
+"""Add case-insensitive unique indexes on username and email
+
+Revision ID: 7c2e9a41d5b3
+Revises: 003f6024fc8b
+Create Date: 2026-10-18 10:12:04.318552
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2e9a41d5b3'
+down_revision = '003f6024fc8b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Fails if existing users differ only in the case of their username or email;
+    # merge those accounts first.
+    op.create_index('ix_user_username_lower', 'user', [sa.text('lower(username)')], unique=True)
+    op.create_index('ix_user_email_lower', 'user', [sa.text('lower(email)')], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_user_email_lower', table_name='user')
+    op.drop_index('ix_user_username_lower', table_name='user')
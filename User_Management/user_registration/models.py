@@ -1,6 +1,9 @@
 from datetime import datetime
 
-from db import db
+try:
+    from .db import db
+except ImportError:
+    from db import db
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -11,6 +14,12 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Case-insensitive uniqueness, and indexes for the lower() lookups in register
+    __table_args__ = (
+        db.Index('ix_user_username_lower', db.func.lower(username), unique=True),
+        db.Index('ix_user_email_lower', db.func.lower(email), unique=True),
+    )
+
 class Token(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -11,7 +11,8 @@ from models import User, Token
 
 
 @pytest.fixture
-def client():
+def client(tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, 'MAIL_QUEUE_SPOOL', str(tmp_path / 'mail_spool'))
     app.config['TESTING'] = True
     app.config['MAIL_SUPPRESS_SEND'] = True  # Prevent actual email sending during tests
     with app.test_client() as client:
@@ -86,6 +87,24 @@ def test_register_existing_email(client):
     })
     assert response.status_code == 302  # Expects redirect back to register
 
+def test_register_existing_username_in_other_case(client, new_user):
+    response = client.post('/register', data={
+        'username': 'TestUser',
+        'password': 'ValidPassword1!',
+        'email': 'other@example.com'
+    }, follow_redirects=True)
+    assert b'Username already exists.' in response.data
+    assert User.query.count() == 1
+
+def test_register_existing_email_in_other_case(client, new_user):
+    response = client.post('/register', data={
+        'username': 'otheruser',
+        'password': 'ValidPassword1!',
+        'email': 'Test@Example.com'
+    }, follow_redirects=True)
+    assert b'Email already registered.' in response.data
+    assert User.query.count() == 1
+
 def test_verify_email_valid_token(client, new_user):
     token = ''.join(random.choices(string.ascii_letters + string.digits, k=50))
     expiration = datetime.datetime.now(timezone.utc) + datetime.timedelta(hours=1)